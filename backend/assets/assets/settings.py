@@ -15,6 +15,7 @@ import os
 import dj_database_url
 from dotenv import load_dotenv
 import logging
+import sys
 logger = logging.getLogger(__name__)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -109,6 +110,45 @@ else:
         }
     }
 
+# Cache
+# Set ASSETS_REDIS_URL (e.g. redis://redis:6379/0) to share one cache between all
+# gunicorn workers, so invalidations reach every worker. Without it each
+# process keeps its own LocMemCache (local development, tests).
+if os.getenv("ASSETS_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("ASSETS_REDIS_URL"),
+            "KEY_PREFIX": "assets",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "KEY_PREFIX": "assets",
+            "TIMEOUT": 300,
+        }
+    }
+
+# Activity log
+# ActivityLog entries are buffered in process and written in batches by a
+# background thread. Under `manage.py test` they are written synchronously.
+ACTIVITY_LOG_WRITE_BEHIND = (
+    os.getenv("ASSETS_ACTIVITY_LOG_WRITE_BEHIND", "true").lower() == "true"
+    and "test" not in sys.argv[1:2]
+)
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ASSETS_ACTIVITY_LOG_BATCH_SIZE", "100"))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ASSETS_ACTIVITY_LOG_FLUSH_INTERVAL", "2"))
+ACTIVITY_LOG_MAX_QUEUE = int(os.getenv("ASSETS_ACTIVITY_LOG_MAX_QUEUE", "10000"))
+# "block": a full queue is flushed by the caller; "drop": new entries are discarded
+ACTIVITY_LOG_OVERFLOW = os.getenv("ASSETS_ACTIVITY_LOG_OVERFLOW", "block")
+# Retention: archive_activity_logs moves older entries to ActivityLogArchive and
+# purges the archive after ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS (0 = never)
+ACTIVITY_LOG_RETENTION_DAYS = int(os.getenv("ASSETS_ACTIVITY_LOG_RETENTION_DAYS", "365"))
+ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS = int(os.getenv("ASSETS_ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS", str(7 * 365)))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
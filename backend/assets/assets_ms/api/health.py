@@ -0,0 +1,30 @@
+"""
+Upstream health endpoint.
+
+GET /health/upstreams/ reports the circuit breaker of every upstream this
+process calls (contexts, help-desk, tickets, auth) - see
+services/circuit_breaker.py. Breakers are per process, so the answer
+describes the worker that served the request.
+"""
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from assets_ms.services.circuit_breaker import CLOSED, breaker_states
+
+
+class UpstreamHealthAPIView(APIView):
+    """
+    GET /health/upstreams/
+
+    Returns {"status": "ok" | "degraded", "upstreams": {name: {...}}}. Each upstream includes:
+    - state: closed, open or half-open
+    - consecutive_failures, in_flight
+    - retry_in: seconds until an open circuit lets a probe through, else null
+    - last_error
+    - calls, failures, short_circuited, hedges, last_known_good_served: counters since start
+    """
+
+    def get(self, request):
+        upstreams = breaker_states()
+        degraded = any(upstream['state'] != CLOSED for upstream in upstreams.values())
+        return Response({'status': 'degraded' if degraded else 'ok', 'upstreams': upstreams})
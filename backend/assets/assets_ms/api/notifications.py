@@ -1,46 +1,68 @@
 """
-Notifications API endpoint.
+Notifications API endpoints.
 
-Provides an endpoint to fetch all system notifications for:
+Notifications cover:
 - Low stock products
-- Low stock components  
+- Low stock components
 - Expired/expiring warranties
 - Overdue asset returns
 - Overdue audits
+
+They are read from the persisted feed (services/notification_feed.py):
+- GET /notifications/                  active notifications
+- GET /notifications/?since=<cursor>   everything changed after the cursor
+
+Dismissing is per user and kept by the client, keyed by the stable id.
 """
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from assets_ms.services.notifications import get_all_notifications
+from assets_ms.serializer import NotificationSerializer
+from assets_ms.services.notification_feed import DEFAULT_LIMIT, get_notification_feed
 
 
 class NotificationsAPIView(APIView):
     """
     GET /notifications/
-    
-    Returns a list of all active notifications.
-    Each notification includes:
-    - id: unique identifier
+
+    Query params:
+      - since: cursor from a previous response; only notifications created,
+        changed or resolved after it are returned, including inactive
+        (resolved) ones so the client can drop them
+      - limit: maximum number of results (default 500, at most 1000)
+
+    Returns {"count", "results", "cursor", "has_more"}. Each notification includes:
+    - id: stable identifier, unchanged between polls; a condition that clears and
+      comes back is a new notification with a new id
+    - key: the condition it tracks, e.g. overdue-checkout-12
     - type: notification type (low-stock, expiring, due-back, maintenance)
-    - title: notification title
-    - message: detailed message
+    - title, message
     - item_type: type of related item (product, component, asset, audit_schedule, asset_checkout)
-    - item_id: ID of the related item
-    - item_name: name/identifier of the related item
-    - created_at: timestamp
+    - item_id, item_name: the related item
+    - is_active
+    - created_at, updated_at, resolved_at
     """
-    
+
     def get(self, request):
         try:
-            notifications = get_all_notifications()
-            return Response({
-                'count': len(notifications),
-                'results': notifications
-            })
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'detail': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            feed = get_notification_feed(since=request.query_params.get('since'), limit=limit)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        results = NotificationSerializer(feed['results'], many=True).data
+        return Response({
+            'count': len(results),
+            'results': results,
+            'cursor': feed['cursor'],
+            'has_more': feed['has_more'],
+        })
 
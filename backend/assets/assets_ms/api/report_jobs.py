@@ -0,0 +1,79 @@
+"""
+Report job API endpoints.
+
+Large exports are generated in the background by the process_report_jobs worker:
+- POST /reports/jobs/                 submit a job, returns its id (reuses a recent identical job)
+- GET  /reports/jobs/<id>/            poll the job status
+- GET  /reports/jobs/<id>/download/   download the finished file
+"""
+
+import os
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from assets_ms.models import ReportJob
+from assets_ms.serializer import ReportJobCreateSerializer, ReportJobSerializer
+from assets_ms.services.report_jobs import submit_report_job
+
+
+class ReportJobCreateAPIView(APIView):
+    """
+    POST /reports/jobs/
+
+    Body:
+      - report_type: depreciation, assets or activity
+      - export_format: xlsx (default) or csv
+      - params: query params of the matching /reports/* endpoint,
+        e.g. {"start_date": "2025-01-01", "end_date": "2025-06-30"}
+
+    Returns 201 with the new job, or 200 with an existing job when the same
+    report was requested recently (deduplicated is true).
+    """
+
+    def post(self, request):
+        serializer = ReportJobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user_id = None
+        try:
+            if getattr(request.user, 'id', None):
+                user_id = request.user.id
+        except Exception:
+            pass
+
+        job, created = submit_report_job(
+            serializer.validated_data['report_type'],
+            serializer.validated_data['export_format'],
+            serializer.validated_data.get('params'),
+            user_id=user_id,
+        )
+        data = ReportJobSerializer(job, context={'request': request}).data
+        data['deduplicated'] = not created
+        return Response(data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class ReportJobDetailAPIView(APIView):
+    """GET /reports/jobs/<id>/ - job status; download_url is set once the file is ready."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk)
+        return Response(ReportJobSerializer(job, context={'request': request}).data)
+
+
+class ReportJobDownloadAPIView(APIView):
+    """GET /reports/jobs/<id>/download/ - stream the finished file from media storage."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk)
+        if job.status != ReportJob.STATUS_DONE or not job.file:
+            return Response(
+                {"detail": f"Report is not ready (status: {job.status})."},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            handle = job.file.open('rb')
+        except FileNotFoundError:
+            return Response({"detail": "Report file is no longer available."}, status=status.HTTP_410_GONE)
+        return FileResponse(handle, as_attachment=True, filename=os.path.basename(job.file.name))
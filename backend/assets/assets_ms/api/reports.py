@@ -4,13 +4,14 @@ from django.http import HttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from ..services.depreciation_report import generate_depreciation_report
+from ..services.depreciation_report import generate_depreciation_report, iter_depreciation_report
 from ..services.eol_warranty_report import generate_eol_warranty_report
 from ..services.upcoming_eol_report import generate_upcoming_eol_report
 from ..services.reached_eol_report import generate_reached_eol_report
 from ..services.expired_warranty_report import generate_expired_warranty_report, generate_expiring_warranty_report
-from ..services.asset_report import generate_asset_report
-from ..services.activity_report import generate_activity_report, get_activity_summary
+from ..services.asset_report import generate_asset_report, iter_asset_report
+from ..services.activity_report import generate_activity_report, iter_activity_report, get_activity_summary
+from ..services.report_export import streaming_export_response
 
 # No ticket resolution here — report will only include status fields per request
 
@@ -21,32 +22,41 @@ class DepreciationReportAPIView(APIView):
     Query params:
       - depreciation_id: int to filter by a specific depreciation record
       - format=xlsx (default) to download an XLSX file
+      - format=csv to download a CSV file
       - format=json to return JSON results
+      (export_format is accepted as an alias of format)
+
+    XLSX and CSV downloads are streamed, so memory stays flat for large reports.
     """
 
+    FIELDNAMES = [
+        'assetId', 'product', 'statusName', 'depreciationName', 'duration',
+        'currency', 'minimumValue', 'purchaseCost', 'currentValue', 'depreciated',
+        'monthlyDepreciation', 'monthsLeft'
+    ]
+
     def get(self, request):
         dep = request.query_params.get('depreciation_id')
-        fmt = request.query_params.get('format', '').lower()
+        fmt = (request.query_params.get('export_format') or request.query_params.get('format', '')).lower()
 
         try:
             dep_id = int(dep) if dep is not None else None
         except ValueError:
             return Response({"detail": "Invalid depreciation_id"}, status=status.HTTP_400_BAD_REQUEST)
 
-        rows = generate_depreciation_report(depreciation_id=dep_id)
-
         # Explicit JSON request returns JSON (backwards compatible)
         if fmt == 'json':
-            return Response({'results': rows})
+            return Response({'results': generate_depreciation_report(depreciation_id=dep_id)})
 
-        # CSV not supported for this report; prefer XLSX
         if fmt == 'csv':
-            return Response({'detail': 'CSV export is not supported. Use format=xlsx or omit format to download an XLSX file.'}, status=status.HTTP_400_BAD_REQUEST)
+            return streaming_export_response(
+                self._export_rows(iter_depreciation_report(depreciation_id=dep_id)),
+                self.FIELDNAMES, 'depreciation_report', 'DepreciationReport', fmt='csv'
+            )
 
         # Default: produce XLSX. Lazy import openpyxl and provide install guidance if missing.
         try:
             import openpyxl  # type: ignore
-            from openpyxl.workbook import Workbook  # type: ignore
         except Exception:
             return Response({
                 'detail': 'openpyxl is not installed in the running Python environment.',
@@ -57,22 +67,15 @@ class DepreciationReportAPIView(APIView):
                 )
             }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-        fieldnames = [
-            'assetId', 'product', 'statusName', 'depreciationName', 'duration',
-            'currency', 'minimumValue', 'purchaseCost', 'currentValue', 'depreciated',
-            'monthlyDepreciation', 'monthsLeft'
-        ]
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'DepreciationReport'
-
-        # Header
-        ws.append(fieldnames)
+        return streaming_export_response(
+            self._export_rows(iter_depreciation_report(depreciation_id=dep_id)),
+            self.FIELDNAMES, 'depreciation_report', 'DepreciationReport'
+        )
 
+    def _export_rows(self, rows):
         for r in rows:
             row = []
-            for f in fieldnames:
+            for f in self.FIELDNAMES:
                 v = r.get(f, '')
                 if isinstance(v, float):
                     # monthlyDepreciation keep more precision
@@ -82,16 +85,7 @@ class DepreciationReportAPIView(APIView):
                         row.append(round(v, 2))
                 else:
                     row.append(v)
-            ws.append(row)
-
-        bio = BytesIO()
-        wb.save(bio)
-        bio.seek(0)
-
-        filename = f"depreciation_report_{datetime.date.today().isoformat()}.xlsx"
-        response = HttpResponse(bio.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+            yield row
 
 
 class AssetReportAPIView(APIView):
@@ -105,8 +99,11 @@ class AssetReportAPIView(APIView):
       - product_id: int to filter by a specific product
       - manufacturer_id: int to filter by a specific manufacturer
       - columns: comma-separated list of column IDs to include
-      - format=xlsx (default) to download an XLSX file
-      - format=json to return JSON results
+      - export_format=xlsx (default) to download an XLSX file
+      - export_format=csv to download a CSV file
+      - export_format=json to return JSON results
+
+    XLSX and CSV downloads are streamed, so memory stays flat for large reports.
     """
 
     # Map frontend column IDs to backend field names
@@ -166,7 +163,7 @@ class AssetReportAPIView(APIView):
         except ValueError:
             return Response({"detail": "Invalid filter parameter. IDs must be integers."}, status=status.HTTP_400_BAD_REQUEST)
 
-        rows = generate_asset_report(
+        filters = dict(
             status_id=status_id,
             category_id=category_id,
             supplier_id=supplier_id,
@@ -199,34 +196,21 @@ class AssetReportAPIView(APIView):
         if fmt == 'json':
             # Filter rows to only include selected columns
             filtered_rows = []
-            for row in rows:
+            for row in generate_asset_report(**filters):
                 filtered_row = {k: row.get(k, '') for k in fieldnames}
                 filtered_rows.append(filtered_row)
             return Response({'results': filtered_rows, 'count': len(filtered_rows)})
 
-        # CSV not supported
+        header_names = self._get_header_names(fieldnames)
+        rows = self._export_rows(iter_asset_report(**filters), fieldnames)
+
         if fmt == 'csv':
-            return Response({'detail': 'CSV export is not supported. Use export_format=xlsx or omit export_format to download an XLSX file.'}, status=status.HTTP_400_BAD_REQUEST)
+            return streaming_export_response(rows, header_names, 'asset_report', 'AssetReport', fmt='csv')
 
         # Default: XLSX export
-        try:
-            from openpyxl.workbook import Workbook
-        except ImportError:
-            return Response({
-                'detail': 'openpyxl is not installed in the running Python environment.',
-                'install_instructions': (
-                    'Add openpyxl to backend/assets/requirements.txt and rebuild the assets image.'
-                )
-            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'AssetReport'
-
-        # Header row with human-readable names
-        header_names = self._get_header_names(fieldnames)
-        ws.append(header_names)
+        return streaming_export_response(rows, header_names, 'asset_report', 'AssetReport')
 
+    def _export_rows(self, rows, fieldnames):
         for r in rows:
             row = []
             for f in fieldnames:
@@ -235,16 +219,7 @@ class AssetReportAPIView(APIView):
                     row.append(round(v, 2))
                 else:
                     row.append(v)
-            ws.append(row)
-
-        bio = BytesIO()
-        wb.save(bio)
-        bio.seek(0)
-
-        filename = f"asset_report_{datetime.date.today().isoformat()}.xlsx"
-        response = HttpResponse(bio.read(), content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+            yield row
 
     def _get_header_names(self, fieldnames):
         """Convert field names to human-readable header names."""
@@ -284,9 +259,12 @@ class ActivityReportAPIView(APIView):
       - action: Filter by action (Create, Update, Delete, Checkout, Checkin, etc.)
       - user_id: Filter by the user who performed the action
       - item_id: Filter by the item ID affected
-      - search: Search term to filter by item name/identifier, user name, or notes
+      - search: Search words, prefix matched, over item name/identifier, user name, target or notes
+      - ordering: 'relevance' orders search results by rank (default: most recent first)
       - limit: Maximum number of records to return
-      - export_format: 'xlsx' (default) or 'json'
+      - export_format: 'xlsx' (default), 'csv' or 'json'
+
+    XLSX and CSV downloads are streamed, so memory stays flat for large logs.
     """
 
     # Fieldnames for the report
@@ -301,6 +279,7 @@ class ActivityReportAPIView(APIView):
         user_id_param = request.query_params.get('user_id')
         item_id_param = request.query_params.get('item_id')
         search = request.query_params.get('search')
+        rank = request.query_params.get('ordering') == 'relevance'
         limit_param = request.query_params.get('limit')
         fmt = request.query_params.get('export_format', '').lower()
 
@@ -329,8 +308,7 @@ class ActivityReportAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Generate the report data
-        rows = generate_activity_report(
+        filters = dict(
             start_date=start_date,
             end_date=end_date,
             activity_type=activity_type,
@@ -339,64 +317,28 @@ class ActivityReportAPIView(APIView):
             item_id=item_id,
             search=search,
             limit=limit,
+            rank=rank,
         )
 
         # JSON format
         if fmt == 'json':
+            rows = generate_activity_report(**filters)
             return Response({
                 'results': rows,
                 'count': len(rows),
             })
 
-        # CSV not supported
-        if fmt == 'csv':
-            return Response(
-                {'detail': 'CSV export is not supported. Use export_format=xlsx or omit export_format to download an XLSX file.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # Default: XLSX export
-        try:
-            from openpyxl.workbook import Workbook
-        except ImportError:
-            return Response({
-                'detail': 'openpyxl is not installed in the running Python environment.',
-                'install_instructions': (
-                    'Add openpyxl to backend/assets/requirements.txt and rebuild the assets image.'
-                )
-            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'ActivityReport'
-
-        # Header row
         header_names = ['Date', 'User', 'Type', 'Event', 'Item', 'To/From', 'Notes']
-        ws.append(header_names)
-
-        for r in rows:
-            row = [
-                r.get('date', ''),
-                r.get('user', ''),
-                r.get('type', ''),
-                r.get('action', ''),
-                r.get('item', ''),
-                r.get('to_from', ''),
-                r.get('notes', ''),
-            ]
-            ws.append(row)
+        rows = (
+            [r.get(f, '') for f in self.FIELDNAMES]
+            for r in iter_activity_report(**filters)
+        )
 
-        bio = BytesIO()
-        wb.save(bio)
-        bio.seek(0)
+        if fmt == 'csv':
+            return streaming_export_response(rows, header_names, 'activity_report', 'ActivityReport', fmt='csv')
 
-        filename = f"activity_report_{datetime.date.today().isoformat()}.xlsx"
-        response = HttpResponse(
-            bio.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        return response
+        # Default: XLSX export
+        return streaming_export_response(rows, header_names, 'activity_report', 'ActivityReport')
 
 
 class EoLWarrantyReportAPIView(APIView):
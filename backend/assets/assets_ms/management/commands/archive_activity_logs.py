@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from assets_ms.models import ActivityLog
+from assets_ms.services.activity_retention import (
+    ARCHIVE_BATCH_SIZE, archive_activity_logs, purge_activity_archive, retention_cutoff,
+)
+
+
+class Command(BaseCommand):
+    help = 'Move activity log entries past the retention period to the archive and purge expired archive rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=None,
+            help='Keep this many days in the activity log (default: ACTIVITY_LOG_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--archive-retention-days',
+            type=int,
+            default=None,
+            help='Delete archived entries older than this, 0 keeps them (default: ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help=f'Rows moved per transaction (default: {ARCHIVE_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many entries would be archived',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = retention_cutoff(options['retention_days'])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Archiving activity log entries before {cutoff:%Y-%m-%d}"))
+
+        if options['dry_run']:
+            count = ActivityLog.objects.filter(datetime__lt=cutoff).count()
+            self.stdout.write(self.style.WARNING(f"Dry run: {count} entries would be archived"))
+            return
+
+        archived = archive_activity_logs(cutoff, batch_size=options['batch_size'])
+        for month, count in archived.items():
+            self.stdout.write(f"  {month}: {count} entries")
+        self.stdout.write(self.style.SUCCESS(f"✓ Archived {sum(archived.values())} activity log entries"))
+
+        purged = purge_activity_archive(options['archive_retention_days'])
+        self.stdout.write(self.style.SUCCESS(f"✓ Purged {purged} expired archive entries"))
@@ -0,0 +1,96 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from assets_ms.models import Asset, Component, ComponentCheckin, ComponentCheckout, Product
+from assets_ms.serializer import ComponentListSerializer
+from assets_ms.services.component_stock import annotate_active_component_checkout
+from datetime import date
+import time
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the /components/ list serialization at increasing catalog sizes (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,10000,50000',
+            help='Comma-separated component counts to measure (default 1000,10000,50000)',
+        )
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs per size (default 3)')
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also time the unannotated list (one active-checkout query per component; slow at large sizes)',
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows instead of rolling them back')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(s) for s in options['sizes'].split(',') if s.strip())
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers')
+        runs = max(options['runs'], 1)
+
+        with transaction.atomic():
+            product = Product.objects.create(name='Benchmark Component Host', category=1)
+            asset = Asset.objects.create(asset_id='AST-BENCH-COMPONENT-HOST', product=product, status=1)
+            seeded = 0
+
+            for size in sizes:
+                self.seed(asset, seeded, size)
+                seeded = size
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== {size} components ==='))
+                self.report('annotated', lambda: annotate_active_component_checkout(self.queryset()), runs)
+                if options['compare']:
+                    self.report('per-row queries', self.queryset, 1)
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.WARNING('\nSeeded rows rolled back (use --keep to keep them).'))
+
+    def queryset(self):
+        return Component.objects.filter(is_deleted=False).order_by('name')
+
+    def report(self, label, build_queryset, runs):
+        timings = []
+        for _ in range(runs):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                rows = len(ComponentListSerializer(build_queryset(), many=True).data)
+                timings.append(time.perf_counter() - started)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {label}: {rows} rows, best {min(timings) * 1000:.0f} ms, '
+            f'mean {sum(timings) / len(timings) * 1000:.0f} ms, {len(queries)} queries'
+        ))
+
+    def seed(self, asset, start, end):
+        # A third of the components are checked out, half of those partially returned.
+        # bulk_create skips save(), so checked_out_qty is set directly.
+        def checked_out_qty(i):
+            if i % 6 == 0:
+                return 3
+            return 4 if i % 3 == 0 else 0
+
+        components = Component.objects.bulk_create([
+            Component(
+                name=f'Benchmark Component {i:07d}',
+                category=1,
+                quantity=10,
+                minimum_quantity=2,
+                checked_out_qty=checked_out_qty(i),
+            )
+            for i in range(start, end)
+        ], batch_size=2000)
+
+        checked_out = [(i, c) for i, c in enumerate(components, start) if i % 3 == 0]
+        checkouts = ComponentCheckout.objects.bulk_create([
+            ComponentCheckout(component=c, asset=asset, quantity=4, checkout_date=date(2025, 1, 1))
+            for _, c in checked_out
+        ], batch_size=2000)
+
+        ComponentCheckin.objects.bulk_create([
+            ComponentCheckin(component_checkout=checkout, quantity=1, checkin_date=date(2025, 1, 2))
+            for (i, _), checkout in zip(checked_out, checkouts) if i % 6 == 0
+        ], batch_size=2000)
@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand
+from django.core.cache import cache
+from django.db import transaction
+from assets_ms.models import Asset, AssetCheckout, Product
+from assets_ms.services.depreciation_report import iter_depreciation_report
+from decimal import Decimal
+from datetime import date, timedelta
+import random
+import time
+
+
+# Context ids far outside seeded data so the benchmark never clashes with real records
+BENCH_DEPRECIATION_IDS = range(900001, 900006)
+BENCH_STATUS_IDS = range(900001, 900006)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the depreciation report against seeded assets (rolled back afterwards) and report rows/sec'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assets', type=int, default=50000, help='Number of assets to seed (default 50000)')
+        parser.add_argument('--runs', type=int, default=3, help='Number of timed report runs (default 3)')
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the seeded rows instead of rolling them back',
+        )
+
+    def handle(self, *args, **options):
+        total = options['assets']
+        runs = max(options['runs'], 1)
+
+        with transaction.atomic():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== Seeding {total} benchmark assets ==='))
+            started = time.perf_counter()
+            self.seed(total)
+            self.stdout.write(self.style.SUCCESS(f'✓ Seeded in {time.perf_counter() - started:.1f}s'))
+
+            # Context lookups come from the cache so the run measures the report engine, not the network
+            self.prime_context_cache()
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== Running depreciation report x{runs} ==='))
+            rates = []
+            for run in range(1, runs + 1):
+                started = time.perf_counter()
+                rows = sum(1 for _ in iter_depreciation_report())
+                elapsed = time.perf_counter() - started
+                rates.append(rows / elapsed if elapsed else 0)
+                self.stdout.write(f'Run {run}: {rows} rows in {elapsed:.2f}s ({rates[-1]:,.0f} rows/sec)')
+
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✓ Best {max(rates):,.0f} rows/sec, mean {sum(rates) / len(rates):,.0f} rows/sec'
+            ))
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.WARNING('Seeded rows rolled back (use --keep to keep them).'))
+
+    def seed(self, total):
+        products = Product.objects.bulk_create([
+            Product(
+                name=f'Benchmark Product {i + 1}',
+                category=1,
+                depreciation=BENCH_DEPRECIATION_IDS[i % len(BENCH_DEPRECIATION_IDS)],
+                default_purchase_cost=Decimal('1000.00'),
+            )
+            for i in range(20)
+        ])
+
+        today = date.today()
+        run_id = random.randint(0, 99999)
+        assets = [
+            Asset(
+                asset_id=f'AST-BENCH-{run_id:05d}-{i:07d}',
+                product=products[i % len(products)],
+                status=random.choice(BENCH_STATUS_IDS),
+                serial_number=f'BENCH{i:07d}',
+                purchase_date=today - timedelta(days=random.randint(0, 1500)),
+                purchase_cost=Decimal(str(round(random.uniform(299.99, 2999.99), 2))),
+            )
+            for i in range(total)
+        ]
+        assets = Asset.objects.bulk_create(assets, batch_size=2000)
+
+        # A third of the assets are checked out
+        AssetCheckout.objects.bulk_create([
+            AssetCheckout(asset=asset, checkout_to=random.randint(1, 500), location=1)
+            for asset in assets[::3]
+        ], batch_size=2000)
+
+    def prime_context_cache(self):
+        entries = {}
+        for dep_id in BENCH_DEPRECIATION_IDS:
+            entries[f'contexts:depreciation:{dep_id}'] = {
+                'id': dep_id, 'name': f'Benchmark {dep_id}', 'duration': 36, 'minimum_value': '100.00',
+            }
+        for status_id in BENCH_STATUS_IDS:
+            entries[f'contexts:status:{status_id}'] = {'id': status_id, 'name': f'Benchmark {status_id}'}
+        cache.set_many(entries, 600)
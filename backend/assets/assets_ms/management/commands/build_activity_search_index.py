@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from assets_ms.services.activity_search import ensure_postgres_search_index, rebuild_search_tokens
+
+
+class Command(BaseCommand):
+    help = 'Create the activity log search index (tsvector + GIN on PostgreSQL, token table elsewhere)'
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'postgresql':
+            ensure_postgres_search_index()
+            self.stdout.write(self.style.SUCCESS("✓ search_vector column and GIN index are in place"))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Rebuilding activity search tokens"))
+        count = rebuild_search_tokens()
+        self.stdout.write(self.style.SUCCESS(f"✓ Indexed {count} activity log entries"))
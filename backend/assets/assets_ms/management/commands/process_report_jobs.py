@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from assets_ms.services.report_jobs import process_next_job, purge_expired_jobs, requeue_stale_jobs
+import time
+
+
+class Command(BaseCommand):
+    help = 'Process queued report jobs (DB-backed queue, no broker). Runs until stopped unless --once is given.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between polls when the queue is empty (default 5)',
+        )
+        parser.add_argument('--max-jobs', type=int, default=0, help='Exit after processing this many jobs (0 = no limit)')
+
+    def handle(self, *args, **options):
+        once = options['once']
+        poll_interval = max(options['poll_interval'], 0.1)
+        max_jobs = options['max_jobs']
+
+        purged = purge_expired_jobs()
+        if purged:
+            self.stdout.write(self.style.WARNING(f'Purged {purged} expired report job(s).'))
+
+        processed = 0
+        self.stdout.write(self.style.MIGRATE_HEADING('\n=== Processing report jobs ==='))
+        try:
+            while True:
+                requeued = requeue_stale_jobs()
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale report job(s).'))
+
+                job = process_next_job()
+                if job is None:
+                    if once:
+                        break
+                    # Long-running worker: drop connections the database may have timed out
+                    close_old_connections()
+                    time.sleep(poll_interval)
+                    continue
+
+                processed += 1
+                if job.status == job.STATUS_DONE:
+                    self.stdout.write(self.style.SUCCESS(f'✓ Job {job.id} ({job.report_type}, {job.export_format}) done'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'✗ Job {job.id} ({job.report_type}) failed: {job.error}'))
+
+                if max_jobs and processed >= max_jobs:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopped.'))
+
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Processed {processed} report job(s)'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from assets_ms.services.component_stock import rebuild_checked_out_qty
+
+
+class Command(BaseCommand):
+    help = 'Recompute Component.checked_out_qty from component checkouts and checkins'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--component', type=int, action='append', help='Only rebuild this component id (repeatable)')
+
+    def handle(self, *args, **options):
+        corrected = rebuild_checked_out_qty(options['component'])
+        if corrected:
+            self.stdout.write(self.style.WARNING(f'Corrected checked-out stock for {corrected} component(s).'))
+        self.stdout.write(self.style.SUCCESS('✓ Component stock ledger is up to date'))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from assets_ms.services.dashboard import SECTIONS, refresh_dashboard_snapshot
+import time
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard snapshot from scratch (periodic reconciliation of the incrementally maintained metrics)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--section',
+            action='append',
+            choices=sorted(SECTIONS),
+            help='Only refresh this section (repeatable). Defaults to all sections.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and refresh every N seconds (default: refresh once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        sections = options['section']
+        interval = options['interval']
+
+        while True:
+            started = time.perf_counter()
+            refresh_dashboard_snapshot(sections)
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ Dashboard snapshot refreshed ({', '.join(sections or sorted(SECTIONS))}) "
+                f"in {time.perf_counter() - started:.2f}s"
+            ))
+            if interval <= 0:
+                break
+            close_old_connections()
+            time.sleep(interval)
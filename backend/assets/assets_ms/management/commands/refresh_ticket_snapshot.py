@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from assets_ms.services.ticket_snapshot import SNAPSHOT_TTL, refresh_ticket_snapshot
+import time
+
+
+class Command(BaseCommand):
+    help = 'Refresh the cached ticket snapshot from the external ticket tracking service'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help=f'Keep running and refresh every N seconds (e.g. {SNAPSHOT_TTL}; default: refresh once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        while True:
+            snapshot = refresh_ticket_snapshot()
+            if snapshot['available']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✓ Ticket snapshot holds {len(snapshot['by_id'])} tickets"
+                ))
+            else:
+                self.stdout.write(self.style.WARNING("Ticket service unreachable, snapshot is empty"))
+            if interval <= 0:
+                break
+            time.sleep(interval)
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from assets_ms.services.notification_feed import SOURCES, purge_resolved_notifications, sync_notifications
+import time
+
+
+class Command(BaseCommand):
+    help = 'Sync the persisted notification feed with the current alert conditions and purge old resolved notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            action='append',
+            choices=sorted(SOURCES),
+            help='Only sync this source (repeatable). Defaults to all sources.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and sync every N seconds (default: sync once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        sources = options['source']
+        interval = options['interval']
+
+        while True:
+            started = time.perf_counter()
+            results = sync_notifications(sources)
+            if results is None:
+                self.stdout.write(self.style.WARNING("Skipped: another notification sync is still running"))
+                results = {}
+            for name, counts in sorted(results.items()):
+                if counts is None:
+                    self.stdout.write(self.style.WARNING(f"Skipped {name}: contexts service unreachable"))
+                    continue
+                self.stdout.write(
+                    f"  {name}: {counts['created']} new, {counts['updated']} updated, {counts['resolved']} resolved"
+                )
+            purged = purge_resolved_notifications()
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ Notifications synced in {time.perf_counter() - started:.2f}s ({purged} old resolved purged)"
+            ))
+            if interval <= 0:
+                break
+            close_old_connections()
+            time.sleep(interval)
@@ -1,5 +1,6 @@
 from django.utils.deprecation import MiddlewareMixin
 from assets_ms.models import ActivityLog
+from assets_ms.services.activity_sink import activity_sink
 import json
 
 
@@ -9,15 +10,33 @@ class ActivityLogMiddleware(MiddlewareMixin):
     This middleware is intentionally simple: it logs POST/PUT/PATCH/DELETE
     requests made to API endpoints. It extracts a best-effort user id/name and
     item identifiers from the request and response.
+
+    Entries go to the activity sink, so the insert is not on the request path.
+    Requests whose view already logged explicitly (log_asset_activity, ...)
+    get no extra generic entry.
     """
 
     LOG_METHODS = ("POST", "PUT", "PATCH", "DELETE")
 
+    def process_request(self, request):
+        request._activity_scope_token = activity_sink.begin_request()
+
     def process_response(self, request, response):
+        token = getattr(request, "_activity_scope_token", None)
+        try:
+            self._log_response(request, response)
+        finally:
+            if token is not None:
+                activity_sink.end_request(token)
+        return response
+
+    def _log_response(self, request, response):
         try:
             method = request.method.upper()
             if method not in self.LOG_METHODS:
-                return response
+                return
+            if activity_sink.request_has_explicit_entries():
+                return
 
             # Best-effort: try to get user id and name from request (depends on auth setup)
             user_id = None
@@ -79,9 +98,9 @@ class ActivityLogMiddleware(MiddlewareMixin):
             if user_id is None:
                 user_id = 0
 
-            # Create the ActivityLog entry (ignore failures)
+            # Queue the ActivityLog entry (ignore failures)
             try:
-                ActivityLog.objects.create(
+                activity_sink.submit(ActivityLog(
                     user_id=user_id,
                     user_name=user_name,
                     activity_type=activity_type,
@@ -90,12 +109,10 @@ class ActivityLogMiddleware(MiddlewareMixin):
                     item_identifier=item_identifier,
                     item_name=item_name,
                     notes=f"{method} {request.path}",
-                )
+                ), explicit=False)
             except Exception:
                 pass
 
         except Exception:
             # Do not break response if logging fails
             pass
-
-        return response
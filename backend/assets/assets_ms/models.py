@@ -1,10 +1,11 @@
 from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.core.exceptions import ValidationError
-from django.db.models import Sum, Value
+from django.db.models import F, Q, Sum, Value
 from django.db.models.functions import Coalesce
 from PIL import Image
 import uuid
@@ -108,6 +109,15 @@ class Asset(models.Model):
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Support keyset pagination and server-side filters on the assets table
+        indexes = [
+            models.Index(fields=['created_at'], name='asset_created_at_idx'),
+            models.Index(fields=['updated_at'], name='asset_updated_at_idx'),
+            models.Index(fields=['status'], name='asset_status_idx'),
+            models.Index(fields=['warranty_expiration'], name='asset_warranty_exp_idx'),
+        ]
+
     def __str__(self):
         return self.asset_id
 
@@ -195,6 +205,10 @@ class Component(models.Model):
     purchase_cost = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     quantity = models.PositiveIntegerField(default=1)
     minimum_quantity = models.PositiveIntegerField(blank=True, null=True)
+    # Units currently checked out (checkouts minus checkins). Maintained by
+    # ComponentCheckout/ComponentCheckin save and delete; rebuild with the
+    # rebuild_component_stock command after bulk writes.
+    checked_out_qty = models.PositiveIntegerField(default=0, editable=False)
     notes = models.TextField(blank=True, null=True)
     image = models.ImageField(
         upload_to='component_images/',
@@ -229,7 +243,13 @@ class Component(models.Model):
     
     @property
     def available_quantity(self):
-        return self.quantity - (self.total_checked_out - self.total_checked_in)
+        return self.quantity - self.checked_out_qty
+
+    @staticmethod
+    def adjust_checked_out(component_id, delta):
+        """Atomically add delta to a component's checked_out_qty."""
+        if delta:
+            Component.objects.filter(pk=component_id).update(checked_out_qty=F('checked_out_qty') + delta)
     
 class ComponentCheckout(models.Model):
     component = models.ForeignKey(Component, on_delete=models.CASCADE, related_name='component_checkouts')
@@ -241,9 +261,27 @@ class ComponentCheckout(models.Model):
 
     def __str__(self):
         return f"Checkout of {self.component.name} to {self.asset.asset_id}"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if self.pk is not None:
+                previous = ComponentCheckout.objects.filter(pk=self.pk).values_list('component_id', 'quantity').first()
+            super().save(*args, **kwargs)
+
+            if previous == (self.component_id, self.quantity):
+                return
+            checked_in = 0
+            if previous is not None:
+                checked_in = self.component_checkins.aggregate(total=Coalesce(Sum('quantity'), Value(0)))['total']
+                Component.adjust_checked_out(previous[0], -(previous[1] - checked_in))
+            Component.adjust_checked_out(self.component_id, self.quantity - checked_in)
     
     @property
     def total_checked_in(self):
+        # Annotated by services.component_stock.annotate_checked_in
+        if hasattr(self, 'checked_in_qty'):
+            return self.checked_in_qty
         return sum(checkin.quantity for checkin in self.component_checkins.all())
 
     @property
@@ -272,7 +310,34 @@ class ComponentCheckin(models.Model):
                     f"Checkin quantity ({self.quantity}) exceeds remaining quantity "
                     f"({self.component_checkout.remaining_quantity}) for this checkout."
                 )
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = None
+            if self.pk is not None:
+                previous = ComponentCheckin.objects.filter(pk=self.pk).values_list(
+                    'component_checkout__component_id', 'quantity'
+                ).first()
+            super().save(*args, **kwargs)
+
+            component_id = self.component_checkout.component_id
+            if previous == (component_id, self.quantity):
+                return
+            if previous is not None:
+                Component.adjust_checked_out(previous[0], previous[1])
+            Component.adjust_checked_out(component_id, -self.quantity)
+
+
+# Deletes go through signals so cascades (component, asset or checkout deleted) keep the ledger right.
+# Checkins are deleted before their checkout, so a checkout only ever gives back its full quantity.
+@receiver(post_delete, sender=ComponentCheckin)
+def revert_component_checkin(sender, instance, **kwargs):
+    Component.objects.filter(component_checkouts=instance.component_checkout_id).update(
+        checked_out_qty=F('checked_out_qty') + instance.quantity
+    )
+
+
+@receiver(post_delete, sender=ComponentCheckout)
+def revert_component_checkout(sender, instance, **kwargs):
+    Component.adjust_checked_out(instance.component_id, -instance.quantity)
 
 class Repair(models.Model):
     REPAIR_CHOICES = [
@@ -407,11 +472,279 @@ class ActivityLog(models.Model):
 
     # Free-form notes and timestamp
     notes = models.TextField(blank=True, null=True)
-    datetime = models.DateTimeField(auto_now_add=True)
+    # Set when the entry is logged, not when the activity sink writes it
+    datetime = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["-datetime"]
+        # Match the activity report filters; every index ends in datetime so the
+        # date range and the newest-first ordering are served from the index
+        indexes = [
+            models.Index(fields=['datetime'], name='activitylog_datetime_idx'),
+            models.Index(fields=['activity_type', 'action', 'datetime'], name='activitylog_type_action_idx'),
+            models.Index(fields=['user_id', 'datetime'], name='activitylog_user_idx'),
+            models.Index(fields=['item_id', 'datetime'], name='activitylog_item_idx'),
+        ]
 
     def __str__(self):
         display = self.item_name or self.item_identifier or str(self.item_id or '')
         return f"{self.action} - {display}"
+
+
+class ActivityLogSearchToken(models.Model):
+    """Inverted token index over the ActivityLog text columns.
+
+    Backs activity search on databases without the PostgreSQL tsvector column
+    (SQLite in development and tests). Rows are written by the post_save hook
+    below and by the activity sink after each batch; see
+    services/activity_search.py.
+    """
+    log = models.ForeignKey(ActivityLog, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+    # Matches in item name/identifier rank above matches in people or notes
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # Prefix search is a range scan on token
+            models.Index(fields=['token', 'log'], name='activitytoken_token_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['log', 'token'], name='activitytoken_log_token_uniq'),
+        ]
+
+
+@receiver(post_save, sender=ActivityLog)
+def index_activity_log(sender, instance, created, **kwargs):
+    from .services.activity_search import index_activity_logs
+
+    index_activity_logs([instance], replace=not created)
+
+
+class ActivityLogArchive(models.Model):
+    """ActivityLog rows moved out of the hot table by the archive_activity_logs command.
+
+    Keeps the original id and timestamp. Rows older than
+    ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS are purged by the same command.
+    """
+    user_id = models.PositiveIntegerField()
+    user_name = models.CharField(max_length=150, blank=True, null=True)
+    activity_type = models.CharField(max_length=100)
+    action = models.CharField(max_length=15, choices=ActivityLog.ACTION_CHOICE)
+    item_id = models.PositiveIntegerField(blank=True, null=True)
+    item_identifier = models.CharField(max_length=100, blank=True, null=True)
+    item_name = models.CharField(max_length=200, blank=True, null=True)
+    target_id = models.PositiveIntegerField(blank=True, null=True)
+    target_name = models.CharField(max_length=150, blank=True, null=True)
+    notes = models.TextField(blank=True, null=True)
+    datetime = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        ordering = ["-datetime"]
+        indexes = [
+            models.Index(fields=['datetime'], name='activityarchive_datetime_idx'),
+        ]
+
+
+class ReportJob(models.Model):
+    """Report export generated in the background by the process_report_jobs worker.
+
+    The table doubles as the job queue: workers claim the oldest queued row and
+    store the finished file under MEDIA_ROOT/report_jobs/.
+    """
+    REPORT_TYPE_CHOICES = [
+        ('depreciation', 'Depreciation'),
+        ('assets', 'Assets'),
+        ('activity', 'Activity'),
+    ]
+    FORMAT_CHOICES = [
+        ('xlsx', 'XLSX'),
+        ('csv', 'CSV'),
+    ]
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
+    export_format = models.CharField(max_length=4, choices=FORMAT_CHOICES, default='xlsx')
+    # Query params passed to the report view, e.g. {"start_date": "2025-01-01"}
+    params = models.JSONField(default=dict, blank=True)
+    # sha256 of report_type, export_format and params; used to reuse recent artifacts
+    params_hash = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    file = models.FileField(upload_to='report_jobs/', blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    user_id = models.PositiveIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type} ({self.export_format}) - {self.status}"
+
+
+class DashboardSnapshot(models.Model):
+    """Materialized dashboard metrics, one row per section.
+
+    Write paths mark the affected sections dirty (see the signal hooks below);
+    reads recompute only dirty or out-of-date sections. version is bumped on
+    every change so a recompute that raced a write never clears the dirty flag.
+    """
+    SECTION_CHOICES = [
+        ('checkouts', 'Checkouts'),
+        ('audits', 'Audits'),
+        ('products', 'Products'),
+        ('assets', 'Assets'),
+        ('components', 'Components'),
+    ]
+
+    section = models.CharField(max_length=20, choices=SECTION_CHOICES, unique=True)
+    data = models.JSONField(default=dict, blank=True)
+    as_of = models.DateField(blank=True, null=True)
+    computed_at = models.DateTimeField(blank=True, null=True)
+    dirty = models.BooleanField(default=True)
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Dashboard {self.section} ({'dirty' if self.dirty else self.as_of})"
+
+
+# Dashboard sections affected by writes to each model
+DASHBOARD_SECTIONS_BY_MODEL = {
+    Asset: ('assets',),
+    AssetCheckout: ('checkouts',),
+    AssetCheckin: ('checkouts',),
+    AuditSchedule: ('audits',),
+    Audit: ('audits',),
+    Product: ('products', 'assets'),
+    Component: ('components',),
+    ComponentCheckout: ('components',),
+    ComponentCheckin: ('components',),
+}
+
+
+def mark_dashboard_dirty(*sections):
+    """Flag dashboard sections for recomputation on the next read."""
+    DashboardSnapshot.objects.filter(section__in=sections).update(dirty=True, version=F('version') + 1)
+
+
+def _mark_dashboard_sections(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    sections = DASHBOARD_SECTIONS_BY_MODEL[sender]
+    # After commit, so a recompute never reads the pre-write state and clears the flag
+    transaction.on_commit(lambda: mark_dashboard_dirty(*sections))
+
+
+for _model in DASHBOARD_SECTIONS_BY_MODEL:
+    post_save.connect(_mark_dashboard_sections, sender=_model, dispatch_uid=f'dashboard_{_model.__name__}_save')
+    post_delete.connect(_mark_dashboard_sections, sender=_model, dispatch_uid=f'dashboard_{_model.__name__}_delete')
+
+
+class Notification(models.Model):
+    """Persisted notification feed, one row per alert condition.
+
+    Rows are maintained by services/notification_feed.py: created when a
+    condition appears, rewritten when its text changes and resolved
+    (is_active=False) when it clears. updated_at moves on every change and
+    is the cursor clients poll with. Read/dismissed state is per user and
+    stays on the client.
+    """
+    SOURCE_CHOICES = [
+        ('products', 'Low stock products'),
+        ('components', 'Low stock components'),
+        ('warranties', 'Expired warranties'),
+        ('checkouts', 'Overdue checkouts'),
+        ('audits', 'Overdue audits'),
+    ]
+
+    # Identity of the condition, e.g. "overdue-checkout-12". Unique among active
+    # rows: a condition that clears and comes back gets a new row (and id)
+    key = models.CharField(max_length=100)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    type = models.CharField(max_length=30)
+    title = models.CharField(max_length=100)
+    message = models.TextField()
+    item_type = models.CharField(max_length=30)
+    item_id = models.PositiveIntegerField()
+    item_name = models.CharField(max_length=100, blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Set explicitly rather than auto_now: the feed writes with bulk_update
+    updated_at = models.DateTimeField(default=timezone.now)
+    resolved_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='notification_cursor_idx'),
+            models.Index(fields=['is_active', 'created_at'], name='notification_feed_idx'),
+            models.Index(fields=['source', 'is_active'], name='notification_source_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['key'], condition=Q(is_active=True), name='notification_active_key_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({'active' if self.is_active else 'resolved'})"
+
+
+class NotificationSource(models.Model):
+    """Sync state of one notification source, flagged dirty by the write hooks below.
+
+    Works like DashboardSnapshot: version is bumped on every change so a sync
+    that raced a write never clears the dirty flag.
+    """
+    name = models.CharField(max_length=20, choices=Notification.SOURCE_CHOICES, unique=True)
+    synced_at = models.DateTimeField(blank=True, null=True)
+    dirty = models.BooleanField(default=True)
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Notifications {self.name} ({'dirty' if self.dirty else self.synced_at})"
+
+
+# Notification sources affected by writes to each model. Renames that only
+# change the text of other sources' messages are picked up by the periodic sync.
+NOTIFICATION_SOURCES_BY_MODEL = {
+    Product: ('products',),
+    Asset: ('products', 'warranties'),
+    Component: ('components',),
+    ComponentCheckout: ('components',),
+    ComponentCheckin: ('components',),
+    AssetCheckout: ('checkouts',),
+    AssetCheckin: ('checkouts',),
+    AuditSchedule: ('audits',),
+    Audit: ('audits',),
+}
+
+
+def mark_notifications_dirty(*sources):
+    """Flag notification sources for a sync on the next feed read."""
+    NotificationSource.objects.filter(name__in=sources).update(dirty=True, version=F('version') + 1)
+
+
+def _mark_notification_sources(sender, **kwargs):
+    if kwargs.get('raw'):
+        return
+    sources = NOTIFICATION_SOURCES_BY_MODEL[sender]
+    transaction.on_commit(lambda: mark_notifications_dirty(*sources))
+
+
+for _model in NOTIFICATION_SOURCES_BY_MODEL:
+    post_save.connect(_mark_notification_sources, sender=_model, dispatch_uid=f'notifications_{_model.__name__}_save')
+    post_delete.connect(_mark_notification_sources, sender=_model, dispatch_uid=f'notifications_{_model.__name__}_delete')
@@ -0,0 +1,33 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AssetCursorPagination(CursorPagination):
+    """Keyset pagination for the assets table.
+
+    Pages are fetched with a WHERE on the ordering column instead of an
+    OFFSET, so a page costs the same no matter how deep it is.
+    Only non-null, indexed columns are allowed for ordering.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = 'asset_id'
+    ordering_fields = ('asset_id', 'created_at', 'updated_at', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        ordering = request.query_params.get('ordering') or self.ordering
+        if ordering.lstrip('-') not in self.ordering_fields:
+            ordering = self.ordering
+        # id breaks ties so rows sharing a timestamp keep a stable order
+        tiebreaker = '-id' if ordering.startswith('-') else 'id'
+        if ordering.lstrip('-') == 'id':
+            return (ordering,)
+        return (ordering, tiebreaker)
+
+
+class ActivityLogCursorPagination(CursorPagination):
+    """Keyset pagination for the activity log, newest first (served by the datetime index)."""
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-datetime', '-id')
@@ -2,12 +2,47 @@ from rest_framework import serializers
 from assets_ms.services.contexts import *
 from assets_ms.services.integration_help_desk import *
 from assets_ms.services.integration_ticket_tracking import *
+from assets_ms.services.asset_list import annotate_active_checkout
+from assets_ms.services.component_stock import annotate_checked_in, in_stock_components, open_component_checkouts
+from assets_ms.services.context_maps import context_map_registry
 from .models import *
 from django.db.models import Sum, Value
 from django.db.models.functions import Coalesce
+from django.urls import reverse
 from django.utils import timezone
 from datetime import datetime
 
+
+def normalize_name(name, lowercase_clone=True):
+    """Collapse whitespace and Title Case a name for consistent storage and comparisons."""
+    normalized = " ".join(name.split()).strip().title()
+    if lowercase_clone:
+        # Keep "(clone)" lowercase
+        normalized = normalized.replace("(Clone)", "(clone)")
+    return normalized
+
+
+def resolve_location(location_id, location_map=None):
+    """Return {id, name} of a help desk location, or None.
+
+    Resolved from the given map, else from the complete location catalog; a
+    direct API call is only made when the catalog could not be loaded.
+    """
+    if not location_id:
+        return None
+    if not location_map:
+        location_map = context_map_registry.get('locations')
+    if location_map:
+        location = location_map.get(location_id)
+    else:
+        location = get_location_by_id(location_id)
+    if not location or location.get('warning'):
+        return None
+    return {
+        'id': location.get('id'),
+        'name': location.get('display_name') or location.get('city') or location.get('name')
+    }
+
 # Product
 
 # Serializer for product list view
@@ -17,18 +52,30 @@ class ProductListSerializer(serializers.ModelSerializer):
     depreciation_details = serializers.SerializerMethodField()
     default_supplier_details = serializers.SerializerMethodField()
     has_assets = serializers.SerializerMethodField()
+    available_count = serializers.SerializerMethodField()
+    deployed_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
         fields = [
             'id', 'image', 'name', 'category_details', 'model_number', 'end_of_life',
             'manufacturer_details', 'depreciation_details', 'default_purchase_cost',
-            'default_supplier_details', 'minimum_quantity', 'has_assets'
+            'default_supplier_details', 'minimum_quantity', 'has_assets',
+            'available_count', 'deployed_count'
         ]
 
+    # ProductViewSet.list annotates these with annotate_stock_counts
     def get_has_assets(self, obj):
+        if hasattr(obj, 'has_assets'):
+            return obj.has_assets
         return obj.product_assets.filter(is_deleted=False).exists()
 
+    def get_available_count(self, obj):
+        return getattr(obj, 'available_count', None)
+
+    def get_deployed_count(self, obj):
+        return getattr(obj, 'deployed_count', None)
+
     def get_category_details(self, obj):
         return self.context.get("category_map", {}).get(obj.category)
 
@@ -59,10 +106,7 @@ class ProductSerializer(serializers.ModelSerializer):
         instance = self.instance
 
         if name:
-            # Normalize spacing and apply Title Case for consistent storage and comparisons
-            normalized_name = " ".join(name.split()).strip().title()
-            # Keep "(clone)" lowercase
-            normalized_name = normalized_name.replace("(Clone)", "(clone)")
+            normalized_name = normalize_name(name)
             data['name'] = normalized_name
         else:
             normalized_name = None
@@ -105,7 +149,9 @@ class ProductInstanceSerializer(serializers.ModelSerializer):
         return self.context.get("supplier_map", {}).get(obj.default_supplier)
 
     def get_assets(self, obj):
-        assets = obj.product_assets.filter(is_deleted=False).order_by('name')
+        assets = annotate_active_checkout(
+            obj.product_assets.filter(is_deleted=False).order_by('name')
+        )
 
         # Reuse full list serializer
         serializer = AssetListSerializer(
@@ -151,6 +197,9 @@ class AssetListSerializer(serializers.ModelSerializer):
         return self.context.get("ticket_map", {}).get(obj.asset_id)
 
     def get_active_checkout(self, obj):
+        # Querysets from AssetViewSet/ProductInstanceSerializer annotate this
+        if hasattr(obj, 'active_checkout_id'):
+            return obj.active_checkout_id
         checkout = obj.asset_checkouts.filter(asset_checkin__isnull=True).first()
         return checkout.id if checkout else None
     
@@ -194,10 +243,7 @@ class AssetSerializer(serializers.ModelSerializer):
                 })
 
         if name:
-            # Normalize spacing and apply Title Case
-            normalized_name = " ".join(name.split()).strip().title()
-            # Keep "(clone)" lowercase
-            normalized_name = normalized_name.replace("(Clone)", "(clone)")
+            normalized_name = normalize_name(name)
             data['name'] = normalized_name
         else:
             normalized_name = None
@@ -260,24 +306,7 @@ class AssetInstanceSerializer(serializers.ModelSerializer):
 
     def get_location_details(self, obj):
         """Return location details (id, name) from context map or help desk service."""
-        if not obj.location:
-            return None
-        # First try to get from context map (faster, already fetched)
-        location_map = self.context.get("location_map", {})
-        if location_map and obj.location in location_map:
-            loc = location_map[obj.location]
-            return {
-                'id': loc.get('id'),
-                'name': loc.get('display_name') or loc.get('city') or loc.get('name')
-            }
-        # Fallback to direct API call
-        location = get_location_by_id(obj.location)
-        if not location or location.get('warning'):
-            return None
-        return {
-            'id': location.get('id'),
-            'name': location.get('display_name') or location.get('city') or location.get('name')
-        }
+        return resolve_location(obj.location, self.context.get("location_map"))
 
     def get_product_details(self, obj):
         """Return product details with nested category, manufacturer, depreciation details."""
@@ -667,6 +696,8 @@ class AssetInstanceSerializer(serializers.ModelSerializer):
 
     def get_active_checkout(self, obj):
         """Return ID of active checkout (no checkin) or None."""
+        if hasattr(obj, 'active_checkout_id'):
+            return obj.active_checkout_id
         checkout = obj.asset_checkouts.filter(asset_checkin__isnull=True).first()
         return checkout.id if checkout else None
 
@@ -1043,14 +1074,13 @@ class ComponentListSerializer(serializers.ModelSerializer):
         return self.context.get("manufacturer_map", {}).get(obj.manufacturer)
 
     def get_active_checkout(self, obj):
-        # Check if there's an active checkout (not fully returned)
-        checkout = obj.component_checkouts.filter(
-            component_checkins__isnull=True
-        ).first() or obj.component_checkouts.exclude(
-            id__in=ComponentCheckout.objects.annotate(
-                total_returned=models.Sum('component_checkins__quantity')
-            ).filter(total_returned__gte=models.F('quantity')).values('id')
-        ).first()
+        # Annotated on the list queryset (annotate_active_component_checkout)
+        if hasattr(obj, 'active_checkout_id'):
+            return obj.active_checkout_id
+        # Fallback for unannotated instances: first checkout not fully returned
+        checkout = annotate_checked_in(obj.component_checkouts.all()).filter(
+            checked_in_qty__lt=models.F('quantity')
+        ).order_by('checked_in_qty', 'id').first()
         return checkout.id if checkout else None
 
 
@@ -1079,24 +1109,7 @@ class ComponentInstanceSerializer(serializers.ModelSerializer):
 
     def get_location_details(self, obj):
         """Return location details from context map or direct API call."""
-        if not obj.location:
-            return None
-        # First try to get from context map (faster, already fetched)
-        location_map = self.context.get("location_map", {})
-        if location_map and obj.location in location_map:
-            loc = location_map[obj.location]
-            return {
-                'id': loc.get('id'),
-                'name': loc.get('display_name') or loc.get('city') or loc.get('name')
-            }
-        # Fallback to direct API call
-        location = get_location_by_id(obj.location)
-        if not location or location.get('warning'):
-            return None
-        return {
-            'id': location.get('id'),
-            'name': location.get('display_name') or location.get('city') or location.get('name')
-        }
+        return resolve_location(obj.location, self.context.get("location_map"))
 
     def get_available_quantity(self, obj):
         """Return available quantity (property from model)."""
@@ -1169,8 +1182,7 @@ class ComponentSerializer(serializers.ModelSerializer):
         instance = self.instance
 
         if name:
-            # Normalize spacing and apply Title Case
-            normalized_name = " ".join(name.split()).strip().title()
+            normalized_name = normalize_name(name, lowercase_clone=False)
             data['name'] = normalized_name
         else:
             normalized_name = None
@@ -1186,21 +1198,13 @@ class ComponentSerializer(serializers.ModelSerializer):
         return data
 
 class ComponentCheckoutSerializer(serializers.ModelSerializer):
+    # Allow checkout only if component still has stock. The queryset is lazy:
+    # it runs as a single lookup when the field is validated or rendered.
+    component = serializers.PrimaryKeyRelatedField(queryset=in_stock_components())
+
     class Meta:
         model = ComponentCheckout
         fields = '__all__'
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Allow checkout only if component still has stock
-        available_components = [
-            c for c in Component.objects.filter(is_deleted=False)
-            if c.available_quantity > 0
-        ]
-        self.fields['component'].queryset = Component.objects.filter(
-            id__in=[c.id for c in available_components]
-        )
 
     def validate(self, data):
         component = data.get('component')
@@ -1228,24 +1232,16 @@ class ComponentCheckoutSerializer(serializers.ModelSerializer):
         return data
 
 class ComponentCheckinSerializer(serializers.ModelSerializer):
+    # Only active (not fully returned) checkouts, filtered in the database.
+    # Checked-in totals are annotated so remaining_quantity needs no extra query.
+    component_checkout = serializers.PrimaryKeyRelatedField(
+        queryset=open_component_checkouts().select_related('component', 'asset')
+    )
+
     class Meta:
         model = ComponentCheckin
         fields = '__all__'
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Fetch checkouts efficiently with related component and asset
-        available_checkouts = [
-            checkout for checkout in ComponentCheckout.objects.select_related('component', 'asset')
-            if not checkout.is_fully_returned
-        ]
-
-        # Filter queryset to include only active (not fully returned) checkouts
-        self.fields['component_checkout'].queryset = ComponentCheckout.objects.filter(
-            id__in=[c.id for c in available_checkouts]
-        )
-
     def validate(self, data):
         checkout = data.get('component_checkout')
         quantity = data.get('quantity')
@@ -1714,4 +1710,39 @@ class ActivityLogCreateSerializer(serializers.ModelSerializer):
             'target_id': {'required': False},
             'target_name': {'required': False},
             'notes': {'required': False},
-        }
\ No newline at end of file
+        }
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Read-only view of a background report job, with a download URL once done."""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'report_type', 'export_format', 'params', 'status', 'error',
+                  'download_url', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ReportJob.STATUS_DONE or not obj.file:
+            return None
+        path = reverse('report-job-download', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    """Validates a report job submission."""
+    report_type = serializers.ChoiceField(choices=ReportJob.REPORT_TYPE_CHOICES)
+    export_format = serializers.ChoiceField(choices=ReportJob.FORMAT_CHOICES, default='xlsx')
+    params = serializers.DictField(required=False, default=dict)
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """Read-only view of a persisted notification."""
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'key', 'type', 'title', 'message', 'item_type', 'item_id', 'item_name',
+                  'is_active', 'created_at', 'updated_at', 'resolved_at']
+        read_only_fields = fields
@@ -2,9 +2,11 @@
 Activity Logger Service
 
 Helper functions to log activity events to the ActivityLog model.
+Entries are written in batches by the activity sink (see activity_sink.py).
 """
 
 from ..models import ActivityLog
+from .activity_sink import activity_sink
 
 
 def log_activity(
@@ -20,7 +22,7 @@ def log_activity(
     notes: str = '',
 ):
     """
-    Create an ActivityLog entry.
+    Queue an ActivityLog entry on the activity sink.
 
     Args:
         module: Type of entity (Asset, Component, Audit, Repair)
@@ -32,10 +34,10 @@ def log_activity(
         notes: Additional notes about the activity
 
     Returns:
-        The created ActivityLog instance
+        The ActivityLog instance; it is saved by the next sink flush
     """
     # user_id is required by the model, default to 0 if not provided
-    return ActivityLog.objects.create(
+    return activity_sink.submit(ActivityLog(
         user_id=user_id or 0,
         user_name=user_name,
         activity_type=module,
@@ -46,7 +48,7 @@ def log_activity(
         target_id=target_id,
         target_name=target_name,
         notes=notes or '',
-    )
+    ))
 
 
 def log_asset_activity(
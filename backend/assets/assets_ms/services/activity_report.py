@@ -3,15 +3,45 @@ Activity Report Service
 
 Generates activity report data from the ActivityLog model.
 Supports filtering by date range, activity type, action, and user.
+
+Date filters are half-open datetime ranges ([start of start_date, start of the
+day after end_date)) rather than datetime__date casts, so the composite
+indexes on ActivityLog can be used. Entries older than
+ACTIVITY_LOG_RETENTION_DAYS live in ActivityLogArchive; when the date range
+reaches archived entries, reports and summaries read the archive as well.
 """
 
-from typing import List, Dict, Optional
-from datetime import datetime, date
-from django.db.models import Q
-from ..models import ActivityLog
+from itertools import chain, islice
+from typing import Iterator, List, Dict, Optional
+from datetime import datetime, date, time, timedelta
+from django.db.models import Count
+from django.utils import timezone
+from ..models import ActivityLog, ActivityLogArchive
+from .activity_search import search_activity_logs, search_archived_logs
 
+REPORT_CHUNK_SIZE = 2000
 
-def generate_activity_report(
+
+def _start_of_day(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_date_range(qs, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Restrict an ActivityLog (or archive) queryset to [start_date, end_date] (inclusive days, current timezone)."""
+    if start_date:
+        qs = qs.filter(datetime__gte=_start_of_day(start_date))
+    if end_date:
+        qs = qs.filter(datetime__lt=_start_of_day(end_date + timedelta(days=1)))
+    return qs
+
+
+def archived_in_range(start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """ActivityLogArchive entries in the range, or None when the range holds none (one indexed check)."""
+    qs = filter_date_range(ActivityLogArchive.objects.all(), start_date, end_date)
+    return qs if qs.exists() else None
+
+
+def iter_activity_report(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     activity_type: Optional[str] = None,
@@ -20,9 +50,12 @@ def generate_activity_report(
     item_id: Optional[int] = None,
     search: Optional[str] = None,
     limit: Optional[int] = None,
-) -> List[Dict]:
+    rank: bool = False,
+) -> Iterator[Dict]:
     """
-    Generate activity report data from ActivityLog entries.
+    Yield activity report rows from ActivityLog entries.
+
+    Reads the log in chunks so exports of large logs keep memory flat.
     
     Args:
         start_date: Filter activities from this date onwards
@@ -31,55 +64,54 @@ def generate_activity_report(
         action: Filter by action (Create, Update, Delete, Checkout, Checkin, etc.)
         user_id: Filter by the user who performed the action
         item_id: Filter by the item ID affected
-        search: Search term to filter by item name/identifier, user name, or notes
+        search: Search words (prefix matched) over item name/identifier, user name, target or notes
         limit: Maximum number of records to return
+        rank: With search, order by relevance instead of most recent first
         
-    Returns:
-        List of activity log entries formatted for reporting
+    Yields:
+        Activity log entries formatted for reporting
     """
-    qs = ActivityLog.objects.filter(is_deleted=False)
-    
-    # Apply date filters
-    if start_date:
-        qs = qs.filter(datetime__date__gte=start_date)
-    if end_date:
-        qs = qs.filter(datetime__date__lte=end_date)
-    
-    # Apply type and action filters
+    # Type, action, user and item filters
+    filters = {}
     if activity_type:
-        qs = qs.filter(activity_type=activity_type)
+        filters['activity_type'] = activity_type
     if action:
-        qs = qs.filter(action=action)
-    
-    # Apply user filter
+        filters['action'] = action
     if user_id:
-        qs = qs.filter(user_id=user_id)
-    
-    # Apply item filter
+        filters['user_id'] = user_id
     if item_id:
-        qs = qs.filter(item_id=item_id)
+        filters['item_id'] = item_id
+
+    # Apply date filters
+    qs = filter_date_range(ActivityLog.objects.filter(**filters), start_date, end_date)
     
-    # Apply search filter
+    # Apply search filter (indexed, see activity_search)
     if search:
-        search_term = search.strip()
-        qs = qs.filter(
-            Q(item_name__icontains=search_term) |
-            Q(item_identifier__icontains=search_term) |
-            Q(user_name__icontains=search_term) |
-            Q(target_name__icontains=search_term) |
-            Q(notes__icontains=search_term)
-        )
+        qs = search_activity_logs(qs, search, rank=rank)
     
-    # Order by datetime descending (most recent first)
-    qs = qs.order_by('-datetime')
+    # Order by relevance when ranking a search, else by datetime descending (most recent first)
+    if search and rank:
+        qs = qs.order_by('-search_rank', '-datetime')
+    else:
+        qs = qs.order_by('-datetime')
     
     # Apply limit if specified
     if limit:
         qs = qs[:limit]
+    logs = qs.iterator(chunk_size=REPORT_CHUNK_SIZE)
+
+    # Archived entries are all older than the hot table's, so they follow it
+    archived = archived_in_range(start_date, end_date)
+    if archived is not None:
+        archived = search_archived_logs(archived.filter(**filters), search).order_by('-datetime')
+        if limit:
+            archived = archived[:limit]
+        logs = chain(logs, archived.iterator(chunk_size=REPORT_CHUNK_SIZE))
+        if limit:
+            logs = islice(logs, limit)
     
     # Format results
-    results = []
-    for log in qs:
+    for log in logs:
         # Format datetime for display
         date_str = log.datetime.strftime('%Y-%m-%d %I:%M:%S %p') if log.datetime else ''
         
@@ -96,7 +128,7 @@ def generate_activity_report(
         else:
             user_display = 'System'
 
-        results.append({
+        yield {
             'id': log.id,
             'date': date_str,
             'datetime': log.datetime.isoformat() if log.datetime else '',
@@ -112,9 +144,32 @@ def generate_activity_report(
             'target_id': log.target_id,
             'target_name': log.target_name or '',
             'notes': log.notes or '',
-        })
-    
-    return results
+        }
+
+
+def generate_activity_report(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    activity_type: Optional[str] = None,
+    action: Optional[str] = None,
+    user_id: Optional[int] = None,
+    item_id: Optional[int] = None,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    rank: bool = False,
+) -> List[Dict]:
+    """Return activity report rows as a list. See iter_activity_report for the filters."""
+    return list(iter_activity_report(
+        start_date=start_date,
+        end_date=end_date,
+        activity_type=activity_type,
+        action=action,
+        user_id=user_id,
+        item_id=item_id,
+        search=search,
+        limit=limit,
+        rank=rank,
+    ))
 
 
 def get_activity_summary(
@@ -127,27 +182,22 @@ def get_activity_summary(
     Returns:
         Dictionary with counts by activity type and action
     """
-    qs = ActivityLog.objects.filter(is_deleted=False)
+    querysets = [filter_date_range(ActivityLog.objects.all(), start_date, end_date)]
+    archived = archived_in_range(start_date, end_date)
+    if archived is not None:
+        querysets.append(archived)
     
-    if start_date:
-        qs = qs.filter(datetime__date__gte=start_date)
-    if end_date:
-        qs = qs.filter(datetime__date__lte=end_date)
-    
-    # Count by activity type
+    # Count by activity type and by action (one grouped query each, per table), every action listed
     type_counts = {}
-    for choice in ActivityLog.ACTIVITY_TYPE_CHOICES:
-        type_key = choice[0]
-        type_counts[type_key] = qs.filter(activity_type=type_key).count()
-    
-    # Count by action
-    action_counts = {}
-    for choice in ActivityLog.ACTION_CHOICES:
-        action_key = choice[0]
-        action_counts[action_key] = qs.filter(action=action_key).count()
+    action_counts = {key: 0 for key, _ in ActivityLog.ACTION_CHOICE}
+    for qs in querysets:
+        for activity_type, count in qs.order_by().values_list('activity_type').annotate(count=Count('id')):
+            type_counts[activity_type] = type_counts.get(activity_type, 0) + count
+        for action, count in qs.order_by().values_list('action').annotate(count=Count('id')):
+            action_counts[action] = action_counts.get(action, 0) + count
     
     return {
-        'total': qs.count(),
+        'total': sum(type_counts.values()),
         'by_type': type_counts,
         'by_action': action_counts,
     }
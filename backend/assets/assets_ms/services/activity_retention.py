@@ -0,0 +1,87 @@
+"""
+Activity log retention
+
+The ActivityLog table only keeps recent entries so reports and the activity
+feed stay fast as the log grows:
+- entries older than ACTIVITY_LOG_RETENTION_DAYS are moved to
+  ActivityLogArchive, one month at a time and in batches, oldest first
+- archived entries older than ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS are deleted
+  (0 keeps the archive forever)
+
+Run by `python manage.py archive_activity_logs`, typically daily.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from ..models import ActivityLog, ActivityLogArchive
+
+ARCHIVE_BATCH_SIZE = 5000
+ARCHIVED_FIELDS = (
+    'id', 'user_id', 'user_name', 'activity_type', 'action', 'item_id', 'item_identifier',
+    'item_name', 'target_id', 'target_name', 'notes', 'datetime',
+)
+
+
+def retention_cutoff(days: Optional[int] = None) -> datetime:
+    """Entries logged before this moment belong in the archive."""
+    if days is None:
+        days = getattr(settings, 'ACTIVITY_LOG_RETENTION_DAYS', 365)
+    now = timezone.localtime()
+    # Roll over whole days so a run never splits a day between the tables
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(moment: datetime) -> datetime:
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def _archive_batch(before: datetime, batch_size: int) -> int:
+    with transaction.atomic():
+        rows = list(
+            ActivityLog.objects.filter(datetime__lt=before)
+            .order_by('datetime', 'id')
+            .values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        ActivityLogArchive.objects.bulk_create(
+            [ActivityLogArchive(**row) for row in rows], ignore_conflicts=True
+        )
+        ActivityLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    return len(rows)
+
+
+def archive_activity_logs(before: Optional[datetime] = None, batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """Move entries older than before (default: the retention cutoff) to the archive.
+
+    Returns the number of archived rows per month ("YYYY-MM").
+    """
+    before = before or retention_cutoff()
+    archived = {}
+    oldest = ActivityLog.objects.filter(datetime__lt=before).order_by('datetime').values_list('datetime', flat=True).first()
+    while oldest is not None:
+        month_start = timezone.localtime(oldest).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        month_end = min(_next_month(month_start), before)
+        count = 0
+        while True:
+            moved = _archive_batch(month_end, batch_size)
+            count += moved
+            if moved < batch_size:
+                break
+        archived[month_start.strftime('%Y-%m')] = count
+        oldest = ActivityLog.objects.filter(datetime__lt=before).order_by('datetime').values_list('datetime', flat=True).first()
+    return archived
+
+
+def purge_activity_archive(days: Optional[int] = None) -> int:
+    """Delete archived entries older than the archive retention. Returns the number deleted."""
+    if days is None:
+        days = getattr(settings, 'ACTIVITY_LOG_ARCHIVE_RETENTION_DAYS', 7 * 365)
+    if not days:
+        return 0
+    deleted, _ = ActivityLogArchive.objects.filter(datetime__lt=retention_cutoff(days)).delete()
+    return deleted
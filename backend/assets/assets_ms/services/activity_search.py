@@ -0,0 +1,193 @@
+"""
+Activity log search
+
+The activity report's `search` used to OR five icontains predicates, which
+scans the whole log. Search now goes through an index and supports prefix
+matching ("lapt" finds "Laptop") and relevance ranking:
+- PostgreSQL: a generated tsvector column (search_vector) with a GIN index,
+  created by `python manage.py build_activity_search_index`. PostgreSQL keeps
+  it up to date on every insert and update.
+- Other databases (SQLite): the ActivityLogSearchToken table, an inverted
+  index of lower-cased word tokens. It is written on save and by the activity
+  sink after each batch. Prefix lookups are range scans on the token index.
+
+Every word of the search must match, as a prefix of some indexed word. Item
+name and identifier matches rank above user, target and notes matches. On
+PostgreSQL without the column, search falls back to icontains.
+"""
+
+import re
+import time
+from typing import Iterable, List
+from django.db import connection
+from django.db.models import BooleanField, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from ..models import ActivityLog, ActivityLogSearchToken
+
+# Column -> weight; PostgreSQL uses weight class A for 2 and B for 1
+SEARCH_FIELDS = {
+    'item_name': 2,
+    'item_identifier': 2,
+    'user_name': 1,
+    'target_name': 1,
+    'notes': 1,
+}
+MAX_TOKEN_LENGTH = 64
+MAX_SEARCH_TERMS = 8
+TOKEN_BATCH_SIZE = 2000
+SEARCH_VECTOR_COLUMN = 'search_vector'
+SEARCH_INDEX_NAME = 'activitylog_search_gin'
+# How long a missing search_vector column is remembered before checking again
+READY_CHECK_INTERVAL = 60
+
+_pg_ready = {'value': False, 'checked_at': 0.0}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text) -> List[str]:
+    """Lower-cased word tokens of text, in order, without duplicates."""
+    if not text:
+        return []
+    seen = dict.fromkeys(token[:MAX_TOKEN_LENGTH] for token in _TOKEN_RE.findall(str(text).lower()))
+    return list(seen)
+
+
+def _uses_postgres() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def postgres_search_ready() -> bool:
+    """True when the search_vector column exists (checked at most every READY_CHECK_INTERVAL seconds)."""
+    if not _uses_postgres():
+        return False
+    if _pg_ready['value'] or time.time() - _pg_ready['checked_at'] < READY_CHECK_INTERVAL:
+        return _pg_ready['value']
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = %s",
+            [ActivityLog._meta.db_table, SEARCH_VECTOR_COLUMN],
+        )
+        _pg_ready['value'] = cursor.fetchone() is not None
+    _pg_ready['checked_at'] = time.time()
+    return _pg_ready['value']
+
+
+def ensure_postgres_search_index() -> None:
+    """Add the generated search_vector column and its GIN index (idempotent, PostgreSQL only)."""
+    table = connection.ops.quote_name(ActivityLog._meta.db_table)
+    weighted = ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({connection.ops.quote_name(field)}, '')), "
+        f"'{'A' if weight == 2 else 'B'}')"
+        for field, weight in SEARCH_FIELDS.items()
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector "
+            f"GENERATED ALWAYS AS ({weighted}) STORED"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_NAME} ON {table} USING gin ({SEARCH_VECTOR_COLUMN})"
+        )
+    _pg_ready.update(value=True, checked_at=time.time())
+
+
+def _token_rows(log) -> Iterable[ActivityLogSearchToken]:
+    weights = {}
+    for field, weight in SEARCH_FIELDS.items():
+        for token in tokenize(getattr(log, field)):
+            weights[token] = max(weight, weights.get(token, 0))
+    return [ActivityLogSearchToken(log_id=log.pk, token=token, weight=weight) for token, weight in weights.items()]
+
+
+def index_activity_logs(logs: Iterable[ActivityLog], replace: bool = False) -> int:
+    """Write search tokens for saved logs. No-op on PostgreSQL, where the tsvector column is used."""
+    if _uses_postgres():
+        return 0
+    logs = [log for log in logs if log.pk is not None]
+    if not logs:
+        return 0
+    if replace:
+        ActivityLogSearchToken.objects.filter(log_id__in=[log.pk for log in logs]).delete()
+    rows = [row for log in logs for row in _token_rows(log)]
+    ActivityLogSearchToken.objects.bulk_create(rows, batch_size=TOKEN_BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
+
+
+def rebuild_search_tokens(batch_size: int = TOKEN_BATCH_SIZE) -> int:
+    """Re-index every ActivityLog into the token table. Returns the number of logs indexed."""
+    ActivityLogSearchToken.objects.all().delete()
+    count = 0
+    last_id = 0
+    while True:
+        batch = list(ActivityLog.objects.filter(id__gt=last_id).order_by('id')[:batch_size])
+        if not batch:
+            return count
+        index_activity_logs(batch)
+        count += len(batch)
+        last_id = batch[-1].id
+
+
+def _prefix_q(term: str) -> Q:
+    # A range instead of startswith, so the token index is used on every backend
+    return Q(token__gte=term, token__lt=term + '\uffff')
+
+
+def _legacy_search(qs, search: str):
+    return qs.filter(
+        Q(item_name__icontains=search) |
+        Q(item_identifier__icontains=search) |
+        Q(user_name__icontains=search) |
+        Q(target_name__icontains=search) |
+        Q(notes__icontains=search)
+    )
+
+
+def search_archived_logs(qs, search: str):
+    """Filter an ActivityLogArchive queryset to entries matching search.
+
+    The archive has no search index; it is matched with icontains, within the
+    date range the caller already applied.
+    """
+    search = (search or '').strip()
+    return _legacy_search(qs, search) if search else qs
+
+
+def search_activity_logs(qs, search: str, rank: bool = False):
+    """Filter an ActivityLog queryset to entries matching search.
+
+    With rank=True the queryset is annotated with `search_rank` (higher is more relevant).
+    """
+    search = (search or '').strip()
+    terms = tokenize(search)[:MAX_SEARCH_TERMS]
+    if not terms:
+        return qs
+
+    if _uses_postgres():
+        if not postgres_search_ready():
+            qs = _legacy_search(qs, search)
+            return qs.annotate(search_rank=RawSQL('0', [], output_field=FloatField())) if rank else qs
+        column = f"{connection.ops.quote_name(ActivityLog._meta.db_table)}.{SEARCH_VECTOR_COLUMN}"
+        # Terms are \w+ tokens, safe to join into a tsquery
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        qs = qs.annotate(
+            search_match=RawSQL(f"{column} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+        ).filter(search_match=True)
+        if rank:
+            qs = qs.annotate(
+                search_rank=RawSQL(f"ts_rank({column}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+            )
+        return qs
+
+    for term in terms:
+        qs = qs.filter(id__in=ActivityLogSearchToken.objects.filter(_prefix_q(term)).values('log_id'))
+    if rank:
+        any_term = Q()
+        for term in terms:
+            any_term |= _prefix_q(term)
+        score = (
+            ActivityLogSearchToken.objects.filter(any_term, log=OuterRef('pk'))
+            .order_by().values('log').annotate(score=Sum('weight')).values('score')
+        )
+        qs = qs.annotate(search_rank=Subquery(score, output_field=FloatField()))
+    return qs
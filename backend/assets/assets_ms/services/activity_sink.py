@@ -0,0 +1,146 @@
+"""
+Activity sink
+
+ActivityLog rows are not inserted on the request path. They are handed to
+activity_sink, which buffers them in process and writes them with bulk_create:
+- a background thread flushes when ACTIVITY_LOG_BATCH_SIZE entries are
+  waiting or every ACTIVITY_LOG_FLUSH_INTERVAL seconds
+- entries logged inside a transaction are only queued once it commits
+  (transaction.on_commit), so rolled back writes leave no log
+- the queue holds at most ACTIVITY_LOG_MAX_QUEUE entries. When it is full,
+  ACTIVITY_LOG_OVERFLOW = "block" makes the caller flush inline
+  (backpressure), "drop" discards the entry and counts it in `dropped`
+- within one request, entries from the explicit loggers (log_asset_activity,
+  ...) replace the generic entry ActivityLogMiddleware would add
+
+With ACTIVITY_LOG_WRITE_BEHIND off (tests) there is no thread: a request's
+entries are written in one batch when the response is sent, and entries logged
+outside a request are written immediately.
+"""
+
+import atexit
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+from django.conf import settings
+from django.db import connection, connections, transaction
+from ..models import ActivityLog
+from .activity_search import index_activity_logs
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+
+# State of the request being handled by this thread, set by ActivityLogMiddleware
+_request_scope: ContextVar[Optional[dict]] = ContextVar("activity_request_scope", default=None)
+
+
+class ActivitySink:
+    def __init__(self, batch_size=None, flush_interval=None, max_queue=None, overflow=None, write_behind=None):
+        self.batch_size = batch_size or getattr(settings, "ACTIVITY_LOG_BATCH_SIZE", 100)
+        self.flush_interval = flush_interval or getattr(settings, "ACTIVITY_LOG_FLUSH_INTERVAL", 2.0)
+        self.max_queue = max_queue or getattr(settings, "ACTIVITY_LOG_MAX_QUEUE", 10000)
+        self.overflow = overflow or getattr(settings, "ACTIVITY_LOG_OVERFLOW", OVERFLOW_BLOCK)
+        if write_behind is None:
+            write_behind = getattr(settings, "ACTIVITY_LOG_WRITE_BEHIND", True)
+        self.write_behind = write_behind
+        self.dropped = 0
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker = None
+
+    def submit(self, entry: ActivityLog, explicit: bool = True) -> ActivityLog:
+        """Queue an unsaved ActivityLog; it is written by the next flush."""
+        scope = _request_scope.get()
+        if scope is not None and explicit:
+            scope["explicit"] = True
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self._enqueue(entry))
+        else:
+            self._enqueue(entry)
+        return entry
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def flush(self) -> int:
+        """Write every queued entry now. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._queue)
+                self._queue.clear()
+            if not batch:
+                return 0
+            try:
+                ActivityLog.objects.bulk_create(batch, batch_size=self.batch_size)
+                # bulk_create skips post_save, so index the batch for search here
+                index_activity_logs(batch)
+            except Exception:
+                logger.exception("Writing %d activity log entries failed", len(batch))
+                return 0
+            return len(batch)
+
+    def _enqueue(self, entry: ActivityLog) -> None:
+        with self._lock:
+            full = len(self._queue) >= self.max_queue
+            if full and self.overflow == OVERFLOW_DROP:
+                self.dropped += 1
+                logger.warning("Activity log queue full, dropped entry (%d dropped so far)", self.dropped)
+                return
+        if full:
+            # Backpressure: the caller pays for the insert instead of losing the entry
+            self.flush()
+
+        with self._lock:
+            self._queue.append(entry)
+            size = len(self._queue)
+
+        if not self.write_behind:
+            if _request_scope.get() is None:
+                self.flush()
+            return
+        self._ensure_worker()
+        if size >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="activity-log-sink", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+    # Request scope, driven by ActivityLogMiddleware
+
+    def begin_request(self):
+        return _request_scope.set({"explicit": False})
+
+    def request_has_explicit_entries(self) -> bool:
+        scope = _request_scope.get()
+        return bool(scope and scope["explicit"])
+
+    def end_request(self, token) -> None:
+        _request_scope.reset(token)
+        if not self.write_behind:
+            self.flush()
+
+
+activity_sink = ActivitySink()
+# Do not lose buffered entries when a worker process shuts down cleanly
+atexit.register(activity_sink.flush)
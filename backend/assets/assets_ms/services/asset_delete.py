@@ -0,0 +1,89 @@
+"""
+Bulk asset deletion
+
+find_delete_blockers() checks every precondition for a whole id set at once:
+one grouped query per relation (open checkouts, component checkouts not fully
+returned, pending audit schedules) and one ticket snapshot read, instead of
+three queries and a ticket list download per asset. bulk_soft_delete() then
+soft deletes the assets with a single UPDATE. The snapshot is read before the
+rows are locked, since refreshing it is an HTTP call.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+from django.db import transaction
+from django.db.models import Count
+from ..models import Asset, AssetCheckout, AuditSchedule, mark_dashboard_dirty, mark_notifications_dirty
+from .component_stock import open_component_checkouts
+from .ticket_snapshot import get_ticket_snapshot
+
+
+def find_delete_blockers(assets: Dict[int, str], tickets_by_asset: Optional[Dict] = None) -> Dict[int, List[str]]:
+    """Return {asset pk: [reasons]} for the assets (pk -> display asset_id) that cannot be deleted.
+
+    tickets_by_asset is the ticket snapshot's "by_asset" map; it is read here when not given.
+    """
+    ids = list(assets)
+    blockers = defaultdict(list)
+
+    checked_out = AssetCheckout.objects.filter(
+        asset_id__in=ids, asset_checkin__isnull=True
+    ).values_list('asset_id', flat=True).distinct()
+    for asset_pk in checked_out:
+        blockers[asset_pk].append(f"Cannot delete asset '{assets[asset_pk]}', it's currently checked out.")
+
+    component_names = defaultdict(list)
+    for asset_pk, name in open_component_checkouts().filter(asset_id__in=ids).values_list('asset_id', 'component__name'):
+        if name not in component_names[asset_pk]:
+            component_names[asset_pk].append(name)
+    for asset_pk, names in component_names.items():
+        blockers[asset_pk].append(
+            f"Cannot delete asset '{assets[asset_pk]}', it has components checked out that are not fully returned: {', '.join(names)}."
+        )
+
+    pending_audits = AuditSchedule.objects.filter(
+        asset_id__in=ids, is_deleted=False, audit__isnull=True
+    ).values('asset_id').annotate(count=Count('id'))
+    for row in pending_audits:
+        blockers[row['asset_id']].append(
+            f"Cannot delete asset '{assets[row['asset_id']]}', it has {row['count']} pending audit schedule(s) that have not been performed yet."
+        )
+
+    if tickets_by_asset is None:
+        tickets_by_asset = get_ticket_snapshot()["by_asset"]
+    for asset_pk in ids:
+        referencing_tickets = [t for t in tickets_by_asset.get(asset_pk, []) if not t.get("is_resolved", False)]
+        if referencing_tickets:
+            ticket_ids = ', '.join([str(t.get('id')) for t in referencing_tickets])
+            blockers[asset_pk].append(
+                f"Cannot delete asset '{assets[asset_pk]}', it has {len(referencing_tickets)} ticket(s) referencing it (IDs: {ticket_ids})."
+            )
+
+    return dict(blockers)
+
+
+def bulk_soft_delete(ids: Iterable[int]) -> Dict:
+    """Soft delete the given assets if none of them is blocked.
+
+    Returns {"deleted": count, "blocked": {pk: [reasons]}}; nothing is deleted
+    when blocked is not empty.
+    """
+    # Outside the transaction: a stale snapshot is refreshed over HTTP, which must not hold the row locks
+    tickets_by_asset = get_ticket_snapshot()["by_asset"]
+    with transaction.atomic():
+        # Lock the rows so a checkout cannot slip in between the checks and the update
+        assets = dict(
+            Asset.objects.select_for_update()
+            .filter(id__in=ids, is_deleted=False)
+            .values_list('id', 'asset_id')
+        )
+        blocked = find_delete_blockers(assets, tickets_by_asset)
+        if blocked:
+            return {"deleted": 0, "blocked": blocked}
+
+        deleted = Asset.objects.filter(id__in=list(assets), is_deleted=False).update(is_deleted=True)
+        # update() skips the post_save hooks that normally flag the dashboard and notifications
+        if deleted:
+            transaction.on_commit(lambda: mark_dashboard_dirty('assets'))
+            transaction.on_commit(lambda: mark_notifications_dirty('products', 'warranties'))
+    return {"deleted": deleted, "blocked": {}}
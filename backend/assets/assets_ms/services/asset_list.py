@@ -0,0 +1,90 @@
+"""
+Asset list service
+
+Server-side filtering and per-page caching for the paginated assets table.
+The legacy whole-table payload stays available on /assets/ without query
+params; any of LIST_QUERY_PARAMS switches the list to cursor pagination.
+"""
+
+import hashlib
+from datetime import datetime
+from django.db.models import OuterRef, Subquery
+from ..models import AssetCheckout
+from .cache_keys import versioned_key
+
+
+# Query params that switch AssetViewSet.list into paginated mode
+FILTER_PARAMS = ('status', 'product', 'location', 'supplier', 'warranty_after', 'warranty_before')
+LIST_QUERY_PARAMS = ('cursor', 'page_size', 'ordering') + FILTER_PARAMS
+
+# Cache settings
+LIST_PAGE_CACHE_TTL = 300
+
+
+def wants_paginated_list(query_params):
+    """Return True if the request asks for the cursor-paginated asset list."""
+    return any(query_params.get(p) for p in LIST_QUERY_PARAMS)
+
+
+def _parse_ids(value, name):
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid {name} parameter. IDs must be integers.")
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid {name} parameter. Use YYYY-MM-DD.")
+
+
+def annotate_active_checkout(queryset):
+    """Annotate assets with `active_checkout_id`, the first checkout without a checkin.
+
+    Lets list serializers read the active checkout without a query per row.
+    """
+    active_checkout = AssetCheckout.objects.filter(
+        asset=OuterRef('pk'),
+        asset_checkin__isnull=True,
+    ).order_by('id').values('id')[:1]
+    return queryset.annotate(active_checkout_id=Subquery(active_checkout))
+
+
+def filter_assets(queryset, query_params):
+    """Apply list filters from query params to an Asset queryset.
+
+    Supported params (ids may be comma-separated):
+    - status, product, location, supplier
+    - warranty_after / warranty_before: inclusive warranty_expiration window (YYYY-MM-DD)
+
+    Raises ValueError with a user-facing message on invalid input.
+    """
+    id_filters = {
+        'status': 'status__in',
+        'product': 'product_id__in',
+        'location': 'location__in',
+        'supplier': 'supplier__in',
+    }
+    for param, lookup in id_filters.items():
+        value = query_params.get(param)
+        if value:
+            queryset = queryset.filter(**{lookup: _parse_ids(value, param)})
+
+    warranty_after = query_params.get('warranty_after')
+    if warranty_after:
+        queryset = queryset.filter(warranty_expiration__gte=_parse_date(warranty_after, 'warranty_after'))
+
+    warranty_before = query_params.get('warranty_before')
+    if warranty_before:
+        queryset = queryset.filter(warranty_expiration__lte=_parse_date(warranty_before, 'warranty_before'))
+
+    return queryset
+
+
+def get_page_cache_key(query_params):
+    """Build a cache key for one page of the list from its query params."""
+    items = sorted((k, ",".join(query_params.getlist(k))) for k in query_params.keys())
+    digest = hashlib.md5(repr(items).encode()).hexdigest()
+    return versioned_key("assets", f"list:page:{digest}")
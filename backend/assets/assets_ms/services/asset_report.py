@@ -1,4 +1,5 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
+from django.db.models import OuterRef, Subquery
 from ..models import Asset, AssetCheckout
 from .contexts import (
     get_statuses_list,
@@ -7,7 +8,9 @@ from .contexts import (
     get_manufacturers_list,
     get_depreciations_list,
 )
-from .integration_help_desk import *
+from .context_maps import context_map_registry
+
+REPORT_CHUNK_SIZE = 2000
 
 
 def _build_lookup_dict(data) -> Dict[int, Dict]:
@@ -21,17 +24,18 @@ def _build_lookup_dict(data) -> Dict[int, Dict]:
     return {item.get('id'): item for item in items if item.get('id')}
 
 
-def generate_asset_report(
+def iter_asset_report(
     status_id: Optional[int] = None,
     category_id: Optional[int] = None,
     supplier_id: Optional[int] = None,
     location_id: Optional[int] = None,
     product_id: Optional[int] = None,
     manufacturer_id: Optional[int] = None,
-) -> List[Dict]:
-    """Return a list of assets with their full details for reporting.
+) -> Iterator[Dict]:
+    """Yield assets with their full details for reporting.
 
-    Uses batch fetching for context data to avoid per-asset HTTP calls.
+    Uses batch fetching for context data to avoid per-asset HTTP calls, and
+    reads assets in chunks so memory stays flat for exports.
     """
     qs = Asset.objects.select_related('product').filter(
         is_deleted=False,
@@ -57,24 +61,17 @@ def generate_asset_report(
     categories_lookup = _build_lookup_dict(get_categories_list(limit=500))
     suppliers_lookup = _build_lookup_dict(get_suppliers_list(limit=500))
     manufacturers_lookup = _build_lookup_dict(get_manufacturers_list(limit=500))
-    locations_lookup = _build_lookup_dict(get_locations_list(limit=500))
+    locations_lookup = context_map_registry.get('locations')
     depreciations_lookup = _build_lookup_dict(get_depreciations_list(limit=500))
 
-    # Get active checkouts for all assets (checkouts without a corresponding checkin)
-    active_checkouts = {}
-    checkout_qs = AssetCheckout.objects.filter(
-        asset_checkin__isnull=True  # Not checked in yet (no related AssetCheckin)
-    ).select_related('asset')
-    for checkout in checkout_qs:
-        if checkout.asset_id:
-            active_checkouts[checkout.asset_id] = {
-                'checkout_to': checkout.checkout_to or '',
-                'checkout_date': checkout.checkout_date.isoformat() if checkout.checkout_date else '',
-            }
-
-    results = []
-
-    for asset in qs.order_by('asset_id'):
+    # Active checkout (no corresponding checkin) of each asset
+    active_checkout_to = AssetCheckout.objects.filter(
+        asset=OuterRef('pk'),
+        asset_checkin__isnull=True,
+    ).order_by('-id').values('checkout_to')[:1]
+    qs = qs.annotate(active_checkout_to=Subquery(active_checkout_to))
+
+    for asset in qs.order_by('asset_id').iterator(chunk_size=REPORT_CHUNK_SIZE):
         product = getattr(asset, 'product', None)
 
         # Status lookup from cache
@@ -124,8 +121,7 @@ def generate_asset_report(
             purchase_cost = 0.0
 
         # Checkout info
-        checkout_info = active_checkouts.get(asset.id, {})
-        checked_out_to = str(checkout_info.get('checkout_to', '')) if checkout_info.get('checkout_to') else ''
+        checked_out_to = str(asset.active_checkout_to) if asset.active_checkout_to else ''
 
         # Audit dates
         last_audit = asset.last_audit_date.isoformat() if hasattr(asset, 'last_audit_date') and asset.last_audit_date else ''
@@ -135,7 +131,7 @@ def generate_asset_report(
         # Image URL
         image_url = asset.image.url if asset.image else ''
 
-        results.append({
+        yield {
             'id': asset.id,
             'assetId': asset.asset_id or str(asset.id),
             'name': asset.name or '',
@@ -159,9 +155,26 @@ def generate_asset_report(
             'image': image_url,
             'createdAt': created_at_str,
             'updatedAt': updated_at_str,
-        })
+        }
 
-    return results
+
+def generate_asset_report(
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    supplier_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    product_id: Optional[int] = None,
+    manufacturer_id: Optional[int] = None,
+) -> List[Dict]:
+    """Return a list of assets with their full details for reporting."""
+    return list(iter_asset_report(
+        status_id=status_id,
+        category_id=category_id,
+        supplier_id=supplier_id,
+        location_id=location_id,
+        product_id=product_id,
+        manufacturer_id=manufacturer_id,
+    ))
 
 
 def print_sample_report(limit: int = 10) -> None:
@@ -0,0 +1,144 @@
+"""
+Set-based bulk edit
+
+Bulk edit applies one payload to many rows (products, assets, components).
+Running the serializer and save() per row meant a uniqueness query, a contexts
+status lookup and an image upload for every row. apply_bulk_edit() instead:
+- validates the shared fields once with the model's serializer
+- generates the per-row names ("Name (1)", "Name (2)", ...) and checks them
+  all against existing rows in one query
+- stores an uploaded image once and points every row at that file
+- writes all rows with bulk_update in chunks inside one transaction
+"""
+
+from typing import Dict, List, Optional
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+from ..models import (
+    DASHBOARD_SECTIONS_BY_MODEL, NOTIFICATION_SOURCES_BY_MODEL, mark_dashboard_dirty, mark_notifications_dirty,
+)
+
+BULK_UPDATE_BATCH_SIZE = 500
+
+
+def _generate_names(rows, base_name, lowercase_clone) -> Dict[int, str]:
+    from ..serializer import normalize_name
+
+    if len(rows) == 1:
+        return {rows[0].pk: normalize_name(base_name, lowercase_clone)}
+    return {
+        row.pk: normalize_name(f"{base_name} ({index + 1})", lowercase_clone)
+        for index, row in enumerate(rows)
+    }
+
+
+def _taken_names(model, names, exclude_pks) -> set:
+    """Lower-cased names among `names` already used by other active rows, in one query."""
+    return set(
+        model.objects.filter(is_deleted=False)
+        .exclude(pk__in=exclude_pks)
+        .annotate(lower_name=Lower('name'))
+        .filter(lower_name__in={name.lower() for name in names})
+        .values_list('lower_name', flat=True)
+    )
+
+
+def _delete_unreferenced_images(model, names) -> None:
+    field = model._meta.get_field('image')
+    referenced = set(model.objects.filter(image__in=names).values_list('image', flat=True))
+    for name in set(names) - referenced:
+        field.storage.delete(name)
+
+
+def apply_bulk_edit(queryset, serializer_class, data: Dict, name_error: str, lowercase_clone: bool = True,
+                    image_content: Optional[bytes] = None, image_name: Optional[str] = None,
+                    remove_image: bool = False) -> Dict[str, List]:
+    """Apply data to every row of queryset.
+
+    Returns {"updated": [ids], "failed": [{"id", "errors"}], "instances": [rows]};
+    instances are the updated rows, for activity logging.
+    """
+    model = queryset.model
+    rows = list(queryset.order_by('id'))
+    result = {"updated": [], "failed": [], "instances": []}
+    if not rows:
+        return result
+
+    # Shared fields are the same for every row, so validate them once
+    shared = {key: value for key, value in data.items() if key != 'name'}
+    validated = {}
+    if shared:
+        serializer = serializer_class(rows[0], data=shared, partial=True)
+        if not serializer.is_valid():
+            result["failed"] = [{"id": row.pk, "errors": serializer.errors} for row in rows]
+            return result
+        validated = serializer.validated_data
+
+    names = {}
+    if data.get('name') is not None:
+        name_field = serializer_class().fields['name']
+        for pk, name in _generate_names(rows, str(data['name']), lowercase_clone).items():
+            try:
+                names[pk] = name_field.run_validation(name)
+            except serializers.ValidationError as exc:
+                result["failed"].append({"id": pk, "errors": {"name": exc.detail}})
+        # Edited rows get new names, so only the other rows can clash
+        taken = _taken_names(model, names.values(), exclude_pks=[row.pk for row in rows])
+        for pk, name in list(names.items()):
+            if name.lower() in taken:
+                del names[pk]
+                result["failed"].append({"id": pk, "errors": {"name": [name_error]}})
+
+    failed_pks = {entry["id"] for entry in result["failed"]}
+    rows = [row for row in rows if row.pk not in failed_pks]
+    if not rows:
+        return result
+
+    fields = set(validated) | {'updated_at'}
+    if names:
+        fields.add('name')
+    image_field = model._meta.get_field('image')
+    stored_image = None
+    if image_content is not None:
+        # One file in storage shared by every row
+        stored_image = image_field.storage.save(
+            image_field.generate_filename(rows[0], image_name), ContentFile(image_content)
+        )
+        fields.add('image')
+    old_images = set()
+    if remove_image:
+        old_images = {row.image.name for row in rows if row.image}
+        fields.add('image')
+
+    now = timezone.now()
+    for row in rows:
+        for field, value in validated.items():
+            setattr(row, field, value)
+        if row.pk in names:
+            row.name = names[row.pk]
+        if stored_image is not None:
+            row.image = stored_image
+        elif remove_image:
+            row.image = None
+        # bulk_update skips auto_now
+        row.updated_at = now
+
+    with transaction.atomic():
+        model.objects.bulk_update(rows, sorted(fields), batch_size=BULK_UPDATE_BATCH_SIZE)
+        if old_images:
+            # Files may be shared with rows outside this edit, so only delete unreferenced ones
+            transaction.on_commit(lambda: _delete_unreferenced_images(model, old_images))
+        sections = DASHBOARD_SECTIONS_BY_MODEL.get(model)
+        if sections:
+            # bulk_update skips the post_save hook that normally flags the dashboard
+            transaction.on_commit(lambda: mark_dashboard_dirty(*sections))
+        sources = NOTIFICATION_SOURCES_BY_MODEL.get(model)
+        if sources:
+            transaction.on_commit(lambda: mark_notifications_dirty(*sources))
+
+    result["updated"] = [row.pk for row in rows]
+    result["instances"] = rows
+    return result
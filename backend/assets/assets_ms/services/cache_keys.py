@@ -0,0 +1,43 @@
+"""
+Cache key service
+
+Namespaced, generation-versioned cache keys: `<namespace>:g<generation>:<key>`.
+
+Every namespace (assets, products, ...) has a generation counter stored in the
+shared cache. Bumping it makes all keys of the namespace unreachable at once,
+in O(1) and for every gunicorn worker, without enumerating or deleting them;
+old entries simply expire through their TTL.
+"""
+
+import time
+from django.core.cache import cache
+
+
+def _generation_key(namespace):
+    return f"{namespace}:generation"
+
+
+def get_generation(namespace):
+    """Return the current generation of a namespace, creating it if needed."""
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so an evicted counter never reuses an old generation
+        cache.add(key, int(time.time() * 1000), None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace):
+    """Invalidate every key of a namespace by moving to a new generation."""
+    key = _generation_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing (never read or evicted): start a fresh generation
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def versioned_key(namespace, key):
+    """Build a cache key that is dropped when the namespace generation is bumped."""
+    return f"{namespace}:g{get_generation(namespace)}:{key}"
@@ -0,0 +1,91 @@
+"""
+Component stock ledger
+
+Component.checked_out_qty holds the units currently checked out (checkouts
+minus checkins), kept up to date by ComponentCheckout/ComponentCheckin save
+and delete. Availability is quantity - checked_out_qty, so stock checks,
+low-stock filters and the component list read a column instead of summing
+every checkout and checkin.
+
+rebuild_checked_out_qty() recomputes the column from the checkout/checkin
+tables, for backfilling after the column is added and after bulk writes
+that bypass model save/delete.
+"""
+
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from ..models import Component, ComponentCheckin, ComponentCheckout
+
+
+def annotate_available_quantity(queryset):
+    """Annotate available_qty (quantity - checked_out_qty) for DB-side filtering."""
+    return queryset.annotate(available_qty=F('quantity') - F('checked_out_qty'))
+
+
+def in_stock_components():
+    """Non-deleted components with at least one unit available."""
+    return Component.objects.filter(is_deleted=False, checked_out_qty__lt=F('quantity'))
+
+
+def annotate_checked_in(queryset):
+    """Annotate checked_in_qty (sum of checkins) on a ComponentCheckout queryset.
+
+    ComponentCheckout.total_checked_in/remaining_quantity use the annotation when present.
+    """
+    return queryset.annotate(checked_in_qty=Coalesce(Sum('component_checkins__quantity'), Value(0)))
+
+
+def open_component_checkouts():
+    """Component checkouts that are not fully returned, filtered in the database."""
+    return annotate_checked_in(ComponentCheckout.objects.all()).filter(checked_in_qty__lt=F('quantity'))
+
+
+def annotate_active_component_checkout(queryset):
+    """Annotate components with `active_checkout_id`, their first open (not fully returned) checkout.
+
+    Checkouts with nothing returned yet win over partially returned ones, then
+    the lowest id. Components with nothing checked out skip the subquery.
+    """
+    open_checkouts = annotate_checked_in(
+        ComponentCheckout.objects.filter(component=OuterRef('pk'))
+    ).filter(checked_in_qty__lt=F('quantity')).order_by('checked_in_qty', 'id').values('id')[:1]
+    return queryset.annotate(active_checkout_id=Case(
+        When(checked_out_qty=0, then=Value(None)),
+        default=Subquery(open_checkouts),
+        output_field=IntegerField(),
+    ))
+
+
+def low_stock_components(queryset=None, inclusive=False):
+    """Components with a minimum set whose available stock is below (or at, if inclusive) the minimum."""
+    queryset = queryset if queryset is not None else Component.objects.filter(is_deleted=False)
+    lookup = 'available_qty__lte' if inclusive else 'available_qty__lt'
+    return annotate_available_quantity(queryset.filter(minimum_quantity__gt=0)).filter(
+        **{lookup: F('minimum_quantity')}
+    )
+
+
+def _ledger_expression():
+    checked_out = ComponentCheckout.objects.filter(component=OuterRef('pk')).values('component').annotate(
+        total=Sum('quantity')
+    ).values('total')
+    checked_in = ComponentCheckin.objects.filter(component_checkout__component=OuterRef('pk')).values(
+        'component_checkout__component'
+    ).annotate(total=Sum('quantity')).values('total')
+    return (
+        Coalesce(Subquery(checked_out, output_field=IntegerField()), Value(0))
+        - Coalesce(Subquery(checked_in, output_field=IntegerField()), Value(0))
+    )
+
+
+def rebuild_checked_out_qty(component_ids=None):
+    """Recompute checked_out_qty from the ledger tables. Returns the number of components corrected."""
+    queryset = Component.objects.all()
+    if component_ids is not None:
+        queryset = queryset.filter(pk__in=component_ids)
+
+    drifted = queryset.annotate(expected=_ledger_expression()).filter(~Q(checked_out_qty=F('expected')))
+    drifted_ids = list(drifted.values_list('pk', flat=True))
+    if drifted_ids:
+        Component.objects.filter(pk__in=drifted_ids).update(checked_out_qty=_ledger_expression())
+    return len(drifted_ids)
@@ -0,0 +1,290 @@
+"""
+Context map registry
+
+Viewsets hand serializers id -> item maps (categories, suppliers, statuses,
+product names, ...) built from the contexts/help desk services or from the
+database. ContextMapRegistry is the one place those maps are loaded and cached:
+- single-flight: on a miss only one request (per key, across workers via a
+  cache lock) runs the loader; the others wait for its result
+- stale-while-revalidate: after the soft TTL the cached map is still served
+  while one background refresh replaces it
+- negative caching: a failed load caches an empty map for a short TTL, or
+  keeps serving the last good map, so an unavailable upstream is not hammered
+- empty maps are valid cache entries (no more `if not map` refetching)
+- conditional loaders get the previous map and its validators (e.g. ETags),
+  so a refresh can revalidate instead of downloading everything again
+- get_many() reads several maps in one cache round trip and loads the
+  missing ones concurrently (fan_out), together with any extra upstream calls
+- per-map hit/miss/load counters, see ContextMapRegistry.stats()
+
+Maps are registered once below and read with `context_map_registry.get(name)`.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from ..models import Asset, Product
+from .cache_keys import versioned_key
+from .fanout import Call, fan_out
+from .contexts import (
+    get_category_names, get_depreciation_names, get_manufacturer_names,
+    get_status_names_assets, get_status_names_repairs, get_supplier_names,
+)
+from .location_catalog import load_location_catalog
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOFT_TTL = 300
+DEFAULT_NEGATIVE_TTL = 30
+# Entries outlive their soft TTL by this factor so a stale copy is there to serve while refreshing
+HARD_TTL_FACTOR = 12
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5.0
+WAIT_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class ContextMapSpec:
+    name: str
+    # Returns the map, or None when the upstream failed (negative cached)
+    loader: Callable[[], Optional[Dict]]
+    # Cache key, or a callable for keys that depend on a generation (versioned_key)
+    key: Union[str, Callable[[], str]]
+    soft_ttl: int = DEFAULT_SOFT_TTL
+    negative_ttl: int = DEFAULT_NEGATIVE_TTL
+    # Conditional loaders are called as loader(previous_map, previous_validators)
+    # and return (map, validators), or None on failure
+    conditional: bool = False
+    # Built from local tables: loaded on the caller's thread and DB connection by get_many()
+    local: bool = False
+
+    def cache_key(self) -> str:
+        return self.key() if callable(self.key) else self.key
+
+
+class ContextMapRegistry:
+    def __init__(self, background_refresh: Optional[bool] = None):
+        self._specs: Dict[str, ContextMapSpec] = {}
+        self._stats: Dict[str, Counter] = {}
+        self._stats_lock = threading.Lock()
+        if background_refresh is None:
+            background_refresh = getattr(settings, 'CONTEXT_MAP_BACKGROUND_REFRESH', True)
+        self.background_refresh = background_refresh
+
+    def register(self, name, loader, key=None, soft_ttl=DEFAULT_SOFT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 conditional=False, local=False):
+        self._specs[name] = ContextMapSpec(
+            name=name,
+            loader=loader,
+            key=key or f"ctxmap:{name}",
+            soft_ttl=soft_ttl,
+            negative_ttl=negative_ttl,
+            conditional=conditional,
+            local=local,
+        )
+        self._stats[name] = Counter()
+        return loader
+
+    def get(self, name: str) -> Dict:
+        """Return the map registered as name, loading it if needed."""
+        spec = self._specs[name]
+        key = spec.cache_key()
+        entry = cache.get(key)
+
+        if entry is not None:
+            if entry['fresh_until'] > time.time():
+                self._count(name, 'negative_hits' if entry['negative'] else 'hits')
+                return entry['value']
+            self._count(name, 'stale_hits')
+            self._refresh_in_background(spec, key, entry)
+            return entry['value']
+
+        self._count(name, 'misses')
+        return self._load_single_flight(spec, key)
+
+    def get_many(self, names, extra: Optional[Dict[str, Callable]] = None) -> Dict:
+        """Return {name: map} for names, plus {key: fn()} for the extra calls.
+
+        Cached maps cost one cache round trip together. When remote maps are
+        missing, they and the extra calls load concurrently while missing local
+        maps load on this thread; otherwise everything runs on this thread.
+        """
+        keys = {name: self._specs[name].cache_key() for name in names}
+        entries = cache.get_many(list(keys.values()))
+        result, missing = {}, []
+        for name, key in keys.items():
+            entry = entries.get(key)
+            if entry is None:
+                missing.append(name)
+            elif entry['fresh_until'] > time.time():
+                self._count(name, 'negative_hits' if entry['negative'] else 'hits')
+                result[name] = entry['value']
+            else:
+                # Stale: served at once, refreshed in the background
+                result[name] = self.get(name)
+
+        remote = {name: Call(lambda name=name: self.get(name), default={})
+                  for name in missing if not self._specs[name].local}
+        local = {name: (lambda name=name: self.get(name)) for name in missing if self._specs[name].local}
+        extra = extra or {}
+        if remote:
+            result.update(fan_out({**remote, **extra}, inline=local))
+        else:
+            result.update(fan_out({}, inline={**local, **extra}))
+        return result
+
+    def invalidate(self, name: str) -> None:
+        cache.delete(self._specs[name].cache_key())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {name: dict(counter) for name, counter in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            for counter in self._stats.values():
+                counter.clear()
+
+    def _count(self, name, event):
+        with self._stats_lock:
+            self._stats[name][event] += 1
+
+    def _acquire(self, key) -> bool:
+        # cache.add is atomic on Redis and LocMem, so this is a cross-worker lock
+        return cache.add(f"{key}:lock", 1, LOCK_TIMEOUT)
+
+    def _release(self, key) -> None:
+        cache.delete(f"{key}:lock")
+
+    def _load(self, spec: ContextMapSpec, key: str, previous: Optional[Dict] = None) -> Dict:
+        self._count(spec.name, 'loads')
+        validators = None
+        try:
+            if spec.conditional:
+                usable = previous is not None and not previous['negative']
+                result = spec.loader(
+                    previous['value'] if usable else None,
+                    previous.get('validators') if usable else None,
+                )
+                value, validators = result if result is not None else (None, None)
+            else:
+                value = spec.loader()
+        except Exception:
+            logger.exception("Loading context map %s failed", spec.name)
+            value = None
+
+        now = time.time()
+        if value is not None:
+            entry = {'value': value, 'fresh_until': now + spec.soft_ttl, 'negative': False, 'validators': validators}
+        else:
+            self._count(spec.name, 'load_failures')
+            if previous is not None:
+                # Keep serving the last good map; retry after the negative TTL
+                entry = dict(previous, fresh_until=now + spec.negative_ttl)
+            else:
+                entry = {'value': {}, 'fresh_until': now + spec.negative_ttl, 'negative': True}
+        cache.set(key, entry, spec.soft_ttl * HARD_TTL_FACTOR)
+        return entry
+
+    def _load_single_flight(self, spec: ContextMapSpec, key: str) -> Dict:
+        deadline = time.time() + WAIT_TIMEOUT
+        waited = False
+        while True:
+            if self._acquire(key):
+                try:
+                    return self._load(spec, key)['value']
+                finally:
+                    self._release(key)
+
+            if not waited:
+                self._count(spec.name, 'waits')
+                waited = True
+            time.sleep(WAIT_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+            if time.time() >= deadline:
+                # The lock holder is stuck or gone; load without it rather than fail the request
+                return self._load(spec, key)['value']
+
+    def _refresh_in_background(self, spec: ContextMapSpec, key: str, entry: Dict) -> None:
+        if not self._acquire(key):
+            return  # Someone else is already refreshing
+
+        def refresh():
+            try:
+                self._load(spec, key, previous=entry)
+            finally:
+                self._release(key)
+                if self.background_refresh:
+                    connections.close_all()
+
+        if self.background_refresh:
+            threading.Thread(target=refresh, name=f"context-map-{spec.name}", daemon=True).start()
+        else:
+            refresh()
+
+
+def _index_by_id(items) -> Optional[Dict]:
+    """Map a list of dicts by id; anything else (e.g. a {"warning": ...} dict) is a failed load."""
+    if isinstance(items, list):
+        return {item['id']: item for item in items}
+    return None
+
+
+def _load_product_names():
+    return dict(Product.objects.filter(is_deleted=False).values_list('id', 'name'))
+
+
+def _load_product_details():
+    from ..serializer import ProductNameSerializer
+
+    products = Product.objects.filter(is_deleted=False)
+    return {p['id']: p for p in ProductNameSerializer(products, many=True).data}
+
+
+def _load_asset_details():
+    from ..serializer import AssetNameSerializer
+
+    assets = Asset.objects.filter(is_deleted=False)
+    return {a['id']: a for a in AssetNameSerializer(assets, many=True).data}
+
+
+def _load_asset_summaries():
+    assets = Asset.objects.filter(is_deleted=False).values('id', 'asset_id', 'name', 'image')
+    return {a['id']: a for a in assets}
+
+
+context_map_registry = ContextMapRegistry()
+
+# Contexts service
+context_map_registry.register('categories', lambda: _index_by_id(get_category_names()))
+context_map_registry.register('manufacturers', lambda: _index_by_id(get_manufacturer_names()))
+context_map_registry.register('suppliers', lambda: _index_by_id(get_supplier_names()))
+context_map_registry.register('depreciations', lambda: _index_by_id(get_depreciation_names()))
+# Statuses drive status badges, so they get a shorter soft TTL
+context_map_registry.register('statuses:asset', lambda: _index_by_id(get_status_names_assets()), soft_ttl=60)
+context_map_registry.register('statuses:repair', lambda: _index_by_id(get_status_names_repairs()), soft_ttl=60)
+# Help desk service: the complete location catalog, revalidated page by page
+context_map_registry.register(
+    'locations', load_location_catalog, key=lambda: versioned_key("locations", "catalog"), conditional=True,
+)
+# Local tables, keyed by cache generation so writes switch to a fresh key immediately
+context_map_registry.register(
+    'products:names', _load_product_names, key=lambda: versioned_key("products", "name:map"), local=True,
+)
+context_map_registry.register(
+    'products:details', _load_product_details, key=lambda: versioned_key("products", "map"), local=True,
+)
+context_map_registry.register(
+    'assets:details', _load_asset_details, key=lambda: versioned_key("assets", "map"), local=True,
+)
+context_map_registry.register(
+    'assets:summaries', _load_asset_summaries, key=lambda: versioned_key("assets", "name:map"), local=True,
+)
@@ -24,6 +24,18 @@ MANUFACTURER_WARNING_TTL = 60
 DEPRECIATION_WARNING_TTL = 60
 LIST_CACHE_TTL = 300
 LIST_WARNING_TTL = 60
+GET_MANY_BATCH_SIZE = 200
+# List path each resource last answered on, so later calls skip the other path's 404
+_LIST_PATHS = {}
+
+# Per-id cache key prefix and TTLs for resources served by get_many
+ITEM_CACHE_SETTINGS = {
+    'suppliers': ('supplier', SUPPLIER_ITEM_CACHE_TTL, SUPPLIER_WARNING_TTL),
+    'categories': ('category', CATEGORY_CACHE_TTL, CATEGORY_WARNING_TTL),
+    'manufacturers': ('manufacturer', MANUFACTURER_CACHE_TTL, MANUFACTURER_WARNING_TTL),
+    'depreciations': ('depreciation', DEPRECIATION_CACHE_TTL, DEPRECIATION_WARNING_TTL),
+    'statuses': ('status', STATUS_CACHE_TTL, STATUS_WARNING_TTL),
+}
 
 
 def _build_url(path):
@@ -35,7 +47,7 @@ def fetch_suppliers_from_remote():
     for path in ("api/suppliers/", "suppliers/"):
         url = _build_url(path)
         try:
-            resp = client_get(url, timeout=8)
+            resp = client_get(url, timeout=8, last_known_good=True)
             resp.raise_for_status()
             return resp.json()
         except RequestException:
@@ -56,6 +68,19 @@ def fetch_resource_by_id(resource_name, resource_id):
     except RequestException:
         return {"warning": "Contexts service unreachable. Make sure 'contexts-service' is running and accessible."}
 
+def fetch_resources_by_ids(resource_name, ids):
+    """Fetch many resources in one call via the `?ids=1,2,3` batch list. Returns list or warning dict."""
+    url = _build_url(f"{resource_name}/")
+    try:
+        resp = client_get(url, params={'ids': ','.join(str(i) for i in ids)}, timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        if isinstance(data, dict) and 'results' in data:
+            data = data['results']
+        return data
+    except (RequestException, ValueError):
+        return {"warning": "Contexts service unreachable. Make sure 'contexts-service' is running and accessible."}
+
 # Public helpers
 def get_suppliers(force_refresh=False):
     if not force_refresh:
@@ -152,21 +177,64 @@ def get_status_by_id(status_id):
     return result
 
 
+def get_many(resource_name, ids):
+    """Fetch many resources by ID, returning {id: resource or warning dict}.
+
+    Reads and fills the same per-id cache entries as get_<resource>_by_id, and
+    fetches all misses through the batch endpoint, GET_MANY_BATCH_SIZE ids per call.
+    resource_name is one of ITEM_CACHE_SETTINGS ('categories', 'statuses', ...).
+    """
+    prefix, ttl, warning_ttl = ITEM_CACHE_SETTINGS[resource_name]
+    ids = list(dict.fromkeys(int(i) for i in ids if i))
+    keys = {i: f"contexts:{prefix}:{i}" for i in ids}
+
+    cached = cache.get_many(list(keys.values()))
+    results = {i: cached[keys[i]] for i in ids if keys[i] in cached}
+    missing = [i for i in ids if i not in results]
+
+    for start in range(0, len(missing), GET_MANY_BATCH_SIZE):
+        batch = missing[start:start + GET_MANY_BATCH_SIZE]
+        fetched = fetch_resources_by_ids(resource_name, batch)
+        if isinstance(fetched, dict) and fetched.get('warning'):
+            # Service unreachable: cache the warning briefly, like the per-id helpers
+            cache.set_many({keys[i]: fetched for i in batch}, warning_ttl)
+            results.update({i: fetched for i in batch})
+            continue
+
+        found = {item['id']: item for item in fetched if isinstance(item, dict) and 'id' in item}
+        not_found = {
+            i: {"warning": f"{resource_name[:-1].capitalize()} {i} not found or deleted."}
+            for i in batch if i not in found
+        }
+        cache.set_many({keys[i]: found[i] for i in batch if i in found}, ttl)
+        cache.set_many({keys[i]: not_found[i] for i in not_found}, warning_ttl)
+        results.update({i: found[i] for i in batch if i in found})
+        results.update(not_found)
+
+    return results
+
+
 def fetch_resource_list(resource_name, params=None, skip_api_prefix=False):
     """Fetch a list endpoint from the Contexts service."""
     params = params or {}
     paths = [resource_name + '/']
     if not skip_api_prefix:
         paths.insert(0, 'api/' + resource_name + '/')
+    known = _LIST_PATHS.get(resource_name)
+    if known in paths:
+        paths.remove(known)
+        paths.insert(0, known)
 
     for path in paths:
         url = _build_url(path)
         try:
-            resp = client_get(url, params=params, timeout=8)
+            # Free-text searches would each add a last-known-good entry; only the stable lists keep one
+            resp = client_get(url, params=params, timeout=8, last_known_good=not params.get('q'))
             if resp.status_code == 404:
                 continue  # try next path
             resp.raise_for_status()
             data = resp.json()
+            _LIST_PATHS[resource_name] = path
             # If remote returns pagination object with results, return as-is
             if isinstance(data, dict) and 'results' in data:
                 return data
@@ -0,0 +1,192 @@
+"""
+Dashboard metrics service
+
+Metrics are split into sections, one per group of tables. Each section counts
+all of its date-windowed metrics in a single conditional aggregate
+(Count(..., filter=Q(...))) relative to an as_of date, instead of one COUNT per
+metric.
+
+Each section's result is stored in a DashboardSnapshot row:
+- writes to Asset, checkouts/checkins, audits, products and components mark
+  the affected sections dirty (signal hooks in models.py)
+- get_dashboard_metrics() reads every section in one query and recomputes only
+  the sections that are dirty, from an earlier day, or older than
+  SNAPSHOT_MAX_AGE (which also covers bulk writes that bypass signals)
+- refresh_dashboard_snapshot() recomputes everything; the
+  refresh_dashboard_snapshot command runs it periodically as reconciliation
+- compute_dashboard_metrics() computes every section directly, bypassing the
+  snapshot (used for dates other than today)
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from ..models import Asset, AssetCheckout, Audit, AuditSchedule, DashboardSnapshot, Product
+from .component_stock import low_stock_components
+from .contexts import get_categories_list, get_status_names_assets
+
+# Upper bound on how stale a clean section may get before it is recomputed anyway
+SNAPSHOT_MAX_AGE = timedelta(minutes=15)
+WINDOW_DAYS = 30
+
+
+def _window(as_of: date):
+    return as_of, as_of + timedelta(days=WINDOW_DAYS)
+
+
+def compute_checkout_metrics(as_of: date) -> Dict:
+    today, next_30_days = _window(as_of)
+    return AssetCheckout.objects.filter(asset_checkin__isnull=True).aggregate(
+        # Due for return: return date is today or later, within the next 30 days
+        due_for_return=Count('id', filter=Q(return_date__gte=today, return_date__lte=next_30_days)),
+        # Overdue for return: return date is in the past
+        overdue_for_return=Count('id', filter=Q(return_date__lt=today)),
+    )
+
+
+def compute_audit_metrics(as_of: date) -> Dict:
+    today, next_30_days = _window(as_of)
+    # Only consider audit schedules that are not deleted and not yet audited
+    metrics = AuditSchedule.objects.filter(is_deleted=False, audit__isnull=True).aggregate(
+        due_audits=Count('id', filter=Q(date__gte=today)),
+        upcoming_audits=Count('id', filter=Q(date__gt=today, date__lte=next_30_days)),
+        overdue_audits=Count('id', filter=Q(date__lt=today)),
+    )
+    metrics['completed_audits'] = Audit.objects.filter(is_deleted=False).count()
+    return metrics
+
+
+def compute_product_metrics(as_of: date) -> Dict:
+    today, next_30_days = _window(as_of)
+    return Product.objects.filter(is_deleted=False).aggregate(
+        reached_end_of_life=Count('id', filter=Q(end_of_life__lte=today)),
+        upcoming_end_of_life=Count('id', filter=Q(end_of_life__gt=today, end_of_life__lte=next_30_days)),
+    )
+
+
+def compute_asset_metrics(as_of: date) -> Dict:
+    today, next_30_days = _window(as_of)
+    assets = Asset.objects.filter(is_deleted=False)
+
+    statuses = get_status_names_assets()
+    deployed_status_ids = [s['id'] for s in statuses if s.get('type') == 'deployed'] if isinstance(statuses, list) else []
+
+    aggregates = dict(
+        expired_warranties=Count('id', filter=Q(warranty_expiration__lte=today)),
+        expiring_warranties=Count('id', filter=Q(warranty_expiration__gt=today, warranty_expiration__lte=next_30_days)),
+        total_asset_costs=Coalesce(Sum('purchase_cost'), Value(0), output_field=DecimalField()),
+        total_assets=Count('id'),
+    )
+    if deployed_status_ids:
+        aggregates['deployed_count'] = Count('id', filter=Q(status__in=deployed_status_ids))
+    totals = assets.aggregate(**aggregates)
+    total_assets = totals['total_assets']
+    # Asset utilization (% of assets that are deployed)
+    deployed_count = totals.get('deployed_count', 0)
+    asset_utilization = round((deployed_count / total_assets * 100) if total_assets > 0 else 0)
+
+    # Top 10 categories and statuses by asset count
+    categories = get_categories_list(type='asset', limit=100)
+    category_map = {c['id']: c['name'] for c in categories} if isinstance(categories, list) else {}
+    category_counts = assets.values('product__category').annotate(count=Count('id')).order_by('-count')[:10]
+    status_map = {s['id']: s['name'] for s in statuses} if isinstance(statuses, list) else {}
+    status_counts = assets.values('status').annotate(count=Count('id')).order_by('-count')[:10]
+
+    return {
+        'expired_warranties': totals['expired_warranties'],
+        'expiring_warranties': totals['expiring_warranties'],
+        # Stored as a string so the snapshot stays JSON serializable
+        'total_asset_costs': str(totals['total_asset_costs']),
+        'asset_utilization': asset_utilization,
+        'asset_categories': [
+            {
+                'product__category__name': category_map.get(item['product__category'], f"Category {item['product__category']}"),
+                'count': item['count'],
+            }
+            for item in category_counts if item['product__category']
+        ],
+        'asset_statuses': [
+            {
+                'status__name': status_map.get(item['status'], f"Status {item['status']}"),
+                'count': item['count'],
+            }
+            for item in status_counts if item['status']
+        ],
+    }
+
+
+def compute_component_metrics(as_of: date) -> Dict:
+    return {'low_stock': low_stock_components().count()}
+
+
+SECTIONS = {
+    'checkouts': compute_checkout_metrics,
+    'audits': compute_audit_metrics,
+    'products': compute_product_metrics,
+    'assets': compute_asset_metrics,
+    'components': compute_component_metrics,
+}
+
+
+def _load_snapshot_rows() -> Dict[str, DashboardSnapshot]:
+    rows = {row.section: row for row in DashboardSnapshot.objects.all()}
+    missing = [name for name in SECTIONS if name not in rows]
+    if missing:
+        DashboardSnapshot.objects.bulk_create(
+            [DashboardSnapshot(section=name) for name in missing], ignore_conflicts=True
+        )
+        rows = {row.section: row for row in DashboardSnapshot.objects.all()}
+    return rows
+
+
+def compute_dashboard_metrics(as_of: Optional[date] = None) -> Dict:
+    """Compute all dashboard metrics as of the given date (defaults to today) without the snapshot."""
+    as_of = as_of or timezone.now().date()
+    metrics = {}
+    for compute in SECTIONS.values():
+        metrics.update(compute(as_of))
+    return metrics
+
+
+def _is_stale(row: DashboardSnapshot, as_of: date, now) -> bool:
+    return (
+        row.dirty
+        or row.as_of != as_of
+        or row.computed_at is None
+        or row.computed_at < now - SNAPSHOT_MAX_AGE
+    )
+
+
+def _recompute(row: DashboardSnapshot, as_of: date, now) -> Dict:
+    data = SECTIONS[row.section](as_of)
+    # Only clear the dirty flag if no write marked the section while we computed
+    DashboardSnapshot.objects.filter(pk=row.pk, version=row.version).update(
+        data=data, as_of=as_of, computed_at=now, dirty=False
+    )
+    return data
+
+
+def get_dashboard_metrics(as_of: Optional[date] = None) -> Dict:
+    """Return the merged dashboard metrics, recomputing only stale sections."""
+    as_of = as_of or timezone.now().date()
+    now = timezone.now()
+    metrics = {}
+    for name, row in _load_snapshot_rows().items():
+        if name not in SECTIONS:
+            continue
+        metrics.update(_recompute(row, as_of, now) if _is_stale(row, as_of, now) else row.data)
+    return metrics
+
+
+def refresh_dashboard_snapshot(sections: Optional[Iterable[str]] = None, as_of: Optional[date] = None) -> Dict:
+    """Recompute the given sections (all by default) regardless of their dirty state."""
+    as_of = as_of or timezone.now().date()
+    now = timezone.now()
+    names = set(sections) if sections else set(SECTIONS)
+    metrics = {}
+    for name, row in _load_snapshot_rows().items():
+        if name in names:
+            metrics.update(_recompute(row, as_of, now))
+    return metrics
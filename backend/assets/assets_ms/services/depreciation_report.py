@@ -1,12 +1,21 @@
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from django.db.models import OuterRef, Subquery
 from ..models import Asset, AssetCheckout
-from .contexts import get_depreciation_by_id, get_status_by_id
+from .contexts import get_many
 
 #Will Add authentication imports here later
 #Fix the information about tickets later
 
+ZERO = Decimal('0.00')
+CENTS = Decimal('0.01')
+MONTHLY_PRECISION = Decimal('0.0001')
+DEFAULT_DURATION = 36
+DEFAULT_CURRENCY = "₱"
+REPORT_CHUNK_SIZE = 2000
+
+
 def _months_between(start_date: Optional[date], end_date: date) -> int:
     """Return whole months elapsed between two dates (end_date >= start_date).
     If start_date is None or in the future, returns 0.
@@ -22,21 +31,48 @@ def _months_between(start_date: Optional[date], end_date: date) -> int:
     return max(months, 0)
 
 
-def generate_depreciation_report(today: Optional[date] = None, depreciation_id: Optional[int] = None) -> List[Dict]:
-    """Return a list of assets that have a depreciation configured and computed metrics.
+def _to_float(d: Decimal) -> float:
+    """Quantize/format currency values to 2 decimals for stable float output to frontend."""
+    return float(d.quantize(CENTS, rounding=ROUND_HALF_UP))
 
-    Each list item contains keys used by the frontend report mockup, for example:
-    - assetId, product, statusType, statusName, deployedTo, depreciationName,
-      duration, currency, minimumValue, purchaseCost, currentValue,
-      depreciated, monthlyDepreciation, monthsLeft
 
-    Parameters:
-    - today: optional date to use as "now" for calculations (defaults to today)
-    - depreciation_id: if provided, filter assets to that depreciation id
-    """
-    today = today or date.today()
+def _depreciation_terms(dep) -> Tuple[str, int, Decimal, str]:
+    """Return (name, duration, minimum_value, currency) for a depreciation from contexts.
 
-    qs = Asset.objects.select_related('product').filter(
+    Computed once per depreciation id, not once per asset.
+    """
+    dep_name = duration = minimum_value = currency = None
+    if isinstance(dep, dict):
+        dep_name = dep.get('name') or dep.get('display_name') or dep.get('title')
+        duration = dep.get('duration') if 'duration' in dep else dep.get('months') if 'months' in dep else dep.get('duration_months')
+        minimum_value = dep.get('minimum_value') if 'minimum_value' in dep else dep.get('minimumValue') if 'minimumValue' in dep else dep.get('minimum') if 'minimum' in dep else None
+        currency = dep.get('currency') or dep.get('symbol')
+
+    # Duration and minimum value, explicit None checks so 0 is preserved when intended
+    duration = int(duration) if duration is not None else DEFAULT_DURATION
+    if duration <= 0:
+        duration = 0
+    minimum_value = Decimal(str(minimum_value)) if minimum_value is not None else ZERO
+    return dep_name or '', duration, minimum_value, currency or DEFAULT_CURRENCY
+
+
+def _status_fields(status_info) -> Tuple[str, str]:
+    """Return (status_type, status_name) for a status from contexts."""
+    if not isinstance(status_info, dict):
+        return '', ''
+    status_type = status_info.get('code') or status_info.get('slug') or ''
+    status_name = status_info.get('name') or status_info.get('display_name') or ''
+    return status_type, status_name
+
+
+def _report_queryset(depreciation_id: Optional[int] = None):
+    # Latest checkout without a checkin: who the asset is deployed to
+    open_checkout = AssetCheckout.objects.filter(
+        asset=OuterRef('pk'),
+        asset_checkin__isnull=True,
+    ).order_by('-id').values('checkout_to')[:1]
+
+    qs = Asset.objects.filter(
         is_deleted=False,
         product__is_deleted=False,
     ).exclude(product__depreciation__isnull=True)
@@ -44,112 +80,85 @@ def generate_depreciation_report(today: Optional[date] = None, depreciation_id:
     if depreciation_id is not None:
         qs = qs.filter(product__depreciation=depreciation_id)
 
-    results = []
-
-    for asset in qs.order_by('asset_id'):
-        product = getattr(asset, 'product', None)
-
-        # Resolve depreciation (may be dict or object returned by contexts)
-        dep = None
-        if product and getattr(product, 'depreciation', None):
-            dep = get_depreciation_by_id(product.depreciation)
-
-        # Fallbacks for depreciation fields
-        dep_name = None
-        duration = None
-        minimum_value = None
-        currency = None
-
-        if isinstance(dep, dict):
-            dep_name = dep.get('name') or dep.get('display_name') or dep.get('title')
-            duration = dep.get('duration') if 'duration' in dep else dep.get('months') if 'months' in dep else dep.get('duration_months')
-            minimum_value = dep.get('minimum_value') if 'minimum_value' in dep else dep.get('minimumValue') if 'minimumValue' in dep else dep.get('minimum') if 'minimum' in dep else None
-            currency = dep.get('currency') or dep.get('symbol')
-        elif dep is not None:
-            # support object-like depreciation
-            dep_name = getattr(dep, 'name', None) or getattr(dep, 'display_name', None) or getattr(dep, 'title', None)
-            duration = getattr(dep, 'duration', None) or getattr(dep, 'months', None) or getattr(dep, 'duration_months', None)
-            minimum_value = getattr(dep, 'minimum_value', None) if getattr(dep, 'minimum_value', None) is not None else getattr(dep, 'minimumValue', None) if getattr(dep, 'minimumValue', None) is not None else getattr(dep, 'minimum', None)
-            currency = getattr(dep, 'currency', None) or getattr(dep, 'symbol', None)
+    return qs.annotate(deployed_to=Subquery(open_checkout))
 
-        # Purchase cost resolution
-        try:
-            raw_purchase = asset.purchase_cost if asset.purchase_cost is not None else (product.default_purchase_cost if product and getattr(product, 'default_purchase_cost', None) is not None else 0)
-            purchase_cost = Decimal(str(raw_purchase))
-        except Exception:
-            purchase_cost = Decimal('0.00')
 
-        # Duration and minimum value, explicit None checks so 0 is preserved when intended
-        duration = int(duration) if duration is not None else 36
-        if duration <= 0:
-            duration = 0
+def iter_depreciation_report(today: Optional[date] = None, depreciation_id: Optional[int] = None) -> Iterator[Dict]:
+    """Yield depreciation report rows without per-asset queries or HTTP calls.
 
-        minimum_value = Decimal(str(minimum_value)) if minimum_value is not None else Decimal('0.00')
-        currency = currency or "₱"
+    Pipeline:
+    1. resolve every depreciation and status used by the report with one batch call each
+    2. stream asset rows (with the open checkout annotated) in chunks from the database
+    3. compute the Decimal math per row against the precomputed terms
+    """
+    today = today or date.today()
+    qs = _report_queryset(depreciation_id)
+
+    dep_ids = set(qs.values_list('product__depreciation', flat=True).distinct())
+    status_ids = set(qs.values_list('status', flat=True).distinct())
+    dep_terms = {dep_id: _depreciation_terms(dep) for dep_id, dep in get_many('depreciations', dep_ids).items()}
+    status_fields = {status_id: _status_fields(s) for status_id, s in get_many('statuses', status_ids).items()}
+    missing_terms = _depreciation_terms(None)
+
+    rows = qs.order_by('asset_id').values_list(
+        'id', 'asset_id', 'status', 'purchase_cost', 'purchase_date', 'deployed_to',
+        'product__name', 'product__depreciation', 'product__default_purchase_cost',
+    )
+    for (pk, asset_id, status_id, purchase_cost, purchase_date, deployed_to,
+         product_name, dep_id, default_purchase_cost) in rows.iterator(chunk_size=REPORT_CHUNK_SIZE):
+        dep_name, duration, minimum_value, currency = dep_terms.get(dep_id, missing_terms)
+        status_type, status_name = status_fields.get(status_id, ('', ''))
+
+        # Purchase cost resolution
+        raw_purchase = purchase_cost if purchase_cost is not None else default_purchase_cost
+        purchase_cost = Decimal(str(raw_purchase)) if raw_purchase is not None else ZERO
 
         # Calculate months elapsed and depreciation amounts using Decimal for currency precision
-        months_elapsed = _months_between(getattr(asset, 'purchase_date', None), today)
-        depreciable_amount = max(Decimal('0.00'), purchase_cost - minimum_value)
+        months_elapsed = _months_between(purchase_date, today)
+        depreciable_amount = max(ZERO, purchase_cost - minimum_value)
 
-        if depreciable_amount <= Decimal('0.00') or duration <= 0:
-            monthly_dep = Decimal('0.00')
+        if depreciable_amount <= ZERO or duration <= 0:
+            monthly_dep = ZERO
         else:
-            monthly_dep = (depreciable_amount / Decimal(duration)).quantize(Decimal('0.0001'))
+            monthly_dep = (depreciable_amount / Decimal(duration)).quantize(MONTHLY_PRECISION)
 
         depreciated = min(Decimal(months_elapsed) * monthly_dep, depreciable_amount)
         current_value = max(minimum_value, purchase_cost - depreciated)
-        months_left = max(duration - months_elapsed, 0)
-
-        # Status lookups (contexts) - support dict or object
-        status_info = get_status_by_id(asset.status) if getattr(asset, 'status', None) else None
-        status_type = ''
-        status_name = ''
-        if isinstance(status_info, dict):
-            status_type = status_info.get('code') or status_info.get('slug') or ''
-            status_name = status_info.get('name') or status_info.get('display_name') or ''
-        elif status_info is not None:
-            status_type = getattr(status_info, 'code', None) or getattr(status_info, 'slug', None) or ''
-            status_name = getattr(status_info, 'name', None) or getattr(status_info, 'display_name', None) or ''
-
-        # Try to determine who the asset is deployed to using AssetCheckout if model supports it
-        deployed_to = None
-        try:
-            # common field names used in checkout models: is_returned, returned, active, person, deployed_to
-            checkout_qs = AssetCheckout.objects.filter(asset=asset)
-            # prefer active/unchecked-out entries
-            for flag in ('is_returned', 'returned', 'active'):
-                if hasattr(AssetCheckout, flag):
-                    checkout_qs = checkout_qs.filter(**{flag: False})
-                    break
-            last_checkout = checkout_qs.order_by('-id').first()
-            if last_checkout is not None:
-                deployed_to = getattr(last_checkout, 'person_name', None) or getattr(last_checkout, 'deployed_to', None) or (getattr(last_checkout, 'person', None).get_full_name() if getattr(last_checkout, 'person', None) and hasattr(getattr(last_checkout, 'person', None), 'get_full_name') else None)
-        except Exception:
-            deployed_to = None
-
-        # Quantize/format currency values to 2 decimals for stable float output to frontend
-        def to_float(d: Decimal) -> float:
-            return float(d.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-
-        results.append({
-            'id': asset.id,
-            'assetId': asset.asset_id or asset.id,
-            'product': product.name if product else '',
+
+        yield {
+            'id': pk,
+            'assetId': asset_id or pk,
+            'product': product_name or '',
             'statusType': status_type,
             'statusName': status_name,
             'deployedTo': deployed_to,
-            'depreciationName': dep_name or '',
+            'depreciationName': dep_name,
             'duration': duration,
             'currency': currency,
-            'minimumValue': to_float(minimum_value),
-            'purchaseCost': to_float(purchase_cost),
-            'currentValue': to_float(current_value),
-            'depreciated': to_float(depreciated),
-            'monthlyDepreciation': to_float(monthly_dep),
-            'monthsLeft': months_left,
-        })
-
-    return results
+            'minimumValue': _to_float(minimum_value),
+            'purchaseCost': _to_float(purchase_cost),
+            'currentValue': _to_float(current_value),
+            'depreciated': _to_float(depreciated),
+            'monthlyDepreciation': _to_float(monthly_dep),
+            'monthsLeft': max(duration - months_elapsed, 0),
+        }
+
+
+def generate_depreciation_report(today: Optional[date] = None, depreciation_id: Optional[int] = None) -> List[Dict]:
+    """Return a list of assets that have a depreciation configured and computed metrics.
+
+    Each list item contains keys used by the frontend report mockup, for example:
+    - assetId, product, statusType, statusName, deployedTo, depreciationName,
+      duration, currency, minimumValue, purchaseCost, currentValue,
+      depreciated, monthlyDepreciation, monthsLeft
+
+    deployedTo is the checkout_to id of the asset's open checkout, or None.
+
+    Parameters:
+    - today: optional date to use as "now" for calculations (defaults to today)
+    - depreciation_id: if provided, filter assets to that depreciation id
+    """
+    return list(iter_depreciation_report(today=today, depreciation_id=depreciation_id))
 
 
 def print_sample_report(limit: int = 10) -> None:
@@ -2,7 +2,7 @@ from typing import List, Dict, Optional
 from datetime import date
 from ..models import Asset, AssetCheckout
 from .contexts import get_statuses_list
-from .integration_help_desk import get_locations_list
+from .context_maps import context_map_registry
 
 
 def _build_lookup_dict(data) -> Dict[int, Dict]:
@@ -82,7 +82,7 @@ def generate_eol_warranty_report(today: Optional[date] = None) -> List[Dict]:
 
     # Batch lookups
     statuses_lookup = _build_lookup_dict(get_statuses_list(limit=500))
-    locations_lookup = _build_lookup_dict(get_locations_list(limit=500))
+    locations_lookup = context_map_registry.get('locations')
 
     # Active checkouts map: asset_id -> last active checkout
     active_checkouts = {}
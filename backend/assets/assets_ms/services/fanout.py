@@ -0,0 +1,113 @@
+"""
+Concurrent fan-out
+
+Views that need several independent upstream lookups (statuses, locations,
+tickets, ...) used to make them one after another, so a cold cache cost the
+sum of the round trips. fan_out() runs them on a shared thread pool instead,
+so it costs about the slowest one:
+- bounded: at most FANOUT_MAX_WORKERS calls run at once per process
+- every call can have its own timeout, and all calls share one deadline; a
+  call that misses either, or raises, yields its default and is logged
+  instead of failing the request
+- `inline` calls run on the caller's thread while the pool works. Use it for
+  database queries, which belong on the request's connection (and
+  transaction)
+- a fan-out started from a pool thread runs sequentially, so nested fan-outs
+  cannot deadlock the pool
+
+Pool threads share http_client's pooled session; they close their own
+database connections after each call.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Union
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+FANOUT_MAX_WORKERS = getattr(settings, "FANOUT_MAX_WORKERS", 8)
+# Shared deadline of one fan-out, in seconds
+FANOUT_DEADLINE = getattr(settings, "FANOUT_DEADLINE", 10.0)
+THREAD_NAME_PREFIX = "fanout"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class Call:
+    fn: Callable[[], Any]
+    # Returned when the call fails or times out
+    default: Any = None
+    # Seconds; None means only the shared deadline applies
+    timeout: Optional[float] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix=THREAD_NAME_PREFIX)
+    return _executor
+
+
+def _as_call(call: Union[Call, Callable]) -> Call:
+    return call if isinstance(call, Call) else Call(fn=call)
+
+
+def _run_in_pool(call: Call):
+    try:
+        return call.fn()
+    finally:
+        connections.close_all()
+
+
+def _run_inline(name: str, call: Call):
+    try:
+        return call.fn()
+    except Exception:
+        logger.exception("Fan-out call %s failed", name)
+        return call.default
+
+
+def fan_out(calls: Dict[str, Union[Call, Callable]], inline: Optional[Dict[str, Union[Call, Callable]]] = None,
+            deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Run calls concurrently and inline calls on this thread; return {name: result}.
+
+    deadline is in seconds from now (FANOUT_DEADLINE by default).
+    """
+    calls = {name: _as_call(call) for name, call in calls.items()}
+    inline = {name: _as_call(call) for name, call in (inline or {}).items()}
+
+    nested = threading.current_thread().name.startswith(THREAD_NAME_PREFIX)
+    if not calls or (len(calls) == 1 and not inline) or nested:
+        # Nothing to overlap, or already on a pool thread
+        return {name: _run_inline(name, call) for name, call in {**calls, **inline}.items()}
+
+    started = time.monotonic()
+    ends_at = started + (FANOUT_DEADLINE if deadline is None else deadline)
+    executor = _get_executor()
+    futures = {name: executor.submit(_run_in_pool, call) for name, call in calls.items()}
+
+    results = {name: _run_inline(name, call) for name, call in inline.items()}
+    for name, future in futures.items():
+        call = calls[name]
+        wait_until = ends_at if call.timeout is None else min(ends_at, started + call.timeout)
+        try:
+            results[name] = future.result(timeout=max(wait_until - time.monotonic(), 0))
+        except FutureTimeoutError:
+            # The thread finishes in the background; its result is discarded
+            future.cancel()
+            logger.warning("Fan-out call %s timed out after %.2fs", name, time.monotonic() - started)
+            results[name] = call.default
+        except Exception:
+            logger.exception("Fan-out call %s failed", name)
+            results[name] = call.default
+    return results
@@ -4,21 +4,28 @@ from urllib.parse import urljoin
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from django.conf import settings
+from .circuit_breaker import breaker_for_url, call_upstream, last_known_good_key, register_upstream
 
 
 # Allow overriding via Django settings or env var
 BASE_URL = getattr(settings, "CONTEXTS_API_URL", os.getenv("CONTEXTS_API_URL", "http://contexts-service:8003/"))
+# Connections kept per host; fan_out() runs several requests on the session at once
+POOL_MAXSIZE = getattr(settings, "HTTP_POOL_MAXSIZE", 20)
+
+register_upstream("contexts", BASE_URL)
 
 
 def _build_session():
     s = requests.Session()
+    # A single immediate retry for dropped keep-alive connections. Slow or failing
+    # upstreams are handled by the circuit breakers and hedged GETs, not retry loops
     retries = Retry(
-        total=3,
-        backoff_factor=0.2,
-        status_forcelist=(500, 502, 503, 504),
+        total=1,
+        status=0,
+        backoff_factor=0,
         allowed_methods=frozenset(["GET", "POST", "PUT", "PATCH", "DELETE"]),
     )
-    adapter = HTTPAdapter(max_retries=retries)
+    adapter = HTTPAdapter(max_retries=retries, pool_maxsize=POOL_MAXSIZE)
     s.mount("http://", adapter)
     s.mount("https://", adapter)
     return s
@@ -34,22 +41,35 @@ def _make_url(path: str) -> str:
         return path
     return urljoin(BASE_URL, path)
 
-def get(path: str, params=None, timeout: float = 5, **kwargs):
+def _send(method: str, url: str, hedge: bool = False, last_known_good=None, **kwargs):
+    return call_upstream(
+        breaker_for_url(url),
+        lambda: _SESSION.request(method, url, **kwargs),
+        hedge=hedge,
+        last_known_good=last_known_good,
+    )
+
+def get(path: str, params=None, timeout: float = 5, last_known_good: bool = False, **kwargs):
+    """GET through the upstream's circuit breaker, hedged when the upstream is idle.
+
+    With last_known_good=True the last 200 response is served when the upstream fails.
+    """
     url = _make_url(path)
-    return _SESSION.get(url, params=params, timeout=timeout, **kwargs)
+    lkg_key = last_known_good_key(url, params) if last_known_good else None
+    return _send("GET", url, hedge=True, last_known_good=lkg_key, params=params, timeout=timeout, **kwargs)
 
 def post(path: str, data=None, json=None, timeout: float = 5, **kwargs):
     url = _make_url(path)
-    return _SESSION.post(url, data=data, json=json, timeout=timeout, **kwargs)
+    return _send("POST", url, data=data, json=json, timeout=timeout, **kwargs)
 
 def patch(path: str, data=None, json=None, timeout: float = 5, **kwargs):
     url = _make_url(path)
-    return _SESSION.patch(url, data=data, json=json, timeout=timeout, **kwargs)
+    return _send("PATCH", url, data=data, json=json, timeout=timeout, **kwargs)
 
 def put(path: str, data=None, json=None, timeout: float = 5, **kwargs):
     url = _make_url(path)
-    return _SESSION.put(url, data=data, json=json, timeout=timeout, **kwargs)
+    return _send("PUT", url, data=data, json=json, timeout=timeout, **kwargs)
 
 def delete(path: str, timeout: float = 5, **kwargs):
     url = _make_url(path)
-    return _SESSION.delete(url, timeout=timeout, **kwargs)
\ No newline at end of file
+    return _send("DELETE", url, timeout=timeout, **kwargs)
\ No newline at end of file
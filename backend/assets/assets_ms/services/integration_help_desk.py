@@ -1,6 +1,8 @@
 import os
 from requests.exceptions import RequestException
+from .circuit_breaker import register_upstream
 from .http_client import get as client_get, patch as client_patch
+from .user_directory import user_directory
 from django.core.cache import cache
 from django.conf import settings
 
@@ -21,6 +23,10 @@ def _build_url(path):
     return f"{BASE_URL.rstrip('/')}/{path.lstrip('/')}"
 
 
+# Help desk resources are proxied by the contexts service under helpdesk-*
+register_upstream("help-desk", _build_url("helpdesk-"))
+
+
 def fetch_resource_by_id(resource_name, resource_id):
     """Fetch a single resource by name and id. Returns dict or warning dict."""
     if not resource_id:
@@ -77,7 +83,8 @@ def fetch_resource_list(resource_name, params=None, skip_api_prefix=False):
     for path in paths:
         url = _build_url(path)
         try:
-            resp = client_get(url, params=params, timeout=8)
+            # Free-text searches would each add a last-known-good entry; only the stable lists keep one
+            resp = client_get(url, params=params, timeout=8, last_known_good=not params.get('q'))
             if resp.status_code == 404:
                 continue  # try next path
             resp.raise_for_status()
@@ -124,31 +131,44 @@ def get_locations_names():
     return get_locations_list()
 
 
-# Auth service integration
-AUTH_API_URL = getattr(settings, "AUTH_API_URL", os.getenv("AUTH_API_URL", "http://authentication-service:8001/"))
-USER_CACHE_TTL = 300
-USER_WARNING_TTL = 60
+def fetch_locations_page(offset=0, limit=200, etag=None):
+    """Fetch one page of help desk locations, conditionally if the page's previous ETag is given.
+
+    Returns (locations, etag, total). locations is None when the proxy answered
+    304 Not Modified; total is the proxy's X-Total-Count, or None if it sent
+    none. Raises RequestException (or ValueError for a malformed body) when the
+    fetch fails.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    resp = client_get(
+        _build_url('helpdesk-locations/'),
+        params={'limit': limit, 'offset': offset},
+        headers=headers,
+        timeout=8,
+    )
+    if resp.status_code == 304:
+        return None, etag, _total_count(resp)
+    resp.raise_for_status()
+    data = resp.json()
+    # {success, count, locations: [...]}, paginated 'results' or a list directly
+    if isinstance(data, dict):
+        data = data.get('locations', data.get('results'))
+    if not isinstance(data, list):
+        raise ValueError("Unexpected location list payload")
+    return [item for item in data if isinstance(item, dict)], resp.headers.get("ETag"), _total_count(resp)
+
+
+def _total_count(resp):
+    try:
+        return int(resp.headers["X-Total-Count"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
+# Auth service integration (see user_directory.py)
 def get_user_names():
-    """Fetch all active users with id and fullname from the auth service."""
-    key = "auth:list:users:names"
-    cached = cache.get(key)
-    if cached is not None:
-        return cached
+    """All active users with id and full_name from the auth service.
 
-    url = f"{AUTH_API_URL.rstrip('/')}/users/get_all_users/"
-    try:
-        import requests
-        resp = requests.get(url, timeout=8)
-        if resp.status_code == 404:
-            return []
-        resp.raise_for_status()
-        data = resp.json()
-        # Expected format: [{'id': 1, 'fullname': 'John Doe'}, ...]
-        if isinstance(data, list):
-            cache.set(key, data, USER_CACHE_TTL)
-            return data
-        return []
-    except RequestException:
-        return []
\ No newline at end of file
+    Prefer user_directory.get_user / get_users for lookups by id.
+    """
+    return user_directory.all_users()
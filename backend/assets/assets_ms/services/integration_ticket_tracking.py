@@ -1,5 +1,6 @@
 import os
 from requests.exceptions import RequestException
+from .circuit_breaker import register_upstream
 from .http_client import get as client_get, post as client_post
 from django.conf import settings
 
@@ -11,9 +12,12 @@ BASE_URL = getattr(
     "EXTERNAL_TICKET_API_URL",
     os.getenv("EXTERNAL_TICKET_API_URL", "http://165.22.247.50:1001/")
 )
+register_upstream("tickets", BASE_URL)
 
-# Note: Tickets are NOT cached to avoid stale data issues.
-# Other services update tickets and we don't want to require cache invalidation calls.
+# Note: list lookups (ticket maps, ticket by number) go through the short-TTL
+# snapshot in ticket_snapshot.py, refreshed with conditional requests and on the
+# invalidate-cache callback. Single-ticket endpoints below still hit the service.
+TICKETS_ENDPOINT = "external/ams/tickets/"
 
 
 def _build_url(path):
@@ -63,7 +67,10 @@ def get_ticket_by_id(ticket_id):
 
 
 def get_ticket_by_number(ticket_number):
-    """Fetch a ticket by ticket_number from the external ticket service (no caching).
+    """Look up a ticket by ticket_number in the ticket snapshot.
+
+    A miss refreshes the snapshot (rate limited), so a ticket created moments
+    ago is still found.
 
     Args:
         ticket_number: The ticket number string (e.g., "TX20260122996422")
@@ -71,23 +78,40 @@ def get_ticket_by_number(ticket_number):
     if not ticket_number:
         return None
 
-    url = _build_url("external/ams/tickets/")
+    # Imported lazily: ticket_snapshot fetches through this module
+    from .ticket_snapshot import find_ticket_by_number
 
-    try:
-        resp = client_get(url, timeout=6)
-        if resp.status_code == 404:
-            return {"warning": f"Ticket {ticket_number} not found."}
-        resp.raise_for_status()
-        data = resp.json()
-        # Handle 'value' key (new format) or list directly
-        tickets = data.get('value') if isinstance(data, dict) else data
-        if isinstance(tickets, list):
-            for ticket in tickets:
-                if ticket.get("ticket_number") == ticket_number:
-                    return ticket
-        return {"warning": f"Ticket {ticket_number} not found."}
-    except RequestException:
+    ticket, available = find_ticket_by_number(ticket_number)
+    if ticket:
+        return ticket
+    if not available:
         return {"warning": "External ticket service unreachable."}
+    return {"warning": f"Ticket {ticket_number} not found."}
+
+
+def fetch_all_tickets(etag=None, last_modified=None):
+    """Fetch the full ticket list, conditionally if validators from a previous fetch are given.
+
+    Returns (tickets, etag, last_modified). tickets is None when the service
+    answered 304 Not Modified. Raises RequestException (or ValueError for a
+    malformed body) when the fetch fails.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    resp = client_get(_build_url(TICKETS_ENDPOINT), headers=headers, timeout=8)
+    if resp.status_code == 304:
+        return None, etag, last_modified
+    resp.raise_for_status()
+    data = resp.json()
+    # Handle 'value' key (new format), paginated 'results' or list directly
+    tickets = (data.get('value') or data.get('results') or []) if isinstance(data, dict) else data
+    if not isinstance(tickets, list):
+        raise ValueError("Unexpected ticket list payload")
+    return tickets, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
 
 
 def get_ticket_by_asset_id(asset_id, status=None):
@@ -0,0 +1,70 @@
+"""
+Location catalog
+
+Help desk locations come through the contexts service proxy
+(helpdesk-locations/), which returns one page per call. Callers used to ask
+for a single page (limit=50, or 500 in reports) and silently lost the rest,
+then fell back to one HTTP call per missing location. load_location_catalog()
+builds the complete id -> location map instead:
+- walks every page (limit/offset) until the proxy's X-Total-Count is
+  reached, or until a page is empty or adds no new ids (a proxy that ignores
+  offset keeps returning the first page)
+- is the loader of the 'locations' context map, which stores the map once
+  under a versioned key; bump_generation("locations") drops it
+- refreshes conditionally: every page is requested with the ETag it had
+  last time, and a 304 reuses the locations already in the previous map
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+from requests.exceptions import RequestException
+from .integration_help_desk import fetch_locations_page
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 200
+# Guard against a proxy that keeps returning new ids forever
+MAX_PAGES = 500
+
+
+def load_location_catalog(previous: Optional[Dict] = None,
+                          validators: Optional[Dict] = None) -> Optional[Tuple[Dict, Dict]]:
+    """Return (map of location id -> location, validators), or None if a page failed.
+
+    previous and validators are the result of the last load; with them, pages
+    that did not change cost a 304.
+    """
+    previous = previous or {}
+    previous_pages = (validators or {}).get('pages', [])
+    catalog = {}
+    pages = []
+    offset = 0
+
+    for index in range(MAX_PAGES):
+        page = previous_pages[index] if index < len(previous_pages) else None
+        # Only revalidate when the page's previous offset matches; otherwise the ETag describes other rows
+        etag = page['etag'] if page and page['offset'] == offset else None
+        try:
+            items, etag, total = fetch_locations_page(offset=offset, limit=PAGE_SIZE, etag=etag)
+        except (RequestException, ValueError) as exc:
+            logger.warning("Loading help desk locations (offset %d) failed: %s", offset, exc)
+            return None
+
+        if items is None:
+            # 304: the page holds the same locations as last time
+            if any(location_id not in previous for location_id in page['ids']):
+                return load_location_catalog()
+            items = [previous[location_id] for location_id in page['ids']]
+
+        new_items = [item for item in items if item.get('id') is not None and item['id'] not in catalog]
+        if not new_items:
+            break
+        catalog.update((item['id'], item) for item in new_items)
+        pages.append({'offset': offset, 'etag': etag, 'ids': [item['id'] for item in items if item.get('id') is not None]})
+        offset += len(items)
+        if total is not None and offset >= total:
+            break
+    else:
+        logger.warning("Stopped loading help desk locations after %d pages", MAX_PAGES)
+
+    return catalog, {'pages': pages}
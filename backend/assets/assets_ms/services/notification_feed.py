@@ -0,0 +1,229 @@
+"""
+Notification feed
+
+get_all_notifications() evaluates every alert condition from scratch, which is
+too much work for a request the frontend polls. The feed persists the result in
+the Notification table instead:
+- one row per occurrence of a condition, keyed by the generator's stable id,
+  so a notification keeps its id between polls and clients can remember what
+  they dismissed. A condition that clears and later comes back is a new
+  occurrence with a new id, so an old dismissal does not hide it
+- rows are synced per source (SOURCES). A sync creates rows for new
+  conditions, rewrites rows whose text changed and resolves rows whose
+  condition cleared; rows that did not change are not written
+- writes to the underlying tables mark the affected sources dirty (signal
+  hooks in models.py). A poll syncs the sources that are dirty, last synced
+  on an earlier day, or older than SYNC_MAX_AGE; one poll at a time does so,
+  behind a cache lock, while concurrent polls read the current rows
+- the sync_notifications command syncs every source periodically and purges
+  resolved rows older than RESOLVED_RETENTION
+- updated_at is the poll cursor: a read with `since` returns only the rows
+  created, changed or resolved after it, as an index range scan. For that
+  cursor to never skip a row, syncs run one at a time (SYNC_LOCK_KEY, for
+  polls and the command alike) and stamp their rows inside the transaction
+  that writes them, so rows become visible in updated_at order
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from ..models import Notification, NotificationSource
+from .notifications import (
+    generate_low_stock_component_notifications,
+    generate_low_stock_product_notifications,
+    generate_overdue_audit_notifications,
+    generate_overdue_checkout_notifications,
+    generate_warranty_expiration_notifications,
+    get_deployable_pending_status_ids,
+)
+
+SOURCES = {
+    'products': generate_low_stock_product_notifications,
+    'components': generate_low_stock_component_notifications,
+    'warranties': generate_warranty_expiration_notifications,
+    'checkouts': generate_overdue_checkout_notifications,
+    'audits': generate_overdue_audit_notifications,
+}
+# Upper bound on how stale a clean source may get before it is synced anyway
+SYNC_MAX_AGE = timedelta(minutes=15)
+RESOLVED_RETENTION = timedelta(days=30)
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+BULK_BATCH_SIZE = 500
+CONTENT_FIELDS = ('type', 'title', 'message', 'item_type', 'item_id', 'item_name')
+SYNC_LOCK_KEY = "notifications:sync:lock"
+# Outlives the slowest sync, so a crashed worker cannot hold the lock for good
+SYNC_LOCK_TIMEOUT = 120
+SYNC_LOCK_POLL_INTERVAL = 0.5
+
+
+def _load_source_rows() -> Dict[str, NotificationSource]:
+    rows = {row.name: row for row in NotificationSource.objects.all()}
+    missing = [name for name in SOURCES if name not in rows]
+    if missing:
+        NotificationSource.objects.bulk_create(
+            [NotificationSource(name=name) for name in missing], ignore_conflicts=True
+        )
+        rows = {row.name: row for row in NotificationSource.objects.all()}
+    return rows
+
+
+def _is_stale(row: NotificationSource, now) -> bool:
+    return (
+        row.dirty
+        or row.synced_at is None
+        # Overdue and expiry messages count days, so they change at midnight
+        or timezone.localdate(row.synced_at) != timezone.localdate(now)
+        or row.synced_at < now - SYNC_MAX_AGE
+    )
+
+
+def _source_available(name: str) -> bool:
+    # Without the contexts service the product generator returns nothing, and
+    # syncing that would resolve every low stock notification
+    return name != 'products' or bool(get_deployable_pending_status_ids())
+
+
+def _sync(row: NotificationSource) -> Optional[Dict[str, int]]:
+    """Bring the source's rows in line with its generator. Returns the change counts, or None if skipped."""
+    if not _source_available(row.name):
+        return None
+    current = {n['id']: n for n in SOURCES[row.name]()}
+    existing = {n.key: n for n in Notification.objects.filter(source=row.name, is_active=True)}
+
+    created, changed = [], []
+    for key, data in current.items():
+        content = {field: data[field] for field in CONTENT_FIELDS}
+        notification = existing.get(key)
+        if notification is None:
+            created.append(Notification(key=key, source=row.name, **content))
+            continue
+        if all(getattr(notification, field) == value for field, value in content.items()):
+            continue
+        for field, value in content.items():
+            setattr(notification, field, value)
+        changed.append(notification)
+
+    resolved = [n.pk for key, n in existing.items() if key not in current]
+
+    with transaction.atomic():
+        # Stamped inside the transaction, after the previous sync committed (see the module docstring)
+        now = timezone.now()
+        for notification in created:
+            notification.created_at = notification.updated_at = now
+        for notification in changed:
+            notification.updated_at = now
+        # ignore_conflicts: a concurrent sync of the same source may have inserted the active key already
+        Notification.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+        Notification.objects.bulk_update(
+            changed,
+            list(CONTENT_FIELDS) + ['updated_at'],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        if resolved:
+            Notification.objects.filter(pk__in=resolved).update(is_active=False, resolved_at=now, updated_at=now)
+        # Only clear the dirty flag if no write marked the source while we synced
+        NotificationSource.objects.filter(pk=row.pk, version=row.version).update(synced_at=now, dirty=False)
+    return {'created': len(created), 'updated': len(changed), 'resolved': len(resolved)}
+
+
+def _acquire_sync_lock(wait: float = 0) -> bool:
+    # cache.add is atomic on Redis and LocMem, so this is a cross-worker lock
+    deadline = time.monotonic() + wait
+    while not cache.add(SYNC_LOCK_KEY, 1, SYNC_LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(SYNC_LOCK_POLL_INTERVAL)
+    return True
+
+
+def sync_notifications(sources: Optional[Iterable[str]] = None,
+                       wait: float = SYNC_LOCK_TIMEOUT) -> Optional[Dict[str, Optional[Dict[str, int]]]]:
+    """Sync the given sources (all by default) regardless of their dirty state.
+
+    Waits up to wait seconds for a running sync to finish; returns None if it does not.
+    """
+    names = set(sources) if sources else set(SOURCES)
+    if not _acquire_sync_lock(wait):
+        return None
+    try:
+        return {name: _sync(row) for name, row in _load_source_rows().items() if name in names}
+    finally:
+        cache.delete(SYNC_LOCK_KEY)
+
+
+def sync_stale_notifications() -> Dict[str, Optional[Dict[str, int]]]:
+    """Sync only the sources that are dirty or out of date, unless another worker already is."""
+    now = timezone.now()
+    stale = [row for name, row in _load_source_rows().items() if name in SOURCES and _is_stale(row, now)]
+    if not stale or not _acquire_sync_lock():
+        return {}
+    try:
+        return {row.name: _sync(row) for row in stale}
+    finally:
+        cache.delete(SYNC_LOCK_KEY)
+
+
+def purge_resolved_notifications(older_than: timedelta = RESOLVED_RETENTION) -> int:
+    """Delete notifications resolved before now - older_than. Returns the number deleted."""
+    deleted, _ = Notification.objects.filter(
+        is_active=False, resolved_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def format_cursor(notification: Optional[Notification]) -> Optional[str]:
+    if notification is None:
+        return None
+    return f"{notification.updated_at.isoformat()},{notification.pk}"
+
+
+def parse_cursor(value: str) -> Tuple[datetime, int]:
+    """Parse "<updated_at ISO>[,<id>]". Raises ValueError if malformed."""
+    stamp, _, pk = value.strip().partition(',')
+    # A "+" in the offset arrives as a space when the cursor is not URL-encoded
+    parsed = parse_datetime(stamp.replace(' ', '+'))
+    if parsed is None:
+        raise ValueError(f"Invalid cursor: {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed, int(pk) if pk else 0
+
+
+def get_notification_feed(since: Optional[str] = None, limit: int = DEFAULT_LIMIT) -> Dict:
+    """Read the feed after syncing stale sources (see sync_stale_notifications).
+
+    Without since: the active notifications, newest first.
+    With since: every notification changed after the cursor, oldest change
+    first, including resolved ones so clients can drop them.
+    Returns {"results": [rows], "cursor": str, "has_more": bool}; the cursor
+    is passed back as since on the next poll.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    sync_stale_notifications()
+
+    if since:
+        stamp, pk = parse_cursor(since)
+        rows = list(
+            Notification.objects.filter(Q(updated_at__gt=stamp) | Q(updated_at=stamp, id__gt=pk))
+            .order_by('updated_at', 'id')[:limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = format_cursor(rows[-1]) if rows else since
+        return {'results': rows, 'cursor': cursor, 'has_more': has_more}
+
+    rows = list(
+        Notification.objects.filter(is_active=True)
+        .order_by('-created_at', '-id')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    # The newest change overall, so the next poll picks up everything after this read
+    latest = Notification.objects.order_by('-updated_at', '-id').first()
+    return {'results': rows[:limit], 'cursor': format_cursor(latest), 'has_more': has_more}
+
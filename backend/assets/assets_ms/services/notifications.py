@@ -7,33 +7,33 @@ This module generates notifications based on various conditions:
 3. Expired/expiring warranties - assets with warranty_expiration on or before today
 4. Overdue asset returns - asset checkouts without checkin past return_date
 5. Overdue audits - audit schedules without audits past the scheduled date
+
+Each notification's id is a stable key for its condition (the same product,
+checkout, ... always yields the same id), which notification_feed.py uses to
+persist the feed.
 """
 
 from datetime import date, timedelta
 from django.db.models import Count, Q, Exists, OuterRef
 from django.utils import timezone
 from assets_ms.models import (
-    Product, Asset, Component, AssetCheckout, AssetCheckin, 
+    Product, Asset, AssetCheckout, AssetCheckin, 
     AuditSchedule, Audit
 )
 from assets_ms.services.contexts import get_status_by_id, get_statuses_list
-from assets_ms.services.integration_help_desk import get_user_names
+from assets_ms.services.product_stock import annotate_stock_counts
+from assets_ms.services.component_stock import low_stock_components
+from assets_ms.services.user_directory import user_directory
 from django.core.cache import cache
 import hashlib
 
 
 def get_user_by_id(user_id):
     """
-    Get user info by ID from the cached user list.
+    Get user info by ID from the user directory.
     Returns dict with user info or None if not found.
     """
-    if not user_id:
-        return None
-    users = get_user_names()
-    for user in users:
-        if user.get('id') == user_id:
-            return user
-    return None
+    return user_directory.get_user(user_id)
 
 
 def get_deployable_pending_status_ids():
@@ -79,20 +79,18 @@ def generate_low_stock_product_notifications():
     if not available_status_ids:
         return notifications  # Can't determine statuses, skip
     
-    # Get products with minimum_quantity > 0
-    products = Product.objects.filter(is_deleted=False, minimum_quantity__gt=0)
+    # Get products with minimum_quantity > 0, with available counts in the same query
+    products = annotate_stock_counts(
+        Product.objects.filter(is_deleted=False, minimum_quantity__gt=0),
+        available_status_ids=available_status_ids,
+    )
     
     for product in products:
-        # Count assets with deployable or pending status
-        available_count = Asset.objects.filter(
-            product=product,
-            is_deleted=False,
-            status__in=available_status_ids
-        ).count()
+        available_count = product.available_count
         
         if available_count <= product.minimum_quantity:
             notifications.append({
-                'id': f"product-low-stock-{product.id}-{today.date().isoformat()}",
+                'id': f"product-low-stock-{product.id}",
                 'type': 'low-stock-product',
                 'title': 'Low Stock - Product',
                 'message': f"There's {available_count} {product.name} available, which is at or below the minimum of {product.minimum_quantity}.",
@@ -113,22 +111,21 @@ def generate_low_stock_component_notifications():
     notifications = []
     today = timezone.now()
     
-    # Get components with minimum_quantity > 0
-    components = Component.objects.filter(is_deleted=False, minimum_quantity__gt=0)
+    # Filtered in the database against the maintained stock column
+    components = low_stock_components(inclusive=True)
     
     for component in components:
-        available = component.available_quantity
-        if available <= component.minimum_quantity:
-            notifications.append({
-                'id': f"component-low-stock-{component.id}-{today.isoformat()}",
-                'type': 'low-stock-component',
-                'title': 'Low Stock - Component',
-                'message': f"Component '{component.name}' has {available} available, which is at or below the minimum of {component.minimum_quantity}.",
-                'item_type': 'component',
-                'item_id': component.id,
-                'item_name': component.name,
-                'created_at': today.isoformat(),
-            })
+        available = component.available_qty
+        notifications.append({
+            'id': f"component-low-stock-{component.id}",
+            'type': 'low-stock-component',
+            'title': 'Low Stock - Component',
+            'message': f"Component '{component.name}' has {available} available, which is at or below the minimum of {component.minimum_quantity}.",
+            'item_type': 'component',
+            'item_id': component.id,
+            'item_name': component.name,
+            'created_at': today.isoformat(),
+        })
     
     return notifications
 
@@ -183,6 +180,7 @@ def generate_overdue_checkout_notifications():
         return_date__lt=today,
         asset_checkin__isnull=True  # Only those without a checkin
     ).select_related('asset', 'asset__product')
+    users = user_directory.get_users({checkout.checkout_to for checkout in overdue_checkouts})
 
     for checkout in overdue_checkouts:
         asset = checkout.asset
@@ -190,10 +188,10 @@ def generate_overdue_checkout_notifications():
         days_overdue = (today - checkout.return_date).days
 
         # Try to get user info
-        user_info = get_user_by_id(checkout.checkout_to)
+        user_info = users.get(checkout.checkout_to)
         user_name = "Unknown User"
         if user_info and isinstance(user_info, dict) and not user_info.get('warning'):
-            user_name = user_info.get('fullname') or user_info.get('email') or f"User #{checkout.checkout_to}"
+            user_name = user_info.get('full_name') or f"User #{checkout.checkout_to}"
 
         notifications.append({
             'id': f"overdue-checkout-{checkout.id}",
@@ -0,0 +1,50 @@
+"""
+Product stock service
+
+Per-product asset counts computed in the same query as the product rows:
+- has_assets: product has at least one non-deleted asset
+- available_count: assets whose status type is deployable or pending
+- deployed_count: assets whose status type is deployed
+
+Used by the products table and by low stock notifications so both read the
+same aggregate instead of running a query per product.
+"""
+
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Value
+from ..models import Asset
+from .contexts import get_status_names_assets
+
+
+AVAILABLE_STATUS_TYPES = ('deployable', 'pending')
+DEPLOYED_STATUS_TYPES = ('deployed',)
+
+
+def get_stock_status_ids():
+    """Return (available_status_ids, deployed_status_ids) from the asset statuses.
+
+    Both lists are empty if the Contexts service is unreachable.
+    """
+    statuses = get_status_names_assets()
+    if not isinstance(statuses, list):
+        return [], []
+    available = [s['id'] for s in statuses if s.get('type') in AVAILABLE_STATUS_TYPES]
+    deployed = [s['id'] for s in statuses if s.get('type') in DEPLOYED_STATUS_TYPES]
+    return available, deployed
+
+
+def _count_assets_with_status(status_ids):
+    if not status_ids:
+        return Value(0, output_field=IntegerField())
+    return Count(
+        'product_assets',
+        filter=Q(product_assets__is_deleted=False, product_assets__status__in=status_ids),
+    )
+
+
+def annotate_stock_counts(queryset, available_status_ids=None, deployed_status_ids=None):
+    """Annotate a Product queryset with has_assets, available_count and deployed_count."""
+    return queryset.annotate(
+        has_assets=Exists(Asset.objects.filter(product=OuterRef('pk'), is_deleted=False)),
+        available_count=_count_assets_with_status(available_status_ids),
+        deployed_count=_count_assets_with_status(deployed_status_ids),
+    )
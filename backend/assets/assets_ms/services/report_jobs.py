@@ -0,0 +1,203 @@
+"""
+Report job service
+
+Runs large report exports outside the request cycle. The ReportJob table is the
+queue, so no broker is needed:
+- submit_report_job() records a queued job, or returns a recent job with the
+  same parameters so repeated requests reuse one artifact.
+- process_next_job() claims the oldest queued job, renders the export through
+  the existing report view (same validation, columns and streaming writer as
+  the synchronous download) and saves the file to media storage.
+
+Workers run as `python manage.py process_report_jobs`.
+"""
+
+import hashlib
+import json
+import tempfile
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from ..models import ReportJob
+
+# A finished artifact with identical parameters is reused for this long
+REPORT_JOB_REUSE_WINDOW = timedelta(minutes=15)
+# Running jobs not finished after this long are assumed to belong to a dead worker
+REPORT_JOB_STALE_AFTER = timedelta(minutes=30)
+# Finished jobs (and their files) are purged after this long
+REPORT_JOB_RETENTION = timedelta(days=7)
+
+# Params that select the output format are stored on the job, not in params
+FORMAT_PARAMS = ('format', 'export_format')
+
+
+class ReportJobError(Exception):
+    """Raised when a report view rejects the job parameters."""
+
+
+def _report_views():
+    # Imported lazily: the api layer imports services, not the other way round
+    from ..api.reports import ActivityReportAPIView, AssetReportAPIView, DepreciationReportAPIView
+
+    return {
+        'depreciation': DepreciationReportAPIView,
+        'assets': AssetReportAPIView,
+        'activity': ActivityReportAPIView,
+    }
+
+
+def normalize_params(params) -> Dict[str, str]:
+    """Return params as a dict of non-empty strings, without format keys."""
+    normalized = {}
+    for key, value in (params or {}).items():
+        if key in FORMAT_PARAMS or value is None or value == '':
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ','.join(str(v) for v in value)
+        normalized[str(key)] = str(value)
+    return normalized
+
+
+def compute_params_hash(report_type: str, export_format: str, params: Dict[str, str]) -> str:
+    payload = json.dumps([report_type, export_format, params], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_reusable_job(params_hash: str) -> Optional[ReportJob]:
+    """Return a queued/running job or a recently finished one with the same params hash."""
+    cutoff = timezone.now() - REPORT_JOB_REUSE_WINDOW
+    return (
+        ReportJob.objects.filter(params_hash=params_hash)
+        .filter(
+            Q(status__in=[ReportJob.STATUS_QUEUED, ReportJob.STATUS_RUNNING])
+            | Q(status=ReportJob.STATUS_DONE, finished_at__gte=cutoff)
+        )
+        .order_by('-created_at')
+        .first()
+    )
+
+
+def submit_report_job(report_type: str, export_format: str = 'xlsx', params=None,
+                      user_id: Optional[int] = None) -> Tuple[ReportJob, bool]:
+    """Queue a report job. Returns (job, created); created is False when a job was reused."""
+    params = normalize_params(params)
+    params_hash = compute_params_hash(report_type, export_format, params)
+
+    existing = find_reusable_job(params_hash)
+    if existing is not None:
+        return existing, False
+
+    job = ReportJob.objects.create(
+        report_type=report_type,
+        export_format=export_format,
+        params=params,
+        params_hash=params_hash,
+        user_id=user_id,
+    )
+    return job, True
+
+
+def claim_next_job() -> Optional[ReportJob]:
+    """Mark the oldest queued job as running and return it, or None if the queue is empty.
+
+    skip_locked lets several workers poll the table on PostgreSQL without
+    blocking each other; the conditional update keeps the claim safe on
+    backends without row locks.
+    """
+    with transaction.atomic():
+        job = (
+            ReportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ReportJob.STATUS_QUEUED)
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = ReportJob.objects.filter(pk=job.pk, status=ReportJob.STATUS_QUEUED).update(
+            status=ReportJob.STATUS_RUNNING, started_at=now, error=None
+        )
+    if not claimed:
+        return None
+    job.status = ReportJob.STATUS_RUNNING
+    job.started_at = now
+    job.error = None
+    return job
+
+
+def _build_request(job: ReportJob) -> HttpRequest:
+    request = HttpRequest()
+    request.method = 'GET'
+    request.META['SERVER_NAME'] = 'report-worker'
+    request.META['SERVER_PORT'] = '80'
+    query = QueryDict(mutable=True)
+    query.update(job.params or {})
+    query['export_format'] = job.export_format
+    request.GET = query
+    return request
+
+
+def render_report(job: ReportJob, out) -> None:
+    """Write the job's export into the binary file object out."""
+    view = _report_views()[job.report_type].as_view()
+    response = view(_build_request(job))
+
+    if response.status_code != 200 or not getattr(response, 'streaming', False):
+        data = getattr(response, 'data', None)
+        detail = data.get('detail') if isinstance(data, dict) else None
+        raise ReportJobError(detail or f'Report view returned HTTP {response.status_code}')
+
+    for chunk in response.streaming_content:
+        out.write(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+
+
+def run_job(job: ReportJob) -> ReportJob:
+    """Render a claimed job into media storage and record the outcome on the job."""
+    try:
+        with tempfile.TemporaryFile() as tmp:
+            render_report(job, tmp)
+            tmp.seek(0)
+            filename = f'{job.report_type}_report_{job.pk}.{job.export_format}'
+            job.file.save(filename, File(tmp), save=False)
+        job.status = ReportJob.STATUS_DONE
+    except Exception as exc:
+        job.status = ReportJob.STATUS_FAILED
+        job.error = str(exc) or exc.__class__.__name__
+    job.finished_at = timezone.now()
+    job.save(update_fields=['file', 'status', 'error', 'finished_at'])
+    return job
+
+
+def process_next_job() -> Optional[ReportJob]:
+    """Claim and run one job. Returns the processed job, or None if the queue is empty."""
+    job = claim_next_job()
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def requeue_stale_jobs() -> int:
+    """Put running jobs left behind by a dead worker back on the queue."""
+    cutoff = timezone.now() - REPORT_JOB_STALE_AFTER
+    return ReportJob.objects.filter(
+        status=ReportJob.STATUS_RUNNING, started_at__lt=cutoff
+    ).update(status=ReportJob.STATUS_QUEUED, started_at=None)
+
+
+def purge_expired_jobs() -> int:
+    """Delete finished jobs older than the retention period along with their files."""
+    cutoff = timezone.now() - REPORT_JOB_RETENTION
+    expired = ReportJob.objects.filter(
+        status__in=[ReportJob.STATUS_DONE, ReportJob.STATUS_FAILED], finished_at__lt=cutoff
+    )
+    count = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
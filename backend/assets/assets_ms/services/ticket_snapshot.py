@@ -0,0 +1,172 @@
+"""
+Ticket snapshot
+
+The ticket tracking service only offers a full list endpoint, and asset list,
+detail, delete and checkout validation all need tickets. Instead of downloading
+the list on every request, one indexed snapshot is kept in the cache:
+- indexed by id, ticket_number and asset, so lookups are dictionary hits
+- refreshed after TICKET_SNAPSHOT_TTL seconds with a conditional request
+  (If-None-Match / If-Modified-Since), so an unchanged list costs a 304
+- single-flight: one worker refreshes while the others keep serving the
+  previous snapshot, so the service sees at most one list call per interval
+- marked stale by the assets invalidate-cache callback the ticket service
+  already calls, and refreshed by the refresh_ticket_snapshot command when run
+  with --interval
+- a failed refresh keeps serving the last good snapshot and retries after
+  TICKET_SNAPSHOT_RETRY_TTL seconds
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from requests.exceptions import RequestException
+from .integration_ticket_tracking import fetch_all_tickets
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "tickets:snapshot"
+SNAPSHOT_TTL = getattr(settings, "TICKET_SNAPSHOT_TTL", 30)
+RETRY_TTL = getattr(settings, "TICKET_SNAPSHOT_RETRY_TTL", 10)
+# A lookup miss may force a refresh, but not more often than this
+MIN_REFRESH_INTERVAL = 5
+# The entry outlives its TTL so the validators and a stale copy survive between refreshes
+SNAPSHOT_CACHE_TIMEOUT = 60 * 60
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5.0
+WAIT_POLL_INTERVAL = 0.05
+
+
+def _build_snapshot(tickets: List[Dict], etag=None, last_modified=None, now=None) -> Dict:
+    now = now or time.time()
+    by_id, by_number, by_asset, unresolved_by_asset = {}, {}, {}, {}
+    for ticket in tickets:
+        if ticket.get("id") is not None:
+            by_id[ticket["id"]] = ticket
+        if ticket.get("ticket_number"):
+            by_number[ticket["ticket_number"]] = ticket
+        asset = ticket.get("asset")
+        if asset:
+            by_asset.setdefault(asset, []).append(ticket)
+            if not ticket.get("is_resolved", False):
+                unresolved_by_asset[asset] = ticket
+    return {
+        "by_id": by_id,
+        "by_number": by_number,
+        "by_asset": by_asset,
+        "unresolved_by_asset": unresolved_by_asset,
+        "etag": etag,
+        "last_modified": last_modified,
+        "fetched_at": now,
+        "fresh_until": now + SNAPSHOT_TTL,
+        # False only for the placeholder stored when the service never answered
+        "available": True,
+    }
+
+
+def _empty_snapshot(now) -> Dict:
+    snapshot = _build_snapshot([], now=now)
+    snapshot.update(available=False, fetched_at=0, fresh_until=now + RETRY_TTL)
+    return snapshot
+
+
+def _acquire() -> bool:
+    # cache.add is atomic on Redis and LocMem, so this is a cross-worker lock
+    return cache.add(f"{SNAPSHOT_KEY}:lock", 1, LOCK_TIMEOUT)
+
+
+def _release() -> None:
+    cache.delete(f"{SNAPSHOT_KEY}:lock")
+
+
+def _refresh(previous: Optional[Dict]) -> Dict:
+    now = time.time()
+    conditional = previous is not None and previous["available"]
+    try:
+        tickets, etag, last_modified = fetch_all_tickets(
+            etag=previous["etag"] if conditional else None,
+            last_modified=previous["last_modified"] if conditional else None,
+        )
+    except (RequestException, ValueError) as exc:
+        logger.warning("Refreshing the ticket snapshot failed: %s", exc)
+        if previous is not None:
+            snapshot = dict(previous, fresh_until=now + RETRY_TTL)
+        else:
+            snapshot = _empty_snapshot(now)
+    else:
+        if tickets is None and conditional:
+            # 304 Not Modified: keep the indexes, restart the TTL
+            snapshot = dict(previous, fetched_at=now, fresh_until=now + SNAPSHOT_TTL)
+        else:
+            snapshot = _build_snapshot(tickets or [], etag, last_modified, now)
+    cache.set(SNAPSHOT_KEY, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def get_ticket_snapshot() -> Dict:
+    """Return the current snapshot, refreshing it first if it is past its TTL."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None and snapshot["fresh_until"] > time.time():
+        return snapshot
+
+    deadline = time.time() + WAIT_TIMEOUT
+    while True:
+        if _acquire():
+            try:
+                return _refresh(cache.get(SNAPSHOT_KEY))
+            finally:
+                _release()
+        if snapshot is not None:
+            # Another worker is refreshing; the stale snapshot is good enough meanwhile
+            return snapshot
+        time.sleep(WAIT_POLL_INTERVAL)
+        snapshot = cache.get(SNAPSHOT_KEY)
+        if snapshot is not None:
+            return snapshot
+        if time.time() >= deadline:
+            # The lock holder is stuck or gone; fetch without it rather than fail the request
+            return _refresh(None)
+
+
+def refresh_ticket_snapshot() -> Dict:
+    """Refresh the snapshot now (conditionally), unless another worker already is."""
+    if not _acquire():
+        return get_ticket_snapshot()
+    try:
+        return _refresh(cache.get(SNAPSHOT_KEY))
+    finally:
+        _release()
+
+
+def mark_ticket_snapshot_stale() -> None:
+    """Make the next lookup refresh the snapshot; validators are kept so it stays conditional."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is not None:
+        cache.set(SNAPSHOT_KEY, dict(snapshot, fresh_until=0), SNAPSHOT_CACHE_TIMEOUT)
+
+
+def unresolved_ticket_map() -> Dict:
+    """Map of asset -> unresolved ticket, the ticket_map serializers expect."""
+    return get_ticket_snapshot()["unresolved_by_asset"]
+
+
+def tickets_for_asset(asset, unresolved_only: bool = True) -> List[Dict]:
+    tickets = get_ticket_snapshot()["by_asset"].get(asset, [])
+    if unresolved_only:
+        return [t for t in tickets if not t.get("is_resolved", False)]
+    return tickets
+
+
+def find_ticket_by_id(ticket_id) -> Optional[Dict]:
+    return get_ticket_snapshot()["by_id"].get(ticket_id)
+
+
+def find_ticket_by_number(ticket_number) -> Tuple[Optional[Dict], bool]:
+    """Return (ticket, available). On a miss the snapshot is refreshed once if it is old enough."""
+    snapshot = get_ticket_snapshot()
+    ticket = snapshot["by_number"].get(ticket_number)
+    if ticket is None and snapshot["fetched_at"] < time.time() - MIN_REFRESH_INTERVAL:
+        snapshot = refresh_ticket_snapshot()
+        ticket = snapshot["by_number"].get(ticket_number)
+    return ticket, snapshot["available"]
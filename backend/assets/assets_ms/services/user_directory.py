@@ -0,0 +1,140 @@
+"""
+User directory
+
+Auth service users (names for notifications, audits, ...) are looked up in one
+in-process, id-indexed copy of the user list instead of scanning a cached list:
+- get_user(id) and get_users(ids) are dictionary lookups
+- the copy is refreshed every USER_DIRECTORY_TTL seconds through
+  users/changed_since/?since=<server_time of the last refresh>, which returns
+  only users created, changed or deactivated since then
+- every USER_DIRECTORY_FULL_SYNC seconds (and on first use) the whole list is
+  reloaded, which also drops users that were deleted outright
+- an auth service without changed_since (404) falls back to get_all_users
+- requests go through the pooled http_client session
+- one thread refreshes while the others keep reading the current copy; a
+  failed refresh keeps serving it and retries after USER_WARNING_TTL seconds
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from requests.exceptions import RequestException
+from .circuit_breaker import register_upstream
+from .http_client import get as client_get
+
+logger = logging.getLogger(__name__)
+
+AUTH_API_URL = getattr(settings, "AUTH_API_URL", os.getenv("AUTH_API_URL", "http://authentication-service:8001/"))
+USER_DIRECTORY_TTL = getattr(settings, "USER_DIRECTORY_TTL", 60)
+USER_DIRECTORY_FULL_SYNC = getattr(settings, "USER_DIRECTORY_FULL_SYNC", 60 * 60)
+USER_WARNING_TTL = 60
+# Re-read this much before the last server_time, for saves committed after it was taken
+SINCE_OVERLAP = timedelta(seconds=5)
+REQUEST_TIMEOUT = 8
+
+register_upstream("auth", AUTH_API_URL)
+
+
+def _auth_url(path):
+    return f"{AUTH_API_URL.rstrip('/')}/{path.lstrip('/')}"
+
+
+class UserDirectory:
+    def __init__(self, ttl=None, full_sync_interval=None):
+        self.ttl = ttl or USER_DIRECTORY_TTL
+        self.full_sync_interval = full_sync_interval or USER_DIRECTORY_FULL_SYNC
+        # Replaced wholesale on refresh, never mutated, so readers need no lock
+        self._users: Dict[int, Dict] = {}
+        self._since = None
+        self._loaded = False
+        self._fresh_until = 0.0
+        self._full_sync_due = 0.0
+        self._lock = threading.Lock()
+
+    def get_user(self, user_id) -> Optional[Dict]:
+        if not user_id:
+            return None
+        self._ensure_fresh()
+        return self._users.get(user_id)
+
+    def get_users(self, user_ids: Iterable) -> Dict[int, Dict]:
+        """Map of id -> user for the ids that exist and are active."""
+        self._ensure_fresh()
+        users = self._users
+        return {user_id: users[user_id] for user_id in user_ids if user_id in users}
+
+    def all_users(self) -> List[Dict]:
+        self._ensure_fresh()
+        return list(self._users.values())
+
+    def invalidate(self) -> None:
+        """Drop the copy; the next lookup reloads the full list."""
+        with self._lock:
+            self._users = {}
+            self._since = None
+            self._loaded = False
+            self._fresh_until = 0.0
+
+    def refresh(self, full: bool = False) -> None:
+        now = time.time()
+        full = full or self._since is None or now >= self._full_sync_due
+        try:
+            users, server_time = self._fetch(None if full else self._since - SINCE_OVERLAP)
+        except (RequestException, ValueError) as exc:
+            logger.warning("Refreshing the user directory failed: %s", exc)
+            self._fresh_until = now + USER_WARNING_TTL
+            return
+
+        if full:
+            self._users = {u['id']: u for u in users if u.get('is_active', True)}
+            self._full_sync_due = now + self.full_sync_interval
+        elif users:
+            updated = dict(self._users)
+            for user in users:
+                if user.get('is_active', True):
+                    updated[user['id']] = user
+                else:
+                    updated.pop(user['id'], None)
+            self._users = updated
+        # None after the get_all_users fallback, so the next refresh is a full one again
+        self._since = parse_datetime(server_time) if server_time else None
+        self._loaded = True
+        self._fresh_until = now + self.ttl
+
+    def _ensure_fresh(self) -> None:
+        if time.time() < self._fresh_until:
+            return
+        # Only the first load waits; later refreshes are skipped while another thread runs one
+        if not self._lock.acquire(blocking=not self._loaded):
+            return
+        try:
+            if time.time() >= self._fresh_until:
+                self.refresh()
+        finally:
+            self._lock.release()
+
+    def _fetch(self, since=None):
+        """Return (users, server_time) from the auth service."""
+        params = {'since': since.isoformat()} if since else None
+        resp = client_get(_auth_url('users/changed_since/'), params=params, timeout=REQUEST_TIMEOUT)
+        if resp.status_code != 404:
+            resp.raise_for_status()
+            data = resp.json()
+            return [u for u in data.get('users', []) if isinstance(u, dict)], data.get('server_time')
+
+        # Older auth service: full list of active users only
+        resp = client_get(_auth_url('users/get_all_users/'), timeout=REQUEST_TIMEOUT)
+        if resp.status_code == 404:
+            return [], None
+        resp.raise_for_status()
+        data = resp.json()
+        # Expected format: [{'id': 1, 'full_name': 'John Doe'}, ...]
+        return [u for u in data if isinstance(u, dict)] if isinstance(data, list) else [], None
+
+
+user_directory = UserDirectory()
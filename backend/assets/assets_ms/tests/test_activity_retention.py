@@ -0,0 +1,88 @@
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from io import StringIO
+from rest_framework.test import APIRequestFactory
+from assets_ms.models import ActivityLog, ActivityLogArchive
+from assets_ms.services.activity_report import generate_activity_report, get_activity_summary
+from assets_ms.views import ActivityLogViewSet
+
+
+def _log(when, **kwargs):
+    return ActivityLog.objects.create(
+        user_id=1, activity_type=kwargs.pop('activity_type', 'Asset'),
+        action=kwargs.pop('action', 'UPDATE'), datetime=when, **kwargs
+    )
+
+
+class ActivityReportDateRangeTests(TestCase):
+    def test_end_date_includes_the_whole_day(self):
+        today = timezone.localtime().replace(hour=23, minute=30)
+        _log(today, item_id=1)
+        _log(today - timedelta(days=1), item_id=2)
+        _log(today + timedelta(days=1), item_id=3)
+
+        rows = generate_activity_report(start_date=today.date(), end_date=today.date())
+        self.assertEqual([r['item_id'] for r in rows], [1])
+
+    def test_summary_counts_by_type_and_action(self):
+        now = timezone.now()
+        _log(now)
+        _log(now, activity_type='Component', action='CREATE')
+
+        summary = get_activity_summary(start_date=now.date())
+        self.assertEqual(summary['total'], 2)
+        self.assertEqual(summary['by_type'], {'Asset': 1, 'Component': 1})
+        self.assertEqual(summary['by_action']['CREATE'], 1)
+        self.assertEqual(summary['by_action']['DELETE'], 0)
+
+    def test_ranges_before_the_retention_cutoff_read_the_archive(self):
+        now = timezone.now()
+        _log(now - timedelta(days=10), item_id=1)
+        _log(now - timedelta(days=400), item_id=2, item_name='Old laptop', action='CREATE')
+        call_command('archive_activity_logs', '--retention-days=365', stdout=StringIO())
+
+        start = (now - timedelta(days=500)).date()
+        rows = generate_activity_report(start_date=start)
+        self.assertEqual([r['item_id'] for r in rows], [1, 2])
+        self.assertEqual([r['item_id'] for r in generate_activity_report(start_date=start, search='lapt')], [2])
+        self.assertEqual(len(generate_activity_report(start_date=start, limit=1)), 1)
+        self.assertEqual(generate_activity_report(start_date=(now - timedelta(days=30)).date())[0]['item_id'], 1)
+
+        summary = get_activity_summary(start_date=start)
+        self.assertEqual(summary['total'], 2)
+        self.assertEqual(summary['by_action']['CREATE'], 1)
+
+
+class ArchiveActivityLogsCommandTests(TestCase):
+    def test_old_entries_move_to_the_archive_and_expire(self):
+        now = timezone.now()
+        recent = _log(now - timedelta(days=10))
+        old = [_log(now - timedelta(days=400 + i * 20)) for i in range(5)]
+        _log(now - timedelta(days=3000))
+
+        out = StringIO()
+        call_command('archive_activity_logs', '--retention-days=365', '--batch-size=2', stdout=out)
+
+        self.assertEqual(list(ActivityLog.objects.values_list('id', flat=True)), [recent.id])
+        # The 3000-day-old entry is past the default seven-year archive retention
+        self.assertEqual(
+            sorted(ActivityLogArchive.objects.values_list('id', flat=True)),
+            sorted(o.id for o in old),
+        )
+        self.assertIn('Archived 6 activity log entries', out.getvalue())
+        self.assertIn('Purged 1 expired archive entries', out.getvalue())
+
+
+class ActivityLogViewSetPaginationTests(TestCase):
+    def test_page_size_selects_keyset_pages(self):
+        now = timezone.now()
+        for i in range(3):
+            _log(now - timedelta(minutes=i), item_id=i)
+        view = ActivityLogViewSet.as_view({'get': 'list'})
+
+        page = view(APIRequestFactory().get('/activity-logs/', {'page_size': 2})).data
+        self.assertEqual(len(page['results']), 2)
+        self.assertIsNotNone(page['next'])
+        self.assertEqual(len(view(APIRequestFactory().get('/activity-logs/')).data), 3)
@@ -0,0 +1,45 @@
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+from assets_ms.models import ActivityLog, ActivityLogSearchToken
+from assets_ms.services.activity_report import generate_activity_report
+from assets_ms.services.activity_sink import ActivitySink
+
+
+def _log(**kwargs):
+    return ActivityLog.objects.create(user_id=1, activity_type='Asset', action='UPDATE', **kwargs)
+
+
+class ActivitySearchTests(TestCase):
+    def setUp(self):
+        self.laptop = _log(item_identifier='AST-20260110-00030', item_name='Dell Laptop', user_name='Alice')
+        self.note = _log(item_name='Monitor', notes='Swapped for a laptop stand', user_name='Bob')
+        self.other = _log(item_name='Desk Chair', user_name='Alice')
+
+    def _ids(self, search, **kwargs):
+        return [row['id'] for row in generate_activity_report(search=search, **kwargs)]
+
+    def test_prefix_words_must_all_match(self):
+        self.assertEqual(set(self._ids('lapt')), {self.laptop.id, self.note.id})
+        self.assertEqual(self._ids('lapt alice'), [self.laptop.id])
+        self.assertEqual(self._ids('ast-2026'), [self.laptop.id])
+        self.assertEqual(self._ids('keyboard'), [])
+
+    def test_item_matches_rank_above_notes(self):
+        # The note entry is newer, so only ranking puts the laptop first
+        self.assertEqual(self._ids('laptop', rank=True), [self.laptop.id, self.note.id])
+        self.assertEqual(self._ids('laptop'), [self.note.id, self.laptop.id])
+
+    def test_updates_and_sink_batches_are_indexed(self):
+        self.other.item_name = 'Standing Desk'
+        self.other.save()
+        self.assertEqual(self._ids('standing'), [self.other.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ActivitySink(write_behind=False).submit(ActivityLog(user_id=1, activity_type='Asset', action='CREATE', item_name='Projector'))
+        self.assertEqual(len(self._ids('proj')), 1)
+
+    def test_rebuild_command(self):
+        ActivityLogSearchToken.objects.all().delete()
+        call_command('build_activity_search_index', stdout=StringIO())
+        self.assertEqual(self._ids('chair'), [self.other.id])
@@ -0,0 +1,66 @@
+from django.db import transaction
+from django.http import JsonResponse
+from django.test import RequestFactory, TestCase
+from assets_ms.middleware.activity_middleware import ActivityLogMiddleware
+from assets_ms.models import ActivityLog
+from assets_ms.services.activity_logger import log_activity
+from assets_ms.services.activity_sink import ActivitySink
+
+
+def _entry(i=0):
+    return ActivityLog(user_id=1, activity_type='Asset', action='UPDATE', item_id=i)
+
+
+class ActivitySinkTests(TestCase):
+    # Tests run inside a transaction, so entries are queued by on_commit callbacks
+    def _submit(self, sink, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                sink.submit(_entry(i))
+
+    def test_write_behind_batches_until_flush(self):
+        sink = ActivitySink(batch_size=1000, flush_interval=3600, write_behind=True)
+        self._submit(sink, 5)
+
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        with self.assertNumQueries(1):
+            self.assertEqual(sink.flush(), 5)
+        self.assertEqual(ActivityLog.objects.count(), 5)
+
+    def test_entries_wait_for_commit(self):
+        sink = ActivitySink(write_behind=True, flush_interval=3600)
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                sink.submit(_entry())
+            self.assertEqual(sink.pending(), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(sink.pending(), 1)
+
+    def test_full_queue_drops_or_flushes(self):
+        dropping = ActivitySink(max_queue=2, overflow='drop', write_behind=True, flush_interval=3600)
+        self._submit(dropping, 3)
+        self.assertEqual((dropping.pending(), dropping.dropped), (2, 1))
+
+        blocking = ActivitySink(max_queue=2, overflow='block', write_behind=True, flush_interval=3600)
+        self._submit(blocking, 3)
+        self.assertEqual((blocking.pending(), ActivityLog.objects.count()), (1, 2))
+
+
+class ActivityMiddlewareDedupTests(TestCase):
+    def _request(self, view):
+        middleware = ActivityLogMiddleware(view)
+        with self.captureOnCommitCallbacks(execute=True):
+            return middleware(RequestFactory().patch('/assets/7/'))
+
+    def test_explicit_entry_replaces_generic_one(self):
+        def view(request):
+            log_activity(module='Asset', action='Update', item_id=7, notes='Asset updated')
+            return JsonResponse({'id': 7})
+
+        self._request(view)
+        self.assertEqual(list(ActivityLog.objects.values_list('notes', flat=True)), ['Asset updated'])
+
+    def test_generic_entry_without_explicit_logging(self):
+        self._request(lambda request: JsonResponse({'id': 7}))
+        self.assertEqual(list(ActivityLog.objects.values_list('item_id', 'notes')), [(7, 'PATCH /assets/7/')])
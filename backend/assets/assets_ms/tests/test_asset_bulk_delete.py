@@ -0,0 +1,55 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckout, AuditSchedule, Product
+from assets_ms.views import AssetViewSet
+
+
+@patch('assets_ms.services.ticket_snapshot.fetch_all_tickets')
+class AssetBulkDeleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.view = AssetViewSet.as_view({'post': 'bulk_delete'})
+        self.product = Product.objects.create(name='Laptop', category=1)
+
+    def _assets(self, count):
+        start = Asset.objects.count()
+        return [
+            Asset.objects.create(asset_id=f'AST-BD-{start + i:05d}', product=self.product, status=1)
+            for i in range(count)
+        ]
+
+    def _delete(self, ids):
+        return self.view(self.factory.post('/assets/bulk-delete/', {'ids': ids}, format='json'))
+
+    def test_reports_every_blocked_asset_and_deletes_nothing(self, fetch):
+        free, checked_out, audited, ticketed = self._assets(4)
+        AssetCheckout.objects.create(asset=checked_out, checkout_to=1, location=1)
+        AuditSchedule.objects.create(asset=audited, date=timezone.now().date())
+        fetch.return_value = ([{'id': 9, 'ticket_number': 'TX9', 'asset': ticketed.id, 'is_resolved': False}], None, None)
+
+        resp = self._delete([free.id, checked_out.id, audited.id, ticketed.id])
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([b['id'] for b in resp.data['blocked']], [checked_out.id, audited.id, ticketed.id])
+        self.assertIn('currently checked out', resp.data['detail'])
+        self.assertFalse(Asset.objects.filter(is_deleted=True).exists())
+
+    def test_query_count_does_not_grow_with_the_id_set(self, fetch):
+        fetch.return_value = ([], None, None)
+
+        def count_queries(n):
+            ids = [a.id for a in self._assets(n)]
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self._delete(ids)
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(Asset.objects.filter(id__in=ids, is_deleted=True).count(), n)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count_queries(2), count_queries(20))
+        self.assertEqual(fetch.call_count, 1)
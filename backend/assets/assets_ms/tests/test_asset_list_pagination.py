@@ -0,0 +1,70 @@
+from datetime import date
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework import status
+from unittest.mock import patch
+from assets_ms.models import Asset, Product
+from assets_ms.views import AssetViewSet
+
+
+@patch('assets_ms.services.ticket_snapshot.fetch_all_tickets', return_value=([], None, None))
+@patch('assets_ms.services.location_catalog.fetch_locations_page', return_value=([], None, 0))
+@patch('assets_ms.services.context_maps.get_status_names_assets', return_value=[])
+class AssetCursorListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.view = AssetViewSet.as_view({'get': 'list'})
+        self.laptop = Product.objects.create(name='Laptop', category=1)
+        self.monitor = Product.objects.create(name='Monitor', category=1)
+        for i in range(5):
+            Asset.objects.create(
+                asset_id=f'AST-TEST-{i:05d}', product=self.laptop, status=1,
+                location=10, warranty_expiration=date(2026, 1, i + 1),
+            )
+        for i in range(5, 8):
+            Asset.objects.create(
+                asset_id=f'AST-TEST-{i:05d}', product=self.monitor, status=2,
+                location=20, warranty_expiration=date(2027, 1, 1),
+            )
+
+    def _get(self, params):
+        return self.view(self.factory.get('/assets/', params))
+
+    def test_walks_all_pages_with_cursor(self, *mocks):
+        seen = []
+        resp = self._get({'page_size': 3})
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            seen.extend(r['asset_id'] for r in resp.data['results'])
+            if not resp.data['next']:
+                break
+            resp = self.view(self.factory.get(resp.data['next']))
+        self.assertEqual(seen, [f'AST-TEST-{i:05d}' for i in range(8)])
+
+    def test_filters(self, *mocks):
+        resp = self._get({'product': str(self.monitor.id)})
+        self.assertEqual(len(resp.data['results']), 3)
+
+        resp = self._get({'status': '1', 'warranty_after': '2026-01-03', 'warranty_before': '2026-01-04'})
+        self.assertEqual(
+            [r['asset_id'] for r in resp.data['results']],
+            ['AST-TEST-00002', 'AST-TEST-00003'],
+        )
+
+    def test_invalid_filter_returns_400(self, *mocks):
+        resp = self._get({'location': 'abc'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_pages_are_invalidated_by_writes(self, *mocks):
+        first = self._get({'page_size': 50})
+        self.assertEqual(len(first.data['results']), 8)
+
+        asset = Asset.objects.get(asset_id='AST-TEST-00000')
+        asset.is_deleted = True
+        asset.save()
+        AssetViewSet().invalidate_asset_cache(asset.id)
+
+        second = self._get({'page_size': 50})
+        self.assertEqual(len(second.data['results']), 7)
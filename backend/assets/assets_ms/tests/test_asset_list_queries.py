@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckin, AssetCheckout, Product
+from assets_ms.views import AssetViewSet, ProductViewSet
+
+
+@patch('assets_ms.services.context_maps.get_depreciation_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_supplier_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_manufacturer_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_category_names', return_value=[])
+@patch('assets_ms.services.ticket_snapshot.fetch_all_tickets', return_value=([], None, None))
+@patch('assets_ms.services.location_catalog.fetch_locations_page', return_value=([], None, 0))
+@patch('assets_ms.services.context_maps.get_status_names_assets', return_value=[])
+class ActiveCheckoutQueryCountTests(TestCase):
+    """active_checkout must not cost one query per asset row."""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.product = Product.objects.create(name='Laptop', category=1)
+
+    def _add_assets(self, count):
+        for _ in range(count):
+            n = Asset.objects.count()
+            asset = Asset.objects.create(asset_id=f'AST-QC-{n:05d}', product=self.product, status=1)
+            returned = AssetCheckout.objects.create(asset=asset, checkout_to=1, location=1)
+            AssetCheckin.objects.create(asset_checkout=returned, location=1)
+            AssetCheckout.objects.create(asset=asset, checkout_to=2, location=1)
+
+    def _count_queries(self, view, url, **kwargs):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = view(self.factory.get(url), **kwargs)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp
+
+    def test_asset_list_query_count_is_constant(self, *mocks):
+        view = AssetViewSet.as_view({'get': 'list'})
+        self._add_assets(2)
+        small, _ = self._count_queries(view, '/assets/')
+        self._add_assets(8)
+        large, resp = self._count_queries(view, '/assets/')
+
+        self.assertEqual(small, large)
+        active = {a.id: a.asset_checkouts.get(asset_checkin__isnull=True).id for a in Asset.objects.all()}
+        self.assertEqual({r['id']: r['active_checkout'] for r in resp.data}, active)
+
+    def test_product_retrieve_query_count_is_constant(self, *mocks):
+        view = ProductViewSet.as_view({'get': 'retrieve'})
+        url = f'/products/{self.product.id}/'
+        self._add_assets(2)
+        small, _ = self._count_queries(view, url, pk=self.product.id)
+        self._add_assets(8)
+        large, resp = self._count_queries(view, url, pk=self.product.id)
+
+        self.assertEqual(small, large)
+        self.assertTrue(all(a['active_checkout'] for a in resp.data['assets']))
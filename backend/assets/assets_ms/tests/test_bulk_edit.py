@@ -0,0 +1,61 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from assets_ms.models import ActivityLog, Component, Product
+from assets_ms.views import ComponentViewSet, ProductViewSet
+
+
+class BulkEditTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def _edit(self, viewset, ids, data):
+        view = viewset.as_view({'patch': 'bulk_edit'})
+        return view(self.factory.patch('/bulk-edit/', {'ids': ids, 'data': data}, format='json'))
+
+    def test_generated_names_are_checked_together(self):
+        products = [Product.objects.create(name=f'Old {i}', category=1) for i in range(3)]
+        Product.objects.create(name='Desk (2)', category=1)
+
+        resp = self._edit(ProductViewSet, [p.id for p in products], {'name': 'desk', 'model_number': 'M-1'})
+
+        self.assertEqual(resp.data['updated'], [products[0].id, products[2].id])
+        self.assertEqual(resp.data['failed'], [
+            {'id': products[1].id, 'errors': {'name': ['An asset model with this name already exists.']}}
+        ])
+        self.assertEqual(
+            list(Product.objects.filter(id__in=resp.data['updated']).values_list('name', 'model_number')),
+            [('Desk (1)', 'M-1'), ('Desk (3)', 'M-1')],
+        )
+
+    def test_invalid_shared_payload_fails_every_row(self):
+        products = [Product.objects.create(name=f'Old {i}', category=1) for i in range(2)]
+
+        resp = self._edit(ProductViewSet, [p.id for p in products], {'default_purchase_cost': 'abc'})
+
+        self.assertEqual(resp.data['updated'], [])
+        self.assertEqual([f['id'] for f in resp.data['failed']], [p.id for p in products])
+
+    def test_thousand_rows_in_a_constant_number_of_queries(self):
+        Product.objects.bulk_create([Product(name=f'Model {i}', category=1) for i in range(1000)])
+        ids = list(Product.objects.values_list('id', flat=True))
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._edit(ProductViewSet, ids, {'name': 'Laptop', 'notes': 'Bulk'})
+
+        self.assertEqual(len(resp.data['updated']), 1000)
+        self.assertEqual(Product.objects.filter(name='Laptop (1000)', notes='Bulk').count(), 1)
+        # Select, one uniqueness check and the bulk_update batches (smaller on SQLite)
+        self.assertLessEqual(len(ctx.captured_queries), 12)
+
+    def test_components_are_logged_per_row(self):
+        components = [Component.objects.create(name=f'Part {i}', category=1) for i in range(2)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self._edit(ComponentViewSet, [c.id for c in components], {'minimum_quantity': 3})
+
+        self.assertEqual(resp.data['updated'], [c.id for c in components])
+        self.assertEqual(ActivityLog.objects.filter(activity_type='Component', action='UPDATE').count(), 2)
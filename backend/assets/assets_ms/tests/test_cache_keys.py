@@ -0,0 +1,43 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from assets_ms.services.cache_keys import bump_generation, get_generation, versioned_key
+
+
+class VersionedKeyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_hides_every_key_of_the_namespace(self):
+        cache.set(versioned_key("assets", "list"), "stale")
+        cache.set(versioned_key("assets", "detail:1"), "stale")
+        cache.set(versioned_key("products", "list"), "kept")
+
+        bump_generation("assets")
+
+        self.assertIsNone(cache.get(versioned_key("assets", "list")))
+        self.assertIsNone(cache.get(versioned_key("assets", "detail:1")))
+        self.assertEqual(cache.get(versioned_key("products", "list")), "kept")
+
+    def test_lost_counter_never_reuses_a_generation(self):
+        old = get_generation("assets")
+        bump_generation("assets")
+        cache.delete("assets:generation")
+        with patch("assets_ms.services.cache_keys.time.time", return_value=time.time() + 1):
+            self.assertGreater(get_generation("assets"), old + 1)
+
+
+# Same checks against a real server: ASSETS_TEST_REDIS_URL=redis://localhost:6379/15
+@unittest.skipUnless(os.getenv("ASSETS_TEST_REDIS_URL"), "ASSETS_TEST_REDIS_URL not set")
+@override_settings(CACHES={
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("ASSETS_TEST_REDIS_URL"),
+        "KEY_PREFIX": "assets-test",
+    }
+})
+class RedisVersionedKeyTests(VersionedKeyTests):
+    pass
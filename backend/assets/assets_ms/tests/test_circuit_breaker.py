@@ -0,0 +1,75 @@
+import time
+from unittest.mock import MagicMock
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+from requests.exceptions import ConnectionError
+from assets_ms.services.circuit_breaker import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, call_upstream, get_breaker,
+)
+
+
+def _response(status_code=200, content=b'{"id": 1}'):
+    resp = MagicMock(status_code=status_code, content=content, headers={'Content-Type': 'application/json'}, url='http://x/')
+    return resp
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.1)
+
+    def test_opens_fails_fast_and_closes_after_probe(self):
+        send = MagicMock(side_effect=ConnectionError())
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                call_upstream(self.breaker, send)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            call_upstream(self.breaker, send)
+        self.assertEqual(send.call_count, 2)
+
+        time.sleep(0.15)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        send.side_effect = None
+        send.return_value = _response()
+        call_upstream(self.breaker, send)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_serves_last_known_good_while_open(self):
+        call_upstream(self.breaker, lambda: _response(), last_known_good='lkg:test')
+        for _ in range(2):
+            call_upstream(self.breaker, lambda: _response(status_code=503), last_known_good='lkg:other')
+        self.assertEqual(self.breaker.state, OPEN)
+
+        resp = call_upstream(self.breaker, MagicMock(), last_known_good='lkg:test')
+        self.assertEqual(resp.json(), {'id': 1})
+        self.assertIn('X-Last-Known-Good', resp.headers)
+        self.assertEqual(self.breaker.snapshot()['last_known_good_served'], 1)
+
+    def test_slow_call_is_hedged_when_idle(self):
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            if len(attempts) == 1:
+                time.sleep(1)
+                return _response(content=b'"slow"')
+            return _response(content=b'"fast"')
+
+        for _ in range(10):
+            self.breaker.before_call()
+            self.breaker.on_success(0.01)
+        started = time.monotonic()
+        resp = call_upstream(self.breaker, send, hedge=True)
+        self.assertEqual(resp.content, b'"fast"')
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(self.breaker.snapshot()['hedges'], 1)
+
+    def test_health_endpoint_reports_breakers(self):
+        get_breaker('contexts')
+        resp = APIClient().get('/health/upstreams/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('contexts', resp.json()['upstreams'])
+        self.assertIn(resp.json()['status'], ('ok', 'degraded'))
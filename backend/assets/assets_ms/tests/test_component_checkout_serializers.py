@@ -0,0 +1,60 @@
+from datetime import date
+from django.test import TestCase
+from assets_ms.models import Asset, Component, ComponentCheckin, ComponentCheckout, Product
+from assets_ms.serializer import ComponentCheckinSerializer, ComponentCheckoutSerializer
+
+
+class ComponentCheckoutSerializerQueryTests(TestCase):
+    def setUp(self):
+        product = Product.objects.create(name='Laptop', category=1)
+        self.asset = Asset.objects.create(asset_id='AST-CC-1', product=product, status=1)
+        self.components = [
+            Component.objects.create(name=f'Part {i}', category=1, quantity=5) for i in range(20)
+        ]
+        self.checkouts = [
+            ComponentCheckout.objects.create(
+                component=c, asset=self.asset, quantity=2, checkout_date=date(2025, 1, 1)
+            )
+            for c in self.components
+        ]
+
+    def test_construction_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            ComponentCheckoutSerializer(data={})
+            ComponentCheckinSerializer(data={})
+
+    def test_checkout_validation_is_constant(self):
+        data = {
+            'component': self.components[0].id, 'asset': self.asset.id,
+            'quantity': 3, 'checkout_date': '2025-02-01',
+        }
+        # component lookup + asset lookup
+        with self.assertNumQueries(2):
+            self.assertTrue(ComponentCheckoutSerializer(data=data).is_valid())
+
+        data['quantity'] = 4
+        serializer = ComponentCheckoutSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('quantity', serializer.errors)
+
+    def test_out_of_stock_component_is_rejected(self):
+        component = self.components[1]
+        Component.objects.filter(pk=component.pk).update(checked_out_qty=5)
+        serializer = ComponentCheckoutSerializer(data={
+            'component': component.id, 'asset': self.asset.id, 'quantity': 1, 'checkout_date': '2025-02-01',
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('component', serializer.errors)
+
+    def test_checkin_validation_is_constant_and_skips_returned_checkouts(self):
+        returned = self.checkouts[1]
+        ComponentCheckin.objects.create(component_checkout=returned, quantity=2, checkin_date=date(2025, 1, 2))
+
+        data = {'component_checkout': self.checkouts[0].id, 'quantity': 2, 'checkin_date': '2025-01-05'}
+        with self.assertNumQueries(1):
+            self.assertTrue(ComponentCheckinSerializer(data=data).is_valid())
+
+        data['component_checkout'] = returned.id
+        serializer = ComponentCheckinSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('component_checkout', serializer.errors)
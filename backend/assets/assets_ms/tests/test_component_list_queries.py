@@ -0,0 +1,49 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from assets_ms.models import Asset, Component, ComponentCheckin, ComponentCheckout, Product
+from assets_ms.serializer import ComponentListSerializer
+from assets_ms.services.component_stock import annotate_active_component_checkout
+
+
+class ComponentListActiveCheckoutTests(TestCase):
+    def setUp(self):
+        product = Product.objects.create(name='Laptop', category=1)
+        self.asset = Asset.objects.create(asset_id='AST-CL-1', product=product, status=1)
+        self.idle = Component.objects.create(name='A idle', category=1, quantity=5)
+        self.partial = Component.objects.create(name='B partial', category=1, quantity=5)
+        self.returned = Component.objects.create(name='C returned', category=1, quantity=5)
+
+        self.partial_checkout = self._checkout(self.partial, 2)
+        ComponentCheckin.objects.create(component_checkout=self.partial_checkout, quantity=1, checkin_date=date(2025, 1, 2))
+        self.fresh_checkout = self._checkout(self.partial, 1)
+
+        done = self._checkout(self.returned, 2)
+        ComponentCheckin.objects.create(component_checkout=done, quantity=2, checkin_date=date(2025, 1, 2))
+
+    def _checkout(self, component, quantity):
+        return ComponentCheckout.objects.create(
+            component=component, asset=self.asset, quantity=quantity, checkout_date=date(2025, 1, 1)
+        )
+
+    def test_list_is_one_query_and_prefers_untouched_checkouts(self):
+        queryset = annotate_active_component_checkout(Component.objects.order_by('name'))
+        with self.assertNumQueries(1):
+            data = ComponentListSerializer(queryset, many=True).data
+
+        active = {row['name']: row['active_checkout'] for row in data}
+        self.assertEqual(active, {
+            'A idle': None,
+            'B partial': self.fresh_checkout.id,
+            'C returned': None,
+        })
+
+    def test_unannotated_instances_fall_back_to_a_query(self):
+        self.assertEqual(ComponentListSerializer(self.partial).data['active_checkout'], self.fresh_checkout.id)
+
+    def test_benchmark_command_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_component_list', sizes='20,40', runs=1, stdout=out)
+        self.assertIn('=== 40 components ===', out.getvalue())
+        self.assertFalse(Component.objects.filter(name__startswith='Benchmark Component').exists())
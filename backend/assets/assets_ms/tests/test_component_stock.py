@@ -0,0 +1,70 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from assets_ms.models import Asset, Component, ComponentCheckin, ComponentCheckout, Product
+from assets_ms.services.component_stock import low_stock_components, rebuild_checked_out_qty
+
+
+class ComponentStockLedgerTests(TestCase):
+    def setUp(self):
+        product = Product.objects.create(name='Laptop', category=1)
+        self.asset = Asset.objects.create(asset_id='AST-CS-1', product=product, status=1)
+        self.component = Component.objects.create(name='RAM 16GB', category=1, quantity=10, minimum_quantity=5)
+
+    def _checkout(self, quantity):
+        return ComponentCheckout.objects.create(
+            component=self.component, asset=self.asset, quantity=quantity, checkout_date=date(2025, 1, 1)
+        )
+
+    def _stock(self):
+        self.component.refresh_from_db()
+        return self.component.checked_out_qty
+
+    def test_save_and_delete_keep_ledger_in_sync(self):
+        checkout = self._checkout(6)
+        self.assertEqual(self._stock(), 6)
+
+        checkin = ComponentCheckin.objects.create(component_checkout=checkout, quantity=2, checkin_date=date(2025, 1, 2))
+        self.assertEqual(self._stock(), 4)
+
+        checkin.quantity = 3
+        checkin.save()
+        self.assertEqual(self._stock(), 3)
+
+        checkout.quantity = 8
+        checkout.save()
+        self.assertEqual(self._stock(), 5)
+
+        # Deleting the checkout cascades to its checkins
+        checkout.delete()
+        self.assertEqual(self._stock(), 0)
+
+    def test_available_quantity_reads_the_column(self):
+        self._checkout(6)
+        component = Component.objects.get(pk=self.component.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(component.available_quantity, 4)
+        self.assertEqual(list(low_stock_components()), [component])
+
+    def test_rebuild_corrects_drift(self):
+        checkout = self._checkout(6)
+        ComponentCheckin.objects.create(component_checkout=checkout, quantity=1, checkin_date=date(2025, 1, 2))
+        Component.objects.filter(pk=self.component.pk).update(checked_out_qty=0)
+
+        self.assertEqual(rebuild_checked_out_qty(), 1)
+        self.assertEqual(self._stock(), 5)
+        self.assertEqual(rebuild_checked_out_qty(), 0)
+        call_command('rebuild_component_stock', stdout=StringIO())
+
+    def test_backfilled_checkout_can_be_checked_in(self):
+        # A checkout from before checked_out_qty existed: the column starts at 0
+        checkout = self._checkout(6)
+        Component.objects.filter(pk=self.component.pk).update(checked_out_qty=0)
+
+        call_command('rebuild_component_stock', stdout=StringIO())
+        self.assertEqual(self._stock(), 6)
+        self.assertEqual(Component.objects.get(pk=self.component.pk).available_quantity, 4)
+
+        ComponentCheckin.objects.create(component_checkout=checkout, quantity=6, checkin_date=date(2025, 1, 2))
+        self.assertEqual(self._stock(), 0)
@@ -0,0 +1,70 @@
+import threading
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import Mock, patch
+from assets_ms.services.context_maps import ContextMapRegistry
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'context-maps-tests'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class ContextMapRegistryTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.registry = ContextMapRegistry(background_refresh=False)
+
+    def test_empty_map_is_cached(self):
+        loader = Mock(return_value={})
+        self.registry.register('empty', loader)
+        self.assertEqual(self.registry.get('empty'), {})
+        self.assertEqual(self.registry.get('empty'), {})
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(self.registry.stats()['empty'], {'misses': 1, 'loads': 1, 'hits': 1})
+
+    def test_failed_load_is_negative_cached(self):
+        loader = Mock(return_value=None)
+        self.registry.register('down', loader)
+        self.assertEqual(self.registry.get('down'), {})
+        self.assertEqual(self.registry.get('down'), {})
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(self.registry.stats()['down']['negative_hits'], 1)
+
+    def test_stale_value_is_served_and_kept_when_refresh_fails(self):
+        loader = Mock(side_effect=[{1: 'a'}, None, {1: 'b'}])
+        self.registry.register('maps', loader, soft_ttl=60, negative_ttl=5)
+        with patch('assets_ms.services.context_maps.time.time', return_value=1000):
+            self.assertEqual(self.registry.get('maps'), {1: 'a'})
+        # Past the soft TTL: serves stale, refresh fails, last good map stays
+        with patch('assets_ms.services.context_maps.time.time', return_value=1100):
+            self.assertEqual(self.registry.get('maps'), {1: 'a'})
+            self.assertEqual(self.registry.get('maps'), {1: 'a'})
+        # Past the negative TTL: next stale read refreshes successfully
+        with patch('assets_ms.services.context_maps.time.time', return_value=1106):
+            self.assertEqual(self.registry.get('maps'), {1: 'a'})
+            self.assertEqual(self.registry.get('maps'), {1: 'b'})
+        self.assertEqual(loader.call_count, 3)
+
+    def test_concurrent_misses_load_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_loader():
+            started.set()
+            release.wait(2)
+            return {1: 'x'}
+
+        loader = Mock(side_effect=slow_loader)
+        self.registry.register('slow', loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get('slow'))) for _ in range(5)]
+        threads[0].start()
+        started.wait(2)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual(results, [{1: 'x'}] * 5)
+        self.assertEqual(loader.call_count, 1)
+        self.assertEqual(self.registry.stats()['slow']['waits'], 4)
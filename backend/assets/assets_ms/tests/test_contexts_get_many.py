@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from unittest.mock import patch
+from assets_ms.services import contexts
+from assets_ms.services.contexts import get_many, get_status_by_id
+
+
+def fake_batch(resource_name, ids):
+    # Pretend every odd id exists
+    return [{'id': i, 'name': f'{resource_name}-{i}'} for i in ids if i % 2]
+
+
+class GetManyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch('assets_ms.services.contexts.fetch_resources_by_ids', side_effect=fake_batch)
+    def test_fetches_misses_in_batches_and_fills_per_id_cache(self, mock_fetch):
+        with patch.object(contexts, 'GET_MANY_BATCH_SIZE', 4):
+            result = get_many('statuses', range(1, 11))
+
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual(result[3]['name'], 'statuses-3')
+        self.assertIn('warning', result[4])
+
+        # Per-id helper now reads from the cache without another call
+        with patch('assets_ms.services.contexts.fetch_resource_by_id') as mock_single:
+            self.assertEqual(get_status_by_id(5)['name'], 'statuses-5')
+            mock_single.assert_not_called()
+
+    @patch('assets_ms.services.contexts.fetch_resources_by_ids', side_effect=fake_batch)
+    def test_cached_ids_are_not_fetched_again(self, mock_fetch):
+        get_many('categories', [1, 3])
+        get_many('categories', [1, 3, 5])
+        self.assertEqual(mock_fetch.call_args_list[-1].args, ('categories', [5]))
+
+    @patch('assets_ms.services.contexts.fetch_resources_by_ids',
+           return_value={'warning': 'Contexts service unreachable.'})
+    def test_unreachable_service_returns_warnings(self, mock_fetch):
+        result = get_many('depreciations', [1, 2])
+        self.assertEqual(set(result), {1, 2})
+        self.assertTrue(all(r.get('warning') for r in result.values()))
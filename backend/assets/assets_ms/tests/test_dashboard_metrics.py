@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.test import TestCase
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckin, AssetCheckout, AuditSchedule, Product
+from assets_ms.services.dashboard import (
+    compute_asset_metrics, compute_audit_metrics, compute_checkout_metrics, compute_dashboard_metrics,
+)
+
+AS_OF = date(2025, 6, 1)
+STATUSES = [{'id': 1, 'name': 'Deployed', 'type': 'deployed'}, {'id': 2, 'name': 'Ready', 'type': 'deployable'}]
+
+
+def days(n):
+    return AS_OF + timedelta(days=n)
+
+
+@patch('assets_ms.services.dashboard.get_categories_list', return_value=[])
+@patch('assets_ms.services.dashboard.get_status_names_assets', return_value=STATUSES)
+class DashboardMetricsTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(name='Laptop', category=3, end_of_life=days(10))
+        self.assets = [
+            Asset.objects.create(
+                asset_id=f'AST-DM-{i}', product=self.product, status=1 if i < 2 else 2,
+                purchase_cost=Decimal('100.00'), warranty_expiration=days(-5 if i == 0 else 20),
+            )
+            for i in range(4)
+        ]
+        for asset, return_offset in zip(self.assets, (-3, 5, 40)):
+            AssetCheckout.objects.create(asset=asset, checkout_to=1, location=1, return_date=days(return_offset))
+        returned = AssetCheckout.objects.create(asset=self.assets[3], checkout_to=1, location=1, return_date=days(-1))
+        AssetCheckin.objects.create(asset_checkout=returned)
+        for offset in (-2, 0, 15, 60):
+            AuditSchedule.objects.create(asset=self.assets[0], date=days(offset))
+
+    def test_windowed_counters_follow_as_of(self, *mocks):
+        self.assertEqual(compute_checkout_metrics(AS_OF), {'due_for_return': 1, 'overdue_for_return': 1})
+        self.assertEqual(
+            compute_audit_metrics(AS_OF),
+            {'due_audits': 3, 'upcoming_audits': 1, 'overdue_audits': 1, 'completed_audits': 0},
+        )
+        later = compute_checkout_metrics(days(10))
+        self.assertEqual(later, {'due_for_return': 1, 'overdue_for_return': 2})
+
+    def test_asset_metrics(self, *mocks):
+        metrics = compute_asset_metrics(AS_OF)
+        self.assertEqual(metrics['expired_warranties'], 1)
+        self.assertEqual(metrics['expiring_warranties'], 3)
+        self.assertEqual(metrics['asset_utilization'], 50)
+        self.assertEqual(Decimal(metrics['total_asset_costs']), Decimal('400.00'))
+
+    def test_one_query_per_table(self, *mocks):
+        # checkouts 1, audit schedules + audits 2, products 1, assets 1 + 2 group-bys, components 1
+        with self.assertNumQueries(8):
+            metrics = compute_dashboard_metrics(AS_OF)
+        self.assertEqual(metrics['reached_end_of_life'], 0)
+        self.assertEqual(metrics['upcoming_end_of_life'], 1)
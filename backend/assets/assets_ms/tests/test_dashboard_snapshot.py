@@ -0,0 +1,50 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckout, DashboardSnapshot, Product
+from assets_ms.services.dashboard import get_dashboard_metrics
+
+STATUSES = [{'id': 1, 'name': 'Deployed', 'type': 'deployed'}, {'id': 2, 'name': 'Ready', 'type': 'deployable'}]
+CATEGORIES = [{'id': 3, 'name': 'Laptops'}]
+
+
+@patch('assets_ms.services.dashboard.get_categories_list', return_value=CATEGORIES)
+@patch('assets_ms.services.dashboard.get_status_names_assets', return_value=STATUSES)
+class DashboardSnapshotTests(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.product = Product.objects.create(name='Laptop', category=3)
+        self.asset = Asset.objects.create(asset_id='AST-DS-1', product=self.product, status=1)
+
+    def test_clean_snapshot_is_read_in_one_query(self, *mocks):
+        first = get_dashboard_metrics()
+        self.assertEqual(first['asset_utilization'], 100)
+        self.assertEqual(first['asset_categories'], [{'product__category__name': 'Laptops', 'count': 1}])
+
+        with self.assertNumQueries(1):
+            second = get_dashboard_metrics()
+        self.assertEqual(first, second)
+
+    def test_write_marks_only_affected_section_dirty(self, *mocks):
+        get_dashboard_metrics()
+        with self.captureOnCommitCallbacks(execute=True):
+            AssetCheckout.objects.create(
+                asset=self.asset, checkout_to=1, location=1, return_date=self.today - timedelta(days=1)
+            )
+
+        dirty = set(DashboardSnapshot.objects.filter(dirty=True).values_list('section', flat=True))
+        self.assertEqual(dirty, {'checkouts'})
+        self.assertEqual(get_dashboard_metrics()['overdue_for_return'], 1)
+        self.assertFalse(DashboardSnapshot.objects.filter(dirty=True).exists())
+
+    def test_reconciliation_command_picks_up_bulk_writes(self, *mocks):
+        get_dashboard_metrics()
+        # bulk_create bypasses signals, so only reconciliation sees it
+        Asset.objects.bulk_create([Asset(asset_id='AST-DS-2', product=self.product, status=2)])
+        self.assertEqual(get_dashboard_metrics()['asset_utilization'], 100)
+
+        call_command('refresh_dashboard_snapshot', stdout=StringIO())
+        self.assertEqual(get_dashboard_metrics()['asset_utilization'], 50)
@@ -0,0 +1,66 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckin, AssetCheckout, Product
+from assets_ms.services.depreciation_report import generate_depreciation_report
+
+CONTEXTS = {
+    'depreciations': {7: {'id': 7, 'name': 'Laptops 3y', 'duration': 36, 'minimum_value': '100.00'}},
+    'statuses': {1: {'id': 1, 'name': 'Ready to Deploy'}},
+}
+
+
+def fake_get_many(resource_name, ids):
+    return {i: CONTEXTS[resource_name].get(i, {'warning': 'not found'}) for i in ids}
+
+
+@patch('assets_ms.services.depreciation_report.get_many', side_effect=fake_get_many)
+class DepreciationReportTests(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(
+            name='Laptop', category=1, depreciation=7, default_purchase_cost=Decimal('1000.00')
+        )
+        Product.objects.create(name='No depreciation', category=1)
+
+    def _add_asset(self, i, **kwargs):
+        return Asset.objects.create(
+            asset_id=f'AST-DR-{i:05d}', product=self.product, status=1,
+            purchase_date=date(2024, 1, 1), purchase_cost=Decimal('1000.00'), **kwargs
+        )
+
+    def test_computes_values_and_open_checkout(self, mock_get_many):
+        asset = self._add_asset(0)
+        returned = AssetCheckout.objects.create(asset=asset, checkout_to=11, location=1)
+        AssetCheckin.objects.create(asset_checkout=returned)
+        AssetCheckout.objects.create(asset=asset, checkout_to=42, location=1)
+
+        [row] = generate_depreciation_report(today=date(2025, 1, 1))
+
+        self.assertEqual(row['deployedTo'], 42)
+        self.assertEqual(row['statusName'], 'Ready to Deploy')
+        self.assertEqual(row['depreciationName'], 'Laptops 3y')
+        self.assertEqual(row['monthlyDepreciation'], 25.0)
+        self.assertEqual(row['depreciated'], 300.0)
+        self.assertEqual(row['currentValue'], 700.0)
+        self.assertEqual(row['monthsLeft'], 24)
+
+    def test_query_count_does_not_grow_with_assets(self, mock_get_many):
+        for i in range(25):
+            asset = self._add_asset(i)
+            AssetCheckout.objects.create(asset=asset, checkout_to=i + 1, location=1)
+
+        with self.assertNumQueries(3):
+            rows = generate_depreciation_report()
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(mock_get_many.call_count, 2)
+
+    def test_benchmark_command_rolls_back(self, mock_get_many):
+        cache.clear()
+        out = StringIO()
+        call_command('benchmark_depreciation_report', assets=30, runs=1, stdout=out)
+        self.assertIn('rows/sec', out.getvalue())
+        self.assertFalse(Asset.objects.filter(asset_id__startswith='AST-BENCH-').exists())
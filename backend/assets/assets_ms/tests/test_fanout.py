@@ -0,0 +1,56 @@
+import threading
+import time
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from assets_ms.services.context_maps import ContextMapRegistry
+from assets_ms.services.fanout import Call, fan_out
+
+
+def _slow(value, delay=0.2):
+    def call():
+        time.sleep(delay)
+        return value
+    return call
+
+
+class FanOutTests(SimpleTestCase):
+    def test_calls_overlap_and_inline_runs_on_caller_thread(self):
+        caller = threading.current_thread().name
+        started = time.monotonic()
+        results = fan_out(
+            {'a': _slow(1), 'b': _slow(2), 'c': _slow(3)},
+            inline={'thread': lambda: threading.current_thread().name},
+        )
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(results, {'a': 1, 'b': 2, 'c': 3, 'thread': caller})
+
+    def test_timeouts_and_failures_yield_defaults(self):
+        def fail():
+            raise ValueError("upstream down")
+
+        started = time.monotonic()
+        with self.assertLogs('assets_ms.services.fanout', 'WARNING') as logs:
+            results = fan_out({
+                'slow': Call(_slow('late', delay=1.0), default='timed out', timeout=0.1),
+                'broken': Call(fail, default={}),
+                'ok': _slow('ok', delay=0.05),
+            }, deadline=0.5)
+        self.assertEqual(len(logs.records), 2)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(results, {'slow': 'timed out', 'broken': {}, 'ok': 'ok'})
+
+    def test_get_many_loads_missing_maps_concurrently(self):
+        cache.clear()
+        registry = ContextMapRegistry(background_refresh=False)
+        registry.register('test:a', _slow({1: 'a'}))
+        registry.register('test:b', _slow({2: 'b'}))
+
+        started = time.monotonic()
+        maps = registry.get_many(['test:a', 'test:b'], extra={'tickets': _slow({3: 't'})})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(maps, {'test:a': {1: 'a'}, 'test:b': {2: 'b'}, 'tickets': {3: 't'}})
+
+        # Warm: served from one cache read, without loading again
+        self.assertEqual(registry.get_many(['test:a', 'test:b'])['test:b'], {2: 'b'})
+        self.assertEqual(registry.stats()['test:a']['loads'], 1)
+        self.assertEqual(registry.stats()['test:a']['hits'], 1)
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from assets_ms.services.context_maps import ContextMapRegistry
+from assets_ms.services.location_catalog import PAGE_SIZE, load_location_catalog
+
+LOCATIONS = [{'id': i, 'city': f'City {i}'} for i in range(1, PAGE_SIZE + 51)]
+
+
+def _pages(locations, total=None, unchanged=()):
+    """Fake fetch_locations_page over locations; offsets in unchanged answer 304 to their ETag."""
+    def fetch(offset=0, limit=PAGE_SIZE, etag=None):
+        page_etag = f'"page-{offset}"'
+        if etag == page_etag and offset in unchanged:
+            return None, etag, total
+        return locations[offset:offset + limit], page_etag, total
+    return fetch
+
+
+class LocationCatalogTests(SimpleTestCase):
+    def test_walks_every_page(self):
+        with patch('assets_ms.services.location_catalog.fetch_locations_page', side_effect=_pages(LOCATIONS)) as fetch:
+            catalog, validators = load_location_catalog()
+        self.assertEqual(len(catalog), PAGE_SIZE + 50)
+        self.assertEqual(catalog[PAGE_SIZE + 50]['city'], f'City {PAGE_SIZE + 50}')
+        # Two pages and the empty page that ends the walk
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual([page['offset'] for page in validators['pages']], [0, PAGE_SIZE])
+
+    def test_unchanged_pages_are_revalidated(self):
+        fake = _pages(LOCATIONS, total=len(LOCATIONS))
+        with patch('assets_ms.services.location_catalog.fetch_locations_page', side_effect=fake):
+            previous, validators = load_location_catalog()
+
+        changed = [dict(loc, city='Moved') if loc['id'] == PAGE_SIZE + 1 else loc for loc in LOCATIONS]
+        fake = _pages(changed, total=len(changed), unchanged=(0,))
+        with patch('assets_ms.services.location_catalog.fetch_locations_page', side_effect=fake) as fetch:
+            catalog, _ = load_location_catalog(previous, validators)
+        self.assertEqual(fetch.call_args_list[0].kwargs['etag'], '"page-0"')
+        self.assertEqual(catalog[1], previous[1])
+        self.assertEqual(catalog[PAGE_SIZE + 1]['city'], 'Moved')
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_proxy_ignoring_offset_stops_after_repeated_page(self):
+        def first_page_only(offset=0, limit=PAGE_SIZE, etag=None):
+            return LOCATIONS[:limit], None, None
+
+        with patch('assets_ms.services.location_catalog.fetch_locations_page', side_effect=first_page_only) as fetch:
+            catalog, _ = load_location_catalog()
+        self.assertEqual(len(catalog), PAGE_SIZE)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_registry_passes_previous_map_to_conditional_loader(self):
+        cache.clear()
+        registry = ContextMapRegistry(background_refresh=False)
+        calls = []
+
+        def loader(previous, validators):
+            calls.append((previous, validators))
+            return {1: {'id': 1}}, {'pages': [{'offset': 0, 'etag': '"v1"', 'ids': [1]}]}
+
+        registry.register('test:locations', loader, conditional=True)
+        registry.get('test:locations')
+        key = 'ctxmap:test:locations'
+        cache.set(key, dict(cache.get(key), fresh_until=0))
+        registry.get('test:locations')  # stale: refreshed with the previous entry
+        self.assertEqual(calls[0], (None, None))
+        self.assertEqual(calls[1][0], {1: {'id': 1}})
+        self.assertEqual(calls[1][1]['pages'][0]['etag'], '"v1"')
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from assets_ms.models import Asset, AssetCheckin, AssetCheckout, Notification, NotificationSource, Product
+from assets_ms.services.notification_feed import SOURCES, SYNC_LOCK_KEY, get_notification_feed, sync_notifications
+from assets_ms.services.user_directory import user_directory
+
+USERS = {7: {'id': 7, 'full_name': 'Ada Lovelace'}}
+
+
+@patch.object(user_directory, 'get_users', return_value=USERS)
+@patch('assets_ms.services.notification_feed.get_deployable_pending_status_ids', return_value=[1])
+@patch('assets_ms.services.notifications.get_deployable_pending_status_ids', return_value=[1])
+class NotificationFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.product = Product.objects.create(name='Laptop', category=1, minimum_quantity=1)
+        self.asset = Asset.objects.create(asset_id='AST-NF-1', product=self.product, status=3)
+        self.checkout = AssetCheckout.objects.create(
+            asset=self.asset, checkout_to=7, location=1,
+            return_date=timezone.now().date() - timedelta(days=2),
+        )
+
+    def test_feed_is_persisted_with_stable_ids(self, *mocks):
+        first = self.client.get('/notifications/').json()
+        self.assertEqual(
+            sorted(n['key'] for n in first['results']),
+            [f'overdue-checkout-{self.checkout.id}', f'product-low-stock-{self.product.id}'],
+        )
+        overdue = next(n for n in first['results'] if n['type'] == 'due-back')
+        self.assertIn('Ada Lovelace', overdue['message'])
+
+        # Nothing changed: one query for the source states, two for the feed
+        with self.assertNumQueries(3):
+            second = get_notification_feed()
+        self.assertEqual(sorted(n.id for n in second['results']), sorted(n['id'] for n in first['results']))
+
+        call_command('sync_notifications', stdout=StringIO())
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_since_returns_resolutions(self, *mocks):
+        cursor = self.client.get('/notifications/').json()['cursor']
+        self.assertFalse(self.client.get('/notifications/', {'since': cursor}).json()['results'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AssetCheckin.objects.create(asset_checkout=self.checkout)
+        self.assertTrue(NotificationSource.objects.get(name='checkouts').dirty)
+
+        changes = self.client.get('/notifications/', {'since': cursor}).json()
+        self.assertEqual([n['key'] for n in changes['results']], [f'overdue-checkout-{self.checkout.id}'])
+        self.assertFalse(changes['results'][0]['is_active'])
+        self.assertEqual(self.client.get('/notifications/').json()['count'], 1)
+        self.assertFalse(self.client.get('/notifications/', {'since': changes['cursor']}).json()['results'])
+
+    def test_unreachable_contexts_keeps_product_notifications(self, status_ids, feed_status_ids, *mocks):
+        get_notification_feed()
+        status_ids.return_value = feed_status_ids.return_value = []
+        NotificationSource.objects.update(dirty=True)
+
+        get_notification_feed()
+        self.assertTrue(Notification.objects.get(source='products').is_active)
+        self.assertTrue(NotificationSource.objects.get(name='products').dirty)
+
+    def test_concurrent_poll_serves_current_rows_while_another_syncs(self, *mocks):
+        get_notification_feed()
+        NotificationSource.objects.update(dirty=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            AssetCheckin.objects.create(asset_checkout=self.checkout)
+
+        cache.add(SYNC_LOCK_KEY, 1)
+        try:
+            self.assertEqual(len(get_notification_feed()['results']), 2)
+            # The command waits for the lock as well instead of syncing alongside
+            self.assertIsNone(sync_notifications(wait=0))
+        finally:
+            cache.delete(SYNC_LOCK_KEY)
+        self.assertEqual(len(get_notification_feed()['results']), 1)
+
+    def test_recurring_condition_is_a_new_notification(self, *mocks):
+        audit = {'id': 'overdue-audit-1', 'type': 'maintenance', 'title': 'Audit overdue', 'message': 'Overdue',
+                 'item_type': 'audit_schedule', 'item_id': 1, 'item_name': 'AST-1'}
+        conditions = [audit]
+        with patch.dict(SOURCES, {'audits': lambda: list(conditions)}):
+            sync_notifications(['audits'])
+            dismissed_id = Notification.objects.get(key='overdue-audit-1').id
+            conditions.clear()
+            sync_notifications(['audits'])
+            conditions.append(audit)
+            sync_notifications(['audits'])
+
+        # A client that dismissed the first occurrence by id sees the new one
+        active = Notification.objects.get(key='overdue-audit-1', is_active=True)
+        self.assertNotEqual(active.id, dismissed_id)
+        self.assertFalse(Notification.objects.get(id=dismissed_id).is_active)
+
+    def test_invalid_cursor_is_rejected(self, *mocks):
+        self.assertEqual(self.client.get('/notifications/', {'since': 'yesterday'}).status_code, 400)
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from unittest.mock import patch
+from assets_ms.models import Asset, Product
+from assets_ms.services.notifications import generate_low_stock_product_notifications
+from assets_ms.views import ProductViewSet
+
+STATUSES = [
+    {'id': 1, 'name': 'Ready to Deploy', 'type': 'deployable'},
+    {'id': 2, 'name': 'Pending', 'type': 'pending'},
+    {'id': 3, 'name': 'Deployed', 'type': 'deployed'},
+    {'id': 4, 'name': 'Broken', 'type': 'undeployable'},
+]
+
+
+@patch('assets_ms.services.product_stock.get_status_names_assets', return_value=STATUSES)
+@patch('assets_ms.services.context_maps.get_depreciation_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_supplier_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_manufacturer_names', return_value=[])
+@patch('assets_ms.services.context_maps.get_category_names', return_value=[])
+class ProductStockCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.view = ProductViewSet.as_view({'get': 'list'})
+
+    def _add_product(self, name, statuses, minimum_quantity=None):
+        product = Product.objects.create(name=name, category=1, minimum_quantity=minimum_quantity)
+        for status_id in statuses:
+            n = Asset.objects.count()
+            Asset.objects.create(asset_id=f'AST-PS-{n:05d}', product=product, status=status_id)
+        return product
+
+    def _list(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.view(self.factory.get('/products/'))
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), {p['name']: p for p in resp.data}
+
+    def test_list_counts_by_status_type(self, *mocks):
+        self._add_product('Laptop', [1, 2, 3, 3, 4])
+        self._add_product('Monitor', [])
+
+        _, rows = self._list()
+        self.assertEqual(
+            (rows['Laptop']['has_assets'], rows['Laptop']['available_count'], rows['Laptop']['deployed_count']),
+            (True, 2, 2),
+        )
+        self.assertEqual(
+            (rows['Monitor']['has_assets'], rows['Monitor']['available_count'], rows['Monitor']['deployed_count']),
+            (False, 0, 0),
+        )
+
+    def test_list_query_count_is_constant(self, *mocks):
+        self._add_product('P0', [1])
+        small, _ = self._list()
+        for i in range(1, 6):
+            self._add_product(f'P{i}', [1, 3])
+        large, _ = self._list()
+        self.assertEqual(small, large)
+
+    @patch('assets_ms.services.notifications.get_deployable_pending_status_ids', return_value=[1, 2])
+    def test_low_stock_notifications_use_aggregate(self, *mocks):
+        low = self._add_product('Low', [1, 3, 3], minimum_quantity=2)
+        self._add_product('Stocked', [1, 1, 2], minimum_quantity=2)
+
+        with self.assertNumQueries(1):
+            notifications = generate_low_stock_product_notifications()
+        self.assertEqual([n['item_id'] for n in notifications], [low.id])
@@ -0,0 +1,39 @@
+import csv
+from io import BytesIO, StringIO
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from openpyxl import load_workbook
+from rest_framework.test import APIRequestFactory
+from assets_ms.api.reports import ActivityReportAPIView
+from assets_ms.models import ActivityLog
+
+
+class StreamingReportExportTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = ActivityReportAPIView.as_view()
+        for i in range(5):
+            ActivityLog.objects.create(
+                user_id=1, user_name='Admin', activity_type='Asset', action='CREATE',
+                item_id=i, item_identifier=f'AST-{i}', item_name=f'Laptop {i}',
+            )
+
+    def _get(self, params):
+        resp = self.view(self.factory.get('/reports/activity/', params))
+        self.assertIsInstance(resp, StreamingHttpResponse)
+        return resp, b''.join(resp.streaming_content)
+
+    def test_csv_export_streams_every_row(self):
+        resp, body = self._get({'export_format': 'csv'})
+        self.assertEqual(resp['Content-Type'], 'text/csv')
+        rows = list(csv.reader(StringIO(body.decode())))
+        self.assertEqual(rows[0], ['Date', 'User', 'Type', 'Event', 'Item', 'To/From', 'Notes'])
+        self.assertEqual(len(rows), 6)
+        self.assertIn('AST-4 - Laptop 4', rows[1])
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        resp, body = self._get({})
+        self.assertIn('.xlsx', resp['Content-Disposition'])
+        ws = load_workbook(BytesIO(body)).active
+        self.assertEqual(ws.title, 'ActivityReport')
+        self.assertEqual(ws.max_row, 6)
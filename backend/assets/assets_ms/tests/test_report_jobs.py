@@ -0,0 +1,68 @@
+import csv
+import shutil
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from assets_ms.models import ActivityLog, ReportJob
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ReportJobTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(3):
+            ActivityLog.objects.create(
+                user_id=1, user_name='Admin', activity_type='Asset', action='CREATE',
+                item_id=i, item_identifier=f'AST-{i}', item_name=f'Laptop {i}',
+            )
+
+    def _submit(self, params=None):
+        return self.client.post('/reports/jobs/', {
+            'report_type': 'activity', 'export_format': 'csv', 'params': params or {'activity_type': 'Asset'},
+        }, format='json')
+
+    def test_submit_process_and_download(self):
+        resp = self._submit()
+        self.assertEqual(resp.status_code, 201)
+        job_id = resp.data['id']
+        self.assertEqual(resp.data['status'], 'queued')
+        self.assertEqual(self.client.get(f'/reports/jobs/{job_id}/download/').status_code, 409)
+
+        call_command('process_report_jobs', once=True, stdout=StringIO())
+
+        status_resp = self.client.get(f'/reports/jobs/{job_id}/')
+        self.assertEqual(status_resp.data['status'], 'done')
+        self.assertTrue(status_resp.data['download_url'].endswith(f'/reports/jobs/{job_id}/download/'))
+
+        download = self.client.get(f'/reports/jobs/{job_id}/download/')
+        self.assertEqual(download.status_code, 200)
+        rows = list(csv.reader(StringIO(b''.join(download.streaming_content).decode())))
+        self.assertEqual(rows[0][0], 'Date')
+        self.assertEqual(len(rows), 4)
+
+    def test_identical_request_reuses_job(self):
+        first = self._submit()
+        second = self._submit()
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.data['deduplicated'])
+        self.assertEqual(first.data['id'], second.data['id'])
+
+        other = self._submit({'activity_type': 'Component'})
+        self.assertEqual(other.status_code, 201)
+        self.assertEqual(ReportJob.objects.count(), 2)
+
+    def test_invalid_params_fail_the_job(self):
+        job_id = self._submit({'start_date': 'not-a-date'}).data['id']
+        call_command('process_report_jobs', once=True, stdout=StringIO())
+        job = ReportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, ReportJob.STATUS_FAILED)
+        self.assertIn('Invalid date format', job.error)
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from requests.exceptions import ConnectionError
+from assets_ms.services import ticket_snapshot
+from assets_ms.services.integration_ticket_tracking import get_ticket_by_number
+
+TICKETS = [
+    {'id': 1, 'ticket_number': 'TX1', 'asset': 'AST-1', 'is_resolved': False},
+    {'id': 2, 'ticket_number': 'TX2', 'asset': 'AST-1', 'is_resolved': True},
+    {'id': 3, 'ticket_number': 'TX3', 'asset': 'AST-2', 'is_resolved': False},
+]
+
+
+@patch('assets_ms.services.ticket_snapshot.fetch_all_tickets')
+class TicketSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_lookups_share_one_list_call(self, fetch):
+        fetch.return_value = (TICKETS, '"v1"', None)
+        self.assertEqual(ticket_snapshot.unresolved_ticket_map(), {'AST-1': TICKETS[0], 'AST-2': TICKETS[2]})
+        self.assertEqual(ticket_snapshot.tickets_for_asset('AST-1'), [TICKETS[0]])
+        self.assertEqual(ticket_snapshot.find_ticket_by_id(3), TICKETS[2])
+        self.assertEqual(get_ticket_by_number('TX2'), TICKETS[1])
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_stale_snapshot_refreshes_conditionally(self, fetch):
+        fetch.return_value = (TICKETS, '"v1"', None)
+        ticket_snapshot.get_ticket_snapshot()
+        ticket_snapshot.mark_ticket_snapshot_stale()
+
+        fetch.return_value = (None, '"v1"', None)  # 304 Not Modified
+        self.assertEqual(ticket_snapshot.find_ticket_by_id(1), TICKETS[0])
+        self.assertEqual(fetch.call_args.kwargs['etag'], '"v1"')
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_failed_refresh_keeps_last_snapshot(self, fetch):
+        fetch.return_value = (TICKETS, None, None)
+        ticket_snapshot.get_ticket_snapshot()
+        ticket_snapshot.mark_ticket_snapshot_stale()
+
+        fetch.side_effect = ConnectionError()
+        self.assertEqual(ticket_snapshot.find_ticket_by_id(1), TICKETS[0])
+
+    def test_unreachable_service_is_reported(self, fetch):
+        fetch.side_effect = ConnectionError()
+        self.assertEqual(get_ticket_by_number('TX1'), {"warning": "External ticket service unreachable."})
+        self.assertEqual(ticket_snapshot.unresolved_ticket_map(), {})
@@ -0,0 +1,46 @@
+from unittest.mock import MagicMock, patch
+from django.test import SimpleTestCase
+from requests.exceptions import ConnectionError
+from assets_ms.services.user_directory import UserDirectory
+
+
+def _response(data, status_code=200):
+    resp = MagicMock(status_code=status_code)
+    resp.json.return_value = data
+    return resp
+
+
+class UserDirectoryTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = UserDirectory(ttl=60, full_sync_interval=3600)
+
+    @patch('assets_ms.services.user_directory.client_get')
+    def test_delta_refresh_applies_changes_and_deactivations(self, client_get):
+        client_get.return_value = _response({
+            'server_time': '2026-10-18T10:00:00+00:00',
+            'users': [{'id': 1, 'full_name': 'Ada'}, {'id': 2, 'full_name': 'Grace'}],
+        })
+        self.assertEqual(self.directory.get_user(1)['full_name'], 'Ada')
+        self.assertIsNone(client_get.call_args.kwargs['params'])
+
+        # Within the TTL lookups never hit the service
+        self.directory.get_users([1, 2])
+        self.assertEqual(client_get.call_count, 1)
+
+        client_get.return_value = _response({
+            'server_time': '2026-10-18T10:01:00+00:00',
+            'users': [{'id': 1, 'full_name': 'Ada L.', 'is_active': True}, {'id': 2, 'is_active': False}],
+        })
+        self.directory.refresh()
+        self.assertEqual(client_get.call_args.kwargs['params'], {'since': '2026-10-18T09:59:55+00:00'})
+        self.assertEqual(self.directory.get_users([1, 2, 3]), {1: {'id': 1, 'full_name': 'Ada L.', 'is_active': True}})
+
+    @patch('assets_ms.services.user_directory.client_get')
+    def test_falls_back_to_full_list_and_keeps_copy_on_failure(self, client_get):
+        client_get.side_effect = [_response({}, status_code=404), _response([{'id': 5, 'full_name': 'Linus'}])]
+        self.assertEqual(self.directory.all_users(), [{'id': 5, 'full_name': 'Linus'}])
+        self.assertTrue(client_get.call_args.args[0].endswith('/users/get_all_users/'))
+
+        client_get.side_effect = ConnectionError()
+        self.directory.refresh()
+        self.assertEqual(self.directory.get_user(5)['full_name'], 'Linus')
@@ -5,7 +5,9 @@ from .api.contexts import *
 from .views import *
 from .api.reports import DepreciationReportAPIView, AssetReportAPIView, ActivityReportAPIView, ActivityReportSummaryAPIView, EoLWarrantyReportAPIView, UpcomingEoLReportAPIView
 from .api.reports import DepreciationReportAPIView, AssetReportAPIView, ActivityReportAPIView, ActivityReportSummaryAPIView, EoLWarrantyReportAPIView, UpcomingEoLReportAPIView, ReachedEoLReportAPIView, ExpiredWarrantyReportAPIView, ExpiringWarrantyReportAPIView
+from .api.report_jobs import ReportJobCreateAPIView, ReportJobDetailAPIView, ReportJobDownloadAPIView
 from .api.notifications import NotificationsAPIView
+from .api.health import UpstreamHealthAPIView
 
 router = DefaultRouter()
 router.register('products', ProductViewSet, basename='categories')
@@ -60,9 +62,17 @@ urlpatterns = [
     path("reports/reached-eol/", ReachedEoLReportAPIView.as_view(), name="reached-eol-report"),
     path("reports/upcoming-eol/", UpcomingEoLReportAPIView.as_view(), name="upcoming-eol-report"),
 
+    # Background report jobs for large exports
+    path("reports/jobs/", ReportJobCreateAPIView.as_view(), name="report-job-create"),
+    path("reports/jobs/<int:pk>/", ReportJobDetailAPIView.as_view(), name="report-job-detail"),
+    path("reports/jobs/<int:pk>/download/", ReportJobDownloadAPIView.as_view(), name="report-job-download"),
+
     # Notifications endpoint
     path("notifications/", NotificationsAPIView.as_view(), name="notifications"),
 
+    # Circuit breaker state of the upstream services
+    path("health/upstreams/", UpstreamHealthAPIView.as_view(), name="upstream-health"),
+
     path("", include(router.urls)),
     path("api/contexts/check-usage/supplier/<int:pk>/", check_supplier_usage, name="api-check-supplier-usage"),
     path("api/contexts/check-usage/depreciation/<int:pk>/", check_depreciation_usage, name="api-check-depreciation-usage"),
@@ -5,9 +5,6 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils.timezone import now, localdate
-from datetime import timedelta
-from django.db.models import Sum, Value, F, Count, DecimalField
-from django.db.models.functions import Coalesce
 from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -26,6 +23,24 @@ from assets_ms.services.activity_logger import (
     log_repair_activity,
 )
 from assets_ms.services.due_checkin_report import get_due_checkin_report, get_due_checkin_count
+from assets_ms.services.product_stock import annotate_stock_counts, get_stock_status_ids
+from assets_ms.services.cache_keys import bump_generation, versioned_key
+from assets_ms.services.dashboard import compute_dashboard_metrics, get_dashboard_metrics
+from assets_ms.services.component_stock import annotate_active_component_checkout
+from assets_ms.services.context_maps import context_map_registry
+from assets_ms.services.fanout import Call
+from assets_ms.services.asset_delete import bulk_soft_delete
+from assets_ms.services.bulk_edit import apply_bulk_edit
+from assets_ms.services.ticket_snapshot import mark_ticket_snapshot_stale, tickets_for_asset, unresolved_ticket_map
+from assets_ms.services.user_directory import user_directory
+from assets_ms.services.asset_list import (
+    annotate_active_checkout,
+    wants_paginated_list,
+    filter_assets,
+    get_page_cache_key,
+    LIST_PAGE_CACHE_TTL,
+)
+from assets_ms.pagination import ActivityLogCursorPagination, AssetCursorPagination
 
 logger = logging.getLogger(__name__)
 
@@ -75,64 +90,28 @@ class ProductViewSet(viewsets.ModelViewSet):
     
     # Build context maps for serializers
     def _build_context_maps(self):
-        """Return fresh maps without caching."""
-        category_map = {}
-        categories = get_category_names()
-        if isinstance(categories, list):
-            category_map = {c['id']: c for c in categories}
-
-        manufacturer_map = {}
-        manufacturers = get_manufacturer_names()
-        if isinstance(manufacturers, list):
-            manufacturer_map = {m['id']: m for m in manufacturers}
-
-        supplier_map = {}
-        suppliers = get_supplier_names()
-        if isinstance(suppliers, list):
-            supplier_map = {s['id']: s for s in suppliers}
-
-        depreciation_map = {}
-        depreciations = get_depreciation_names()
-        if isinstance(depreciations, list):
-            depreciation_map = {d['id']: d for d in depreciations}
-
+        """Return id -> item maps from the shared context map registry."""
+        maps = context_map_registry.get_many(['categories', 'manufacturers', 'suppliers', 'depreciations'])
         return {
-            "category_map": category_map,
-            "manufacturer_map": manufacturer_map,
-            "supplier_map": supplier_map,
-            "depreciation_map": depreciation_map,
+            "category_map": maps['categories'],
+            "manufacturer_map": maps['manufacturers'],
+            "supplier_map": maps['suppliers'],
+            "depreciation_map": maps['depreciations'],
         }
     
     def _build_asset_context_maps(self):
         """Build context maps needed for nested AssetListSerializer in ProductInstanceSerializer."""
-        # statuses
-        # statuses - always fresh
-        statuses = get_status_names_assets()
-        status_map = {s['id']: s for s in statuses} if isinstance(statuses, list) else {}
-
         # products (for product_details - though in product view we already know the product)
-        product_map = cache.get("products:map")
-        if not product_map:
-            products = Product.objects.filter(is_deleted=False)
-            product_map = {p.id: p.name for p in products}
-            cache.set("products:map", product_map, 300)
-
-        # tickets (no caching - always fetch fresh from external service)
-        try:
-            tickets_response = get_tickets_list()
-            if isinstance(tickets_response, list):
-                ticket_map = {t["asset"]: t for t in tickets_response if t.get("asset")}
-            else:
-                ticket_map = {}  # fallback if external API fails
-        except Exception as e:
-            logger.error(f"Error fetching ticket details: {e}")
-            ticket_map = {}  # fail-soft
-
+        # tickets (unresolved, from the ticket snapshot) are fetched alongside missing maps
+        maps = context_map_registry.get_many(
+            ['statuses:asset', 'products:names'],
+            extra={'tickets': Call(unresolved_ticket_map, default={})},
+        )
 
         return {
-            "status_map": status_map,
-            "product_map": product_map,
-            "ticket_map": ticket_map,
+            "status_map": maps['statuses:asset'],
+            "product_map": maps['products:names'],
+            "ticket_map": maps['tickets'],
         }
 
     # Helper function for cached responses
@@ -148,11 +127,12 @@ class ProductViewSet(viewsets.ModelViewSet):
     
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        available_ids, deployed_ids = get_stock_status_ids()
+        queryset = annotate_stock_counts(self.get_queryset(), available_ids, deployed_ids)
 
         context_maps = self._build_context_maps()
         return self.cached_response(
-            "products:list",
+            versioned_key("products", "list"),
             queryset,
             self.get_serializer_class(),
             many=True,
@@ -163,7 +143,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         context_maps = self._build_context_maps()
         asset_context_maps = self._build_asset_context_maps()
-        cache_key = f"products:detail:{instance.id}"
+        cache_key = versioned_key("products", f"detail:{instance.id}")
         return self.cached_response(
             cache_key,
             instance,
@@ -172,10 +152,9 @@ class ProductViewSet(viewsets.ModelViewSet):
             context={**context_maps, **asset_context_maps, 'request': request}
         )
 
-    def invalidate_product_cache(self, product_id):
-        cache.delete("products:list")
-        cache.delete("products:asset-registration")
-        cache.delete(f"products:detail:{product_id}")
+    def invalidate_product_cache(self, product_id=None):
+        # Drops list, detail, asset-registration and map entries for every worker
+        bump_generation("products")
 
     def perform_destroy(self, instance):
         # Check for referencing assets that are not deleted
@@ -260,7 +239,6 @@ class ProductViewSet(viewsets.ModelViewSet):
         Only non-empty fields will be updated.
         """
         import json
-        from django.core.files.base import ContentFile
 
         # Handle both JSON and FormData
         if request.content_type and 'multipart/form-data' in request.content_type:
@@ -312,48 +290,18 @@ class ProductViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        products = Product.objects.filter(id__in=ids, is_deleted=False)
-
-        updated, failed = [], []
-
-        # Check if name is being updated for multiple products
-        base_name = safe_data.get("name")
-        has_name_update = base_name is not None and len(ids) > 1
-
-        for index, product in enumerate(products):
-            # Create product-specific data with unique name suffix if needed
-            product_data = safe_data.copy()
-            if has_name_update:
-                product_data["name"] = f"{base_name} ({index + 1})"
-
-            serializer = ProductSerializer(
-                product,
-                data=product_data,
-                partial=True  # important so blank fields won’t cause validation errors
-            )
-
-            if serializer.is_valid():
-                instance = serializer.save()
-
-                # Handle image update
-                if image_content:
-                    # Create a new ContentFile for each product from the stored bytes
-                    instance.image.save(image_name, ContentFile(image_content), save=True)
-                elif remove_image and instance.image:
-                    instance.image.delete(save=False)
-                    instance.image = None
-                    instance.save()
+        result = apply_bulk_edit(
+            Product.objects.filter(id__in=ids, is_deleted=False),
+            ProductSerializer,
+            safe_data,
+            name_error="An asset model with this name already exists.",
+            image_content=image_content,
+            image_name=image_name,
+            remove_image=remove_image,
+        )
+        updated, failed = result["updated"], result["failed"]
 
-                updated.append(product.id)
-                cache.delete(f"products:detail:{product.id}")
-            else:
-                failed.append({
-                    "id": product.id,
-                    "errors": serializer.errors
-                })
-        
-        cache.delete("products:list")
-        cache.delete("products:asset-registration")
+        self.invalidate_product_cache()
 
         return Response({
             "updated": updated,
@@ -387,10 +335,9 @@ class ProductViewSet(viewsets.ModelViewSet):
         for product in products:
             product.is_deleted = True
             product.save()
-            self.invalidate_product_cache(product.id)
             deleted_count += 1
 
-        cache.delete("products:list")
+        self.invalidate_product_cache()
 
         return Response(
             {"detail": f"Successfully deleted {deleted_count} product(s)."},
@@ -401,7 +348,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     def asset_registration(self, request):
         queryset = self.get_queryset()
         return self.cached_response(
-            "products:asset-registration",
+            versioned_key("products", "asset-registration"),
             queryset,
             self.get_serializer_class(),
             many=True,
@@ -415,7 +362,8 @@ class AssetViewSet(viewsets.ModelViewSet):
         # Optional: allow query param ?show_deleted=true
         if self.request.query_params.get('show_deleted') == 'true':
             queryset = Asset.objects.filter(is_deleted=True).order_by('name')
-        return queryset
+        # Supply active_checkout through a subquery instead of one query per row
+        return annotate_active_checkout(queryset)
     
     def get_serializer_class(self):
         # 1. Assets Table (list)
@@ -427,45 +375,18 @@ class AssetViewSet(viewsets.ModelViewSet):
         return AssetSerializer
     
     def _build_asset_context_maps(self):
-        # statuses
-        statuses = get_status_names_assets()
-        # Handle warning dict or non-list response
-        if isinstance(statuses, list):
-            status_map = {s['id']: s for s in statuses}
-        else:
-            status_map = {}
-
-        # products
-        product_map = cache.get("products:map")
-        if not product_map:
-            products = Product.objects.filter(is_deleted=False)
-            serialized = ProductNameSerializer(products, many=True).data
-            product_map = {p['id']: p for p in serialized}
-            cache.set("products:map", product_map, 300)
-
-        # locations (from Help Desk service via contexts proxy)
-        locations = get_locations_list()
-        if isinstance(locations, list):
-            location_map = {l['id']: l for l in locations}
-        else:
-            location_map = {}
-
-        # tickets (unresolved) - no caching, always fetch fresh from external service
-        try:
-            tickets_response = get_tickets_list()
-            if isinstance(tickets_response, list):
-                ticket_map = {t["asset"]: t for t in tickets_response if t.get("asset")}
-            else:
-                ticket_map = {}  # fallback if external API fails
-        except Exception as e:
-            logger.error(f"Error fetching ticket details: {e}")
-            ticket_map = {}  # fail-soft
+        # statuses (contexts service), locations (Help Desk service via contexts proxy) and
+        # unresolved tickets (ticket snapshot) are independent upstream calls, fetched concurrently
+        maps = context_map_registry.get_many(
+            ['statuses:asset', 'products:details', 'locations'],
+            extra={'tickets': Call(unresolved_ticket_map, default={})},
+        )
 
         return {
-            "status_map": status_map,
-            "product_map": product_map,
-            "location_map": location_map,
-            "ticket_map": ticket_map,
+            "status_map": maps['statuses:asset'],
+            "product_map": maps['products:details'],
+            "location_map": maps['locations'],
+            "ticket_map": maps['tickets'],
         }
     
     # Helper function for cached responses
@@ -480,13 +401,17 @@ class AssetViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     def list(self, request, *args, **kwargs):
+        # Cursor-paginated, filterable mode: ?cursor=&page_size=&ordering=&status=&product=...
+        if wants_paginated_list(request.query_params):
+            return self.paginated_list(request)
+
         queryset = self.get_queryset()
 
         context_maps = self._build_asset_context_maps()
 
-        cache_key = "assets:list"
+        cache_key = versioned_key("assets", "list")
         if request.query_params.get("show_deleted") == "true":
-            cache_key += ":show_deleted"
+            cache_key = versioned_key("assets", "list:show_deleted")
 
         return self.cached_response(
             cache_key,
@@ -496,12 +421,38 @@ class AssetViewSet(viewsets.ModelViewSet):
             context={**context_maps, 'request': request}
         )
 
+    def paginated_list(self, request):
+        """
+        Return one page of the assets table using keyset pagination.
+        Each page is cached on its own under a generation-versioned key,
+        so writes invalidate all pages without enumerating them.
+        """
+        cache_key = get_page_cache_key(request.query_params)
+        cached = cache.get(cache_key)
+        if cached:
+            return Response(cached)
+
+        try:
+            queryset = filter_assets(self.get_queryset(), request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = AssetCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+
+        context_maps = self._build_asset_context_maps()
+        serializer = self.get_serializer_class()(
+            page, many=True, context={**context_maps, 'request': request}
+        )
+        data = paginator.get_paginated_response(serializer.data).data
+        cache.set(cache_key, data, LIST_PAGE_CACHE_TTL)
+        return Response(data)
     
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
 
         context_maps = self._build_asset_context_maps()
-        cache_key = f"assets:detail:{instance.id}"
+        cache_key = versioned_key("assets", f"detail:{instance.id}")
         return self.cached_response(
             cache_key,
             instance,
@@ -510,11 +461,11 @@ class AssetViewSet(viewsets.ModelViewSet):
             context={**context_maps, 'request': request}
         )
     
-    def invalidate_asset_cache(self, asset_id):
-        cache.delete("assets:list")
-        cache.delete("assets:list:show_deleted")
-        cache.delete(f"assets:detail:{asset_id}")
-        # Note: tickets are not cached anymore - always fetched fresh from external service
+    def invalidate_asset_cache(self, asset_id=None):
+        # Drops list pages, details and maps of every asset for every worker
+        bump_generation("assets")
+        # Products table and product view embed asset counts and asset rows
+        bump_generation("products")
 
     @action(detail=True, methods=['post'], url_path='invalidate-cache')
     def invalidate_cache(self, request, pk=None):
@@ -523,6 +474,8 @@ class AssetViewSet(viewsets.ModelViewSet):
         Called by other services (e.g., Tickets) when related data changes.
         """
         self.invalidate_asset_cache(pk)
+        # The ticket service calls this after ticket changes, so refetch tickets on the next lookup
+        mark_ticket_snapshot_stale()
         return Response({"status": "cache invalidated", "asset_id": pk})
 
     def perform_destroy(self, instance):
@@ -546,12 +499,10 @@ class AssetViewSet(viewsets.ModelViewSet):
             errors.append(f"This asset has {pending_audits.count()} pending audit schedule(s) that have not been performed yet. Please complete all audits before deleting this asset.")
 
         # Check for tickets referencing this asset
-        tickets_response = get_tickets_list()
-        if isinstance(tickets_response, list):
-            referencing_tickets = [t for t in tickets_response if t.get("asset") == instance.id]
-            if referencing_tickets:
-                ticket_ids = ', '.join([str(t.get('id')) for t in referencing_tickets])
-                errors.append(f"This asset has {len(referencing_tickets)} ticket(s) referencing it (IDs: {ticket_ids}). Please resolve or reassign these tickets before deleting this asset.")
+        referencing_tickets = tickets_for_asset(instance.id)
+        if referencing_tickets:
+            ticket_ids = ', '.join([str(t.get('id')) for t in referencing_tickets])
+            errors.append(f"This asset has {len(referencing_tickets)} ticket(s) referencing it (IDs: {ticket_ids}). Please resolve or reassign these tickets before deleting this asset.")
 
         # If any blocking relationships exist, raise error
         if errors:
@@ -654,9 +605,7 @@ class AssetViewSet(viewsets.ModelViewSet):
             asset = Asset.objects.get(pk=pk, is_deleted=True)
             asset.is_deleted = False
             asset.save()
-            cache.delete("assets:list")
-            cache.delete("assets:list:show_deleted")
-            cache.delete(f"assets:detail:{asset.id}")
+            self.invalidate_asset_cache(asset.id)
             serializer = self.get_serializer(asset)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Asset.DoesNotExist:
@@ -807,13 +756,10 @@ class AssetViewSet(viewsets.ModelViewSet):
         queryset = self.get_queryset()
 
         # Fetch all asset statuses for status_map (avoids N+1 queries)
-        statuses = get_status_names_assets()
-        status_map = {}
-        if isinstance(statuses, list):
-            status_map = {
-                s['id']: {'id': s['id'], 'name': s['name'], 'type': s.get('type')}
-                for s in statuses
-            }
+        status_map = {
+            s['id']: {'id': s['id'], 'name': s['name'], 'type': s.get('type')}
+            for s in context_map_registry.get('statuses:asset').values()
+        }
 
         # Filter by IDs if provided
         if ids_param:
@@ -873,7 +819,6 @@ class AssetViewSet(viewsets.ModelViewSet):
         Only non-empty fields will be updated.
         """
         import json
-        from django.core.files.base import ContentFile
 
         # Handle both JSON and FormData
         if request.content_type and 'multipart/form-data' in request.content_type:
@@ -923,47 +868,18 @@ class AssetViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        assets = Asset.objects.filter(id__in=ids, is_deleted=False)
-        updated, failed = [], []
-
-        # Check if name is being updated for multiple assets
-        base_name = safe_data.get("name")
-        has_name_update = base_name is not None and len(ids) > 1
-
-        # Process each asset
-        for index, asset in enumerate(assets):
-            # Create asset-specific data with unique name suffix if needed
-            asset_data = safe_data.copy()
-            if has_name_update:
-                asset_data["name"] = f"{base_name} ({index + 1})"
-
-            serializer = AssetSerializer(
-                asset,
-                data=asset_data,
-                partial=True
-            )
-
-            if serializer.is_valid():
-                instance = serializer.save()
-
-                # Handle image update
-                if image_content:
-                    instance.image.save(image_name, ContentFile(image_content), save=True)
-                elif remove_image and instance.image:
-                    instance.image.delete(save=False)
-                    instance.image = None
-                    instance.save()
-
-                updated.append(asset.id)
-                cache.delete(f"assets:detail:{asset.id}")
-            else:
-                failed.append({
-                    "id": asset.id,
-                    "errors": serializer.errors
-                })
+        result = apply_bulk_edit(
+            Asset.objects.filter(id__in=ids, is_deleted=False),
+            AssetSerializer,
+            safe_data,
+            name_error="An asset with this name already exists.",
+            image_content=image_content,
+            image_name=image_name,
+            remove_image=remove_image,
+        )
+        updated, failed = result["updated"], result["failed"]
 
-        cache.delete("assets:list")
-        cache.delete("assets:list:show_deleted")
+        self.invalidate_asset_cache()
 
         return Response({
             "updated": updated,
@@ -981,57 +897,20 @@ class AssetViewSet(viewsets.ModelViewSet):
         if not ids:
             return Response({"detail": "No IDs provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-        assets = Asset.objects.filter(id__in=ids, is_deleted=False)
-
-        # Check for assets with active checkouts first
-        for asset in assets:
-            # Check for active asset checkouts (no checkin yet)
-            if asset.asset_checkouts.filter(asset_checkin__isnull=True).exists():
-                return Response(
-                    {"detail": f"Cannot delete asset '{asset.asset_id}', it's currently checked out."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Check for active component checkouts (not fully returned)
-            active_component_checkouts = asset.checkout_to.filter(is_deleted=False).exclude(
-                component_checkins__quantity__gte=models.F('quantity')
-            ).distinct()
-            if active_component_checkouts.exists():
-                component_names = ', '.join([cc.component.name for cc in active_component_checkouts])
-                return Response(
-                    {"detail": f"Cannot delete asset '{asset.asset_id}', it has components checked out that are not fully returned: {component_names}."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Check for pending audit schedules (audit schedules without corresponding audits)
-            pending_audits = asset.audit_schedules.filter(is_deleted=False, audit__isnull=True)
-            if pending_audits.exists():
-                return Response(
-                    {"detail": f"Cannot delete asset '{asset.asset_id}', it has {pending_audits.count()} pending audit schedule(s) that have not been performed yet."},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Check for tickets referencing this asset
-            tickets_response = get_tickets_list()
-            if isinstance(tickets_response, list):
-                referencing_tickets = [t for t in tickets_response if t.get("asset") == asset.id]
-                if referencing_tickets:
-                    ticket_ids = ', '.join([str(t.get('id')) for t in referencing_tickets])
-                    return Response(
-                        {"detail": f"Cannot delete asset '{asset.asset_id}', it has {len(referencing_tickets)} ticket(s) referencing it (IDs: {ticket_ids})."},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-        # Perform soft delete
-        deleted_count = 0
-        for asset in assets:
-            asset.is_deleted = True
-            asset.save()
-            self.invalidate_asset_cache(asset.id)
-            deleted_count += 1
+        # All preconditions are checked for the whole id set at once; nothing is deleted if any asset is blocked
+        result = bulk_soft_delete(ids)
+        if result["blocked"]:
+            blocked = [
+                {"id": asset_pk, "reasons": reasons}
+                for asset_pk, reasons in sorted(result["blocked"].items())
+            ]
+            return Response(
+                {"detail": blocked[0]["reasons"][0], "blocked": blocked},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        cache.delete("assets:list")
-        cache.delete("assets:list:show_deleted")
+        deleted_count = result["deleted"]
+        self.invalidate_asset_cache()
 
         return Response(
             {"detail": f"Successfully deleted {deleted_count} asset(s)."},
@@ -1172,8 +1051,9 @@ class AssetCheckoutViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Invalidate cache
-        cache.delete(f"assets:detail:{asset.id}")
+        # Invalidate cache (lists show the active checkout too)
+        bump_generation("assets")
+        bump_generation("products")
 
         # Log activity
         try:
@@ -1293,8 +1173,9 @@ class AssetCheckinViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Invalidate cache
-        cache.delete(f"assets:detail:{asset.id}")
+        # Invalidate cache (lists show the active checkout too)
+        bump_generation("assets")
+        bump_generation("products")
 
         # Resolve ticket (optional, outside transaction)
         ticket_number = request.data.get("ticket_number")
@@ -1358,57 +1239,17 @@ class ComponentViewSet(viewsets.ModelViewSet):
 
     def _build_context_maps(self, components=None):
         """Build context maps for categories, manufacturers, suppliers, locations."""
-        # categories
-        category_map = cache.get("categories:map")
-        if not category_map:
-            categories = get_category_names()
-            if isinstance(categories, list):
-                category_map = {c['id']: c for c in categories}
-            else:
-                category_map = {}
-            cache.set("categories:map", category_map, 300)
-
-        # manufacturers
-        manufacturer_map = cache.get("manufacturers:map")
-        if not manufacturer_map:
-            manufacturers = get_manufacturer_names()
-            if isinstance(manufacturers, list):
-                manufacturer_map = {m['id']: m for m in manufacturers}
-            else:
-                manufacturer_map = {}
-            cache.set("manufacturers:map", manufacturer_map, 300)
-
-        # suppliers
-        supplier_map = cache.get("suppliers:map")
-        if not supplier_map:
-            suppliers = get_supplier_names()
-            if isinstance(suppliers, list):
-                supplier_map = {s['id']: s for s in suppliers}
-            else:
-                supplier_map = {}
-            cache.set("suppliers:map", supplier_map, 300)
-
-        # locations (from Help Desk service via contexts proxy)
-        location_map = cache.get("helpdesk:locations:map")
-        if not location_map:
-            locations = get_locations_list()
-            if isinstance(locations, list):
-                location_map = {loc['id']: loc for loc in locations}
-            elif isinstance(locations, dict) and 'results' in locations:
-                location_map = {loc['id']: loc for loc in locations['results']}
-            else:
-                location_map = {}
-            cache.set("helpdesk:locations:map", location_map, 300)
-
+        # locations come from the Help Desk service via the contexts proxy
+        maps = context_map_registry.get_many(['categories', 'manufacturers', 'suppliers', 'locations'])
         return {
-            'category_map': category_map,
-            'manufacturer_map': manufacturer_map,
-            'supplier_map': supplier_map,
-            'location_map': location_map,
+            'category_map': maps['categories'],
+            'manufacturer_map': maps['manufacturers'],
+            'supplier_map': maps['suppliers'],
+            'location_map': maps['locations'],
         }
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset = annotate_active_component_checkout(self.get_queryset())
         context_maps = self._build_context_maps()
         serializer = self.get_serializer(queryset, many=True, context=context_maps)
         return Response(serializer.data)
@@ -1571,8 +1412,6 @@ class ComponentViewSet(viewsets.ModelViewSet):
         Or FormData with 'ids' (JSON string), 'data' (JSON string), and optional 'image' file.
         Only non-empty fields will be updated.
         """
-        from django.core.files.base import ContentFile
-
         # Handle both JSON and FormData
         if request.content_type and 'multipart/form-data' in request.content_type:
             ids_raw = request.data.get("ids", "[]")
@@ -1622,49 +1461,25 @@ class ComponentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        components = Component.objects.filter(id__in=ids, is_deleted=False)
-        updated, failed = [], []
-
-        # Check if name is being updated for multiple components
-        base_name = safe_data.get("name")
-        has_name_update = base_name is not None and len(ids) > 1
-
-        for index, component in enumerate(components):
-            # Create component-specific data with unique name suffix if needed
-            component_data = safe_data.copy()
-            if has_name_update:
-                component_data["name"] = f"{base_name} ({index + 1})"
-
-            serializer = ComponentSerializer(
-                component,
-                data=component_data,
-                partial=True
-            )
-
-            if serializer.is_valid():
-                instance = serializer.save()
-
-                # Handle image update
-                if image_content:
-                    instance.image.save(image_name, ContentFile(image_content), save=True)
-                elif remove_image and instance.image:
-                    instance.image.delete(save=False)
-                    instance.image = None
-                    instance.save()
-
-                updated.append(component.id)
+        result = apply_bulk_edit(
+            Component.objects.filter(id__in=ids, is_deleted=False),
+            ComponentSerializer,
+            safe_data,
+            name_error="A component with this name already exists.",
+            lowercase_clone=False,
+            image_content=image_content,
+            image_name=image_name,
+            remove_image=remove_image,
+        )
+        updated, failed = result["updated"], result["failed"]
 
-                # Log activity
-                log_component_activity(
-                    action='Update',
-                    component=instance,
-                    notes=f"Component '{instance.name}' updated (bulk)"
-                )
-            else:
-                failed.append({
-                    "id": component.id,
-                    "errors": serializer.errors
-                })
+        # Log activity
+        for instance in result["instances"]:
+            log_component_activity(
+                action='Update',
+                component=instance,
+                notes=f"Component '{instance.name}' updated (bulk)"
+            )
 
         return Response({
             "updated": updated,
@@ -1796,13 +1611,7 @@ class AuditScheduleViewSet(viewsets.ModelViewSet):
 
     def _build_audit_schedule_context(self):
         """Build context maps for audit schedule serializers."""
-        # Asset map
-        asset_map = cache.get("assets:name:map")
-        if not asset_map:
-            assets = Asset.objects.filter(is_deleted=False).values('id', 'asset_id', 'name', 'image')
-            asset_map = {a['id']: {'id': a['id'], 'asset_id': a['asset_id'], 'name': a['name'], 'image': a['image']} for a in assets}
-            cache.set("assets:name:map", asset_map, 300)
-        return {"asset_map": asset_map}
+        return {"asset_map": context_map_registry.get('assets:summaries')}
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
@@ -1961,15 +1770,16 @@ class AuditViewSet(viewsets.ModelViewSet):
         # Location map (from contexts service)
         location_map = {}
         if location_ids:
-            locations = get_locations_names()
-            if isinstance(locations, list):
-                location_map = {loc['id']: {'id': loc['id'], 'name': loc.get('city', loc.get('name', ''))} for loc in locations if loc['id'] in location_ids}
+            locations = context_map_registry.get('locations')
+            location_map = {
+                loc_id: {'id': loc_id, 'name': locations[loc_id].get('city', locations[loc_id].get('name', ''))}
+                for loc_id in location_ids if loc_id in locations
+            }
 
         # User map (from auth service)
         user_map = {}
         if user_ids:
-            users = get_user_names()
-            user_map = {u['id']: u for u in users if u['id'] in user_ids}
+            user_map = user_directory.get_users(user_ids)
 
         return {
             "asset_map": asset_map,
@@ -2058,38 +1868,12 @@ class RepairViewSet(viewsets.ModelViewSet):
         return RepairSerializer
 
     def _build_repair_context_maps(self):
-        # assets
-        asset_map = cache.get("assets:map")
-        if not asset_map:
-            assets = Asset.objects.filter(is_deleted=False)
-            serialized = AssetNameSerializer(assets, many=True).data
-            asset_map = {a['id']: a for a in serialized}
-            cache.set("assets:map", asset_map, 300)
-
-        # suppliers
-        supplier_map = cache.get("suppliers:map")
-        if not supplier_map:
-            suppliers = get_supplier_names()
-            if isinstance(suppliers, list):
-                supplier_map = {s['id']: s for s in suppliers}
-            else:
-                supplier_map = {}
-            cache.set("suppliers:map", supplier_map, 300)
-
         # statuses (repair category only)
-        status_map = cache.get("statuses:repair:map")
-        if not status_map:
-            statuses = get_status_names_repairs()
-            if isinstance(statuses, list):
-                status_map = {s['id']: s for s in statuses}
-            else:
-                status_map = {}
-            cache.set("statuses:repair:map", status_map, 300)
-
+        maps = context_map_registry.get_many(['assets:details', 'suppliers', 'statuses:repair'])
         return {
-            "asset_map": asset_map,
-            "supplier_map": supplier_map,
-            "status_map": status_map,
+            "asset_map": maps['assets:details'],
+            "supplier_map": maps['suppliers'],
+            "status_map": maps['statuses:repair'],
         }
 
    # Helper function for cached responses
@@ -2271,168 +2055,23 @@ class DashboardViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['get'])
     def metrics(self, request):
         """
-        Get dashboard metrics with minimal caching to balance performance and freshness.
-        Results are cached for 10 seconds to prevent duplicate requests while maintaining near real-time data.
+        Get dashboard metrics from the materialized snapshot.
+        Sections touched by writes since the last read are recomputed; the rest is a single lookup.
+
+        Query params:
+        - as_of: YYYY-MM-DD date to compute the 30-day windows from (default: today, served from the snapshot)
         """
-        from django.core.cache import cache
-        
-        # Check cache first - short 10 second TTL for near real-time data
-        cache_key = "dashboard:metrics"
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            serializer = DashboardStatsSerializer(cached_data)
-            return Response(serializer.data)
-        
+        as_of_param = request.query_params.get('as_of')
         try:
-            today = now().date()
-            next_30_days = today + timedelta(days=30)
-
-            # Assets due for return - only count checkouts that haven't been checked in yet
-            # Due for return: return date is in the future (today or later) within next 30 days
-            due_for_return = AssetCheckout.objects.filter(
-                return_date__gte=today,
-                return_date__lte=next_30_days,
-                asset_checkin__isnull=True
-            ).count()
-            # Overdue for return: return date is in the past
-            overdue_for_return = AssetCheckout.objects.filter(
-                return_date__lt=today,
-                asset_checkin__isnull=True
-            ).count()
-
-            # Audits - due (today and future), upcoming (next 30 days), overdue, and completed
-            try:
-                # Only consider audit schedules that are not deleted and not yet audited
-                base_schedule_qs = AuditSchedule.objects.filter(
-                    is_deleted=False,
-                    audit__isnull=True
-                )
-
-                # Audits due to be audited: all pending audits from today onwards
-                due_audits = base_schedule_qs.filter(
-                    date__gte=today,
-                ).count()
-
-                # Upcoming audits within the next 30 days
-                upcoming_audits = base_schedule_qs.filter(
-                    date__gt=today,
-                    date__lte=next_30_days,
-                ).count()
-
-                # Overdue audits (past due date, not yet completed)
-                overdue_audits = base_schedule_qs.filter(
-                    date__lt=today,
-                ).count()
-
-                # Completed audits (audit records not soft-deleted)
-                completed_audits = Audit.objects.filter(is_deleted=False).count()
-            except Exception:
-                due_audits = 0
-                upcoming_audits = 0
-                overdue_audits = 0
-                completed_audits = 0
-
-            # End of life - products with end_of_life date
-            try:
-                reached_end_of_life = Product.objects.filter(
-                    end_of_life__lte=today,
-                    is_deleted=False
-                ).count()
-                upcoming_end_of_life = Product.objects.filter(
-                    end_of_life__gt=today,
-                    end_of_life__lte=next_30_days,
-                    is_deleted=False
-                ).count()
-            except Exception:
-                reached_end_of_life = 0
-                upcoming_end_of_life = 0
-
-            # Warranties
-            expired_warranties = Asset.objects.filter(
-                warranty_expiration__lte=today,
-                is_deleted=False
-            ).count()
-            expiring_warranties = Asset.objects.filter(
-                warranty_expiration__gt=today,
-                warranty_expiration__lte=next_30_days,
-                is_deleted=False
-            ).count()
-
-            # Low stock - optimized query
-            low_stock = Component.objects.filter(
-                is_deleted=False,
-                minimum_quantity__gt=0  # Only check components with minimum set
-            ).annotate(
-                total_checked_out=Coalesce(Sum('component_checkouts__quantity'), Value(0)),
-                total_checked_in=Coalesce(Sum('component_checkouts__component_checkins__quantity'), Value(0)),
-                available_quantity=F('quantity') - (F('total_checked_out') - F('total_checked_in'))
-            ).filter(
-                available_quantity__lt=F('minimum_quantity')
-            ).count()
-
-            # Total asset costs
-            total_asset_costs = Asset.objects.filter(is_deleted=False).aggregate(
-                total=Coalesce(Sum('purchase_cost'), Value(0), output_field=DecimalField())
-            )['total']
-
-            # Asset utilization (% of assets that are deployed)
-            total_assets = Asset.objects.filter(is_deleted=False).count()
-            statuses = get_status_names_assets()
-            deployed_status_ids = [s['id'] for s in statuses if s.get('type') == 'deployed'] if isinstance(statuses, list) else []
-            deployed_count = Asset.objects.filter(
-                is_deleted=False,
-                status__in=deployed_status_ids
-            ).count() if deployed_status_ids else 0
-            asset_utilization = round((deployed_count / total_assets * 100) if total_assets > 0 else 0)
-
-            # Asset categories - count by category (limit to top 10 for performance)
-            categories = get_categories_list(type='asset', limit=100)
-            category_map = {c['id']: c['name'] for c in categories} if isinstance(categories, list) else {}
-            category_counts = Asset.objects.filter(is_deleted=False).values(
-                'product__category'
-            ).annotate(count=Count('id')).order_by('-count')[:10]  # Limit to top 10
-            asset_categories = [
-                {
-                    'product__category__name': category_map.get(item['product__category'], f"Category {item['product__category']}"),
-                    'count': item['count']
-                }
-                for item in category_counts if item['product__category']
-            ]
-
-            # Asset statuses - count by status (limit to top 10 for performance)
-            status_map = {s['id']: s['name'] for s in statuses} if isinstance(statuses, list) else {}
-            status_counts = Asset.objects.filter(is_deleted=False).values(
-                'status'
-            ).annotate(count=Count('id')).order_by('-count')[:10]  # Limit to top 10
-            asset_statuses = [
-                {
-                    'status__name': status_map.get(item['status'], f"Status {item['status']}"),
-                    'count': item['count']
-                }
-                for item in status_counts if item['status']
-            ]
-
-            data = {
-                "due_for_return": due_for_return,
-                "overdue_for_return": overdue_for_return,
-                "due_audits": due_audits,
-                "upcoming_audits": upcoming_audits,
-                "overdue_audits": overdue_audits,
-                "completed_audits": completed_audits,
-                "reached_end_of_life": reached_end_of_life,
-                "upcoming_end_of_life": upcoming_end_of_life,
-                "expired_warranties": expired_warranties,
-                "expiring_warranties": expiring_warranties,
-                "low_stock": low_stock,
-                "total_asset_costs": total_asset_costs,
-                "asset_utilization": asset_utilization,
-                "asset_categories": asset_categories,
-                "asset_statuses": asset_statuses,
-            }
-
-            # Cache for 10 seconds - short TTL for near real-time updates
-            cache.set(cache_key, data, 10)
+            as_of = datetime.strptime(as_of_param, '%Y-%m-%d').date() if as_of_param else None
+        except ValueError:
+            return Response({"detail": "Invalid as_of date. Use YYYY-MM-DD."}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            if as_of and as_of != now().date():
+                data = compute_dashboard_metrics(as_of)
+            else:
+                data = get_dashboard_metrics()
             serializer = DashboardStatsSerializer(data)
             return Response(serializer.data)
         except Exception as e:
@@ -2570,6 +2209,13 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
     so services or webhooks can post activity entries directly.
     """
     serializer_class = ActivityLogSerializer
+    pagination_class = ActivityLogCursorPagination
+
+    def paginate_queryset(self, queryset):
+        # The whole log is only returned to legacy callers; ?page_size= or ?cursor= selects keyset pages
+        if not any(self.request.query_params.get(p) for p in ('cursor', 'page_size')):
+            return None
+        return super().paginate_queryset(queryset)
 
     def get_queryset(self):
         qs = ActivityLog.objects.all()
@@ -24,5 +24,8 @@ done
 
 echo "Running migrations..."
 python manage.py migrate --noinput
+# Backfill Component.checked_out_qty for checkouts made before the column existed (only fixes drift)
+echo "Rebuilding component stock..."
+python manage.py rebuild_component_stock
 echo "Starting assets service..."
 python manage.py runserver 0.0.0.0:8002
@@ -40,6 +40,8 @@ class CustomUser(AbstractUser):
     role = models.CharField(max_length=8, choices=ROLE_CHOICES, default='operator')
     contact_number = models.CharField(max_length=13)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every save, including deactivation; drives UsersViewset.changed_since
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
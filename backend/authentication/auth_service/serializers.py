@@ -37,3 +37,8 @@ class UserFullNameSerializer(serializers.ModelSerializer):
 
     def get_full_name(self, obj):
             return ' '.join(part for part in [obj.first_name, obj.middle_name, obj.last_name] if part)
+
+class UserDirectorySerializer(UserFullNameSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'full_name', 'is_active', 'updated_at')
@@ -3,6 +3,8 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, action
 from rest_framework.permissions import AllowAny
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from .models import *
 from .serializers import *
 from rest_framework.response import Response
@@ -47,12 +49,14 @@ class UsersViewset(viewsets.ModelViewSet):
         has_active_url = self.reverse_action(self.has_active_admin.url_name)
         get_current_user_url = self.reverse_action(self.get_current_user.url_name)
         get_all_users_url = self.reverse_action(self.get_all_users.url_name)
+        changed_since_url = self.reverse_action(self.changed_since.url_name)
 
         return Response({
             "has_active_admin": has_active_url,
             "update_user": f'{base_url}/pk',
             "get_current_user": get_current_user_url,
             "get_all_users": get_all_users_url,
+            "changed_since": changed_since_url,
         })
 
     # Update auth account by pk
@@ -83,4 +87,26 @@ class UsersViewset(viewsets.ModelViewSet):
         users = self.queryset.filter(is_active=True)
         serializer = UserFullNameSerializer(users, many=True)
         return Response(serializer.data)
+
+    # Users changed after ?since=<ISO timestamp>, for incremental sync of user directories.
+    # Without since, every active user is returned. With since, deactivated users are
+    # included (is_active false) so clients can drop them. server_time is the next since.
+    # Like get_all_users it is open to the other services, so it exposes names only.
+    @action(detail=False, methods=['get'])
+    def changed_since(self, request):
+        # Taken before the query so nothing saved while it runs is skipped next time
+        server_time = timezone.now()
+        since_param = request.query_params.get('since')
+        if since_param:
+            # A "+" in the offset arrives as a space when the value is not URL-encoded
+            since = parse_datetime(since_param.replace(' ', '+'))
+            if since is None:
+                return Response({"message": "Invalid since timestamp"}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            users = self.queryset.filter(updated_at__gt=since)
+        else:
+            users = self.queryset.filter(is_active=True)
+        serializer = UserDirectorySerializer(users.order_by('id'), many=True)
+        return Response({"server_time": server_time.isoformat(), "users": serializer.data})
     
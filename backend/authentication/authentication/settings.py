@@ -147,6 +147,28 @@ else:
     }
 
 
+# Cache
+# Set AUTH_REDIS_URL (e.g. redis://redis:6379/0) to share one cache between all
+# gunicorn workers, so invalidations reach every worker. Without it each
+# process keeps its own LocMemCache (local development, tests).
+if os.getenv("AUTH_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("AUTH_REDIS_URL"),
+            "KEY_PREFIX": "auth",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "KEY_PREFIX": "auth",
+            "TIMEOUT": 300,
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,29 @@
+from rest_framework.exceptions import ValidationError
+
+# Upper bound for ?ids=; callers split larger lookups into several requests
+MAX_BATCH_IDS = 500
+
+
+def parse_ids_param(request):
+    """Return the ids of ?ids=1,2,3 as a list of ints, or None if the param is absent."""
+    raw = request.query_params.get('ids')
+    if raw is None:
+        return None
+    try:
+        ids = {int(v) for v in raw.split(',') if v.strip()}
+    except ValueError:
+        raise ValidationError({"ids": "IDs must be a comma-separated list of integers."})
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValidationError({"ids": f"Too many IDs. Maximum is {MAX_BATCH_IDS} per request."})
+    return sorted(ids)
+
+
+def filter_by_ids(queryset, request):
+    """Restrict a list queryset to ?ids=... so many records are fetched in one round-trip.
+
+    Ids that do not exist (or are soft-deleted) are simply absent from the result.
+    """
+    ids = parse_ids_param(request)
+    if ids is None:
+        return queryset
+    return queryset.filter(id__in=ids)
@@ -0,0 +1,299 @@
+"""
+Circuit breakers for upstream HTTP calls
+
+Every upstream (assets service, help desk, help desk employees) has one
+CircuitBreaker per process. http_client sends each request through the
+breaker of the upstream its URL belongs to (see register_upstream):
+- closed: calls go through. CIRCUIT_FAILURE_THRESHOLD consecutive failures
+  (connection errors, timeouts, 5xx responses) open the circuit
+- open: calls fail at once with CircuitOpenError for CIRCUIT_RESET_TIMEOUT
+  seconds, instead of waiting through retries and timeouts. CircuitOpenError
+  is a RequestException, so the integrations' existing error handling applies
+- half-open: after the reset timeout one probe call at a time goes through;
+  a success closes the circuit, a failure opens it again
+- last-known-good: GETs made with a last-known-good key keep their latest 200
+  response in the cache. When the call fails or the circuit is open, that
+  response is served instead, marked with an X-Last-Known-Good header (its
+  age in seconds). Every such 200 is a cache write, so only list and names
+  endpoints with a small, stable set of parameters use it, not per-id or
+  search lookups
+- hedging: when an upstream is healthy and idle (at most HEDGE_MAX_IN_FLIGHT
+  calls in flight), a GET that has not answered after the upstream's recent
+  p95 latency is sent a second time and the first good answer wins. Busy or
+  failing upstreams are never hedged, so hedges cannot add to an overload
+
+breaker_states() reports every breaker for the health endpoint.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = getattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 5)
+RESET_TIMEOUT = getattr(settings, "CIRCUIT_RESET_TIMEOUT", 30)
+LAST_KNOWN_GOOD_TTL = getattr(settings, "LAST_KNOWN_GOOD_TTL", 24 * 60 * 60)
+HEDGE_MAX_IN_FLIGHT = getattr(settings, "HEDGE_MAX_IN_FLIGHT", 2)
+HEDGE_POOL_SIZE = 16
+# Hedge delay bounds; DEFAULT applies until enough latencies were observed
+HEDGE_MIN_DELAY = 0.05
+HEDGE_MAX_DELAY = 2.0
+HEDGE_DEFAULT_DELAY = 0.5
+LATENCY_SAMPLES = 100
+MIN_LATENCY_SAMPLES = 10
+# Response headers kept with a last-known-good body
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "X-Total-Count")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=None, reset_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or FAILURE_THRESHOLD
+        self.reset_timeout = RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self.counters = Counter()
+        self.last_error = None
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._in_flight = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Reserve a call, or raise CircuitOpenError when the upstream must not be called."""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probing):
+                self.counters["short_circuited"] += 1
+                raise CircuitOpenError(f"Circuit for upstream '{self.name}' is open")
+            if state == HALF_OPEN:
+                self._probing = True
+            self._in_flight += 1
+            self.counters["calls"] += 1
+
+    def on_success(self, latency: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            self._failures = 0
+            if self._state != CLOSED:
+                logger.info("Circuit for upstream '%s' closed", self.name)
+            self._state = CLOSED
+            self._probing = False
+
+    def on_failure(self, error) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._failures += 1
+            self.counters["failures"] += 1
+            self.last_error = str(error)[:200]
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning("Circuit for upstream '%s' opened: %s", self.name, self.last_error)
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def count(self, event: str) -> None:
+        with self._lock:
+            self.counters[event] += 1
+
+    def can_hedge(self) -> bool:
+        with self._lock:
+            return self._state == CLOSED and self._in_flight <= HEDGE_MAX_IN_FLIGHT
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        return min(max(p95, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(self.reset_timeout - (time.monotonic() - self._opened_at), 0), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "in_flight": self._in_flight,
+                "retry_in": retry_in,
+                "last_error": self.last_error,
+                **{event: self.counters[event] for event in
+                   ("calls", "failures", "short_circuited", "hedges", "last_known_good_served")},
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+# (url prefix, upstream name), longest prefix first
+_upstreams = []
+_hedge_executor = None
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def register_upstream(name: str, base_url: str) -> None:
+    """Route requests to URLs under base_url through the breaker called name."""
+    prefix = base_url.rstrip("/")
+    with _breakers_lock:
+        _upstreams[:] = sorted(
+            [entry for entry in _upstreams if entry[0] != prefix] + [(prefix, name)],
+            key=lambda entry: len(entry[0]), reverse=True,
+        )
+    get_breaker(name)
+
+
+def breaker_for_url(url: str) -> CircuitBreaker:
+    for prefix, name in _upstreams:
+        if url.startswith(prefix):
+            return get_breaker(name)
+    return get_breaker(urlparse(url).netloc or url)
+
+
+def breaker_states() -> Dict[str, Dict]:
+    return {name: breaker.snapshot() for name, breaker in sorted(_breakers.items())}
+
+
+def last_known_good_key(url: str, params=None) -> str:
+    raw = json.dumps([url, params or {}], sort_keys=True, default=str)
+    return f"lkg:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def _store_last_known_good(key: str, resp) -> None:
+    entry = {
+        "content": resp.content,
+        "headers": {name: resp.headers[name] for name in KEPT_HEADERS if name in resp.headers},
+        "url": resp.url,
+        "stored_at": time.time(),
+    }
+    cache.set(key, entry, LAST_KNOWN_GOOD_TTL)
+
+
+def _serve_last_known_good(breaker: CircuitBreaker, key: Optional[str], error: Exception):
+    entry = cache.get(key) if key else None
+    if entry is None:
+        raise error
+    breaker.count("last_known_good_served")
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = entry["content"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp.headers["X-Last-Known-Good"] = str(int(time.time() - entry["stored_at"]))
+    resp.url = entry["url"]
+    resp.encoding = "utf-8"
+    return resp
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _breakers_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_POOL_SIZE, thread_name_prefix="hedge")
+    return _hedge_executor
+
+
+def _send_hedged(breaker: CircuitBreaker, send: Callable):
+    executor = _get_hedge_executor()
+    first = executor.submit(send)
+    try:
+        # An early failure (e.g. connection refused) is raised as is, not hedged
+        return first.result(timeout=breaker.hedge_delay())
+    except FutureTimeoutError:
+        pass
+
+    breaker.count("hedges")
+    pending = {first, executor.submit(send)}
+    error, server_error = None, None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                resp = future.result()
+            except RequestException as exc:
+                error = exc
+                continue
+            if resp.status_code < 500:
+                return resp
+            server_error = resp
+    if server_error is not None:
+        return server_error
+    raise error
+
+
+def call_upstream(breaker: CircuitBreaker, send: Callable, hedge: bool = False,
+                  last_known_good: Optional[str] = None):
+    """Send one request (send() returns a Response) through breaker.
+
+    hedge allows a second, parallel attempt (idempotent requests only).
+    last_known_good is the cache key to store and serve the last 200 response under.
+    """
+    try:
+        breaker.before_call()
+    except CircuitOpenError as exc:
+        return _serve_last_known_good(breaker, last_known_good, exc)
+
+    started = time.monotonic()
+    try:
+        resp = _send_hedged(breaker, send) if hedge and breaker.can_hedge() else send()
+    except RequestException as exc:
+        breaker.on_failure(exc)
+        return _serve_last_known_good(breaker, last_known_good, exc)
+    except BaseException as exc:
+        breaker.on_failure(exc)
+        raise
+
+    if resp.status_code >= 500:
+        breaker.on_failure(f"HTTP {resp.status_code}")
+        try:
+            return _serve_last_known_good(breaker, last_known_good, RequestException())
+        except RequestException:
+            return resp
+
+    breaker.on_success(time.monotonic() - started)
+    if last_known_good and resp.status_code == 200:
+        _store_last_known_good(last_known_good, resp)
+    return resp
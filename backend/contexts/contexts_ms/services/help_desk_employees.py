@@ -1,6 +1,7 @@
 import os
 import logging
 from requests.exceptions import RequestException
+from .circuit_breaker import register_upstream
 from .http_client import get as client_get
 from django.conf import settings
 
@@ -15,6 +16,8 @@ BASE_URL = getattr(
 def _build_url(path: str) -> str:
     return f"{BASE_URL.rstrip('/')}/{path.lstrip('/')}"
 
+register_upstream("help-desk-employees", BASE_URL)
+
 def get_employee_by_id(employee_id):
     """Fetch a single employee by ID."""
     if not employee_id:
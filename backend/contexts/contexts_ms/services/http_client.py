@@ -5,17 +5,22 @@ import time
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from .circuit_breaker import breaker_for_url, call_upstream, last_known_good_key, register_upstream
 
 
 ASSETS_API_URL = os.getenv("ASSETS_API_URL", "http://assets:8002/")
 
+register_upstream("assets", ASSETS_API_URL)
+
 
 def _build_session():
     s = requests.Session()
+    # A single immediate retry for dropped keep-alive connections. Slow or failing
+    # upstreams are handled by the circuit breakers and hedged GETs, not retry loops
     retries = Retry(
-        total=3,
-        backoff_factor=0.2,
-        status_forcelist=(500, 502, 503, 504),
+        total=1,
+        status=0,
+        backoff_factor=0,
         allowed_methods=frozenset(["GET", "POST", "PUT", "PATCH", "DELETE"]),
     )
     adapter = HTTPAdapter(max_retries=retries)
@@ -68,12 +73,26 @@ def _format_display_path(url: str, original_path: str) -> str:
     return display
 
 
-def get(path: str, params=None, timeout: float = 5, **kwargs):
+def _send(method: str, url: str, hedge: bool = False, last_known_good=None, **kwargs):
+    return call_upstream(
+        breaker_for_url(url),
+        lambda: _SESSION.request(method, url, **kwargs),
+        hedge=hedge,
+        last_known_good=last_known_good,
+    )
+
+
+def get(path: str, params=None, timeout: float = 5, last_known_good: bool = False, **kwargs):
+    """GET through the upstream's circuit breaker, hedged when the upstream is idle.
+
+    With last_known_good=True the last 200 response is served when the upstream fails.
+    """
     url = _make_url(path)
     display = _format_display_path(url, path)
+    lkg_key = last_known_good_key(url, params) if last_known_good else None
     start = time.monotonic()
     try:
-        resp = _SESSION.get(url, params=params, timeout=timeout, **kwargs)
+        resp = _send("GET", url, hedge=True, last_known_good=lkg_key, params=params, timeout=timeout, **kwargs)
         elapsed_ms = (time.monotonic() - start) * 1000
         logger.info(f"[HTTP] GET {display} → {resp.status_code} ({elapsed_ms:.1f}ms)")
         return resp
@@ -88,7 +107,7 @@ def post(path: str, json=None, data=None, timeout: float = 5, **kwargs):
     display = _format_display_path(url, path)
     start = time.monotonic()
     try:
-        resp = _SESSION.post(url, json=json, data=data, timeout=timeout, **kwargs)
+        resp = _send("POST", url, json=json, data=data, timeout=timeout, **kwargs)
         elapsed_ms = (time.monotonic() - start) * 1000
         logger.info(f"[HTTP] POST {display} → {resp.status_code} ({elapsed_ms:.1f}ms)")
         return resp
@@ -103,7 +122,7 @@ def patch(path: str, json=None, data=None, timeout: float = 5, **kwargs):
     display = _format_display_path(url, path)
     start = time.monotonic()
     try:
-        resp = _SESSION.patch(url, json=json, data=data, timeout=timeout, **kwargs)
+        resp = _send("PATCH", url, json=json, data=data, timeout=timeout, **kwargs)
         elapsed_ms = (time.monotonic() - start) * 1000
         logger.info(f"[HTTP] PATCH {display} → {resp.status_code} ({elapsed_ms:.1f}ms)")
         return resp
@@ -118,7 +137,7 @@ def delete(path: str, timeout: float = 5, **kwargs):
     display = _format_display_path(url, path)
     start = time.monotonic()
     try:
-        resp = _SESSION.delete(url, timeout=timeout, **kwargs)
+        resp = _send("DELETE", url, timeout=timeout, **kwargs)
         elapsed_ms = (time.monotonic() - start) * 1000
         logger.info(f"[HTTP] DELETE {display} → {resp.status_code} ({elapsed_ms:.1f}ms)")
         return resp
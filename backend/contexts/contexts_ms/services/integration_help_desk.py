@@ -1,5 +1,6 @@
 import os
 from requests.exceptions import RequestException
+from .circuit_breaker import register_upstream
 from .http_client import get as client_get
 from django.conf import settings
 
@@ -15,6 +16,8 @@ def _build_url(path: str) -> str:
     """Construct full URL for the given resource path."""
     return f"{BASE_URL.rstrip('/')}/{path.lstrip('/')}"
 
+register_upstream("help-desk", BASE_URL)
+
 def fetch_resource_by_id(resource_name: str, resource_id):
     """
     Fetch a single resource by name and ID from the Help Desk service.
@@ -41,7 +44,8 @@ def fetch_resource_list(resource_name: str, params=None):
     params = params or {}
     url = _build_url(f"{resource_name}/")
     try:
-        resp = client_get(url, params=params, timeout=8)
+        # Free-text searches would each add a last-known-good entry; only the stable lists keep one
+        resp = client_get(url, params=params, timeout=8, last_known_good=not params.get("q"))
         if resp.status_code == 404:
             return {"warning": f"{resource_name} endpoint not found."}
         resp.raise_for_status()
@@ -70,25 +74,38 @@ def get_location_by_id(location_id):
     # Otherwise return raw result
     return result
 
-def get_locations_list(q=None, limit=50):
+def get_locations_page(q=None, limit=50, offset=None):
     """
-    Fetch list of locations.
-    Returns a list of location objects, or {'warning': ...} if error.
+    Fetch one page of locations.
+    Returns (locations, total), where total is the API's count or None if it
+    sent none, or {'warning': ...} if error.
     """
     params = {}
     if q:
         params["q"] = q
     if limit:
         params["limit"] = limit
+    if offset:
+        params["offset"] = offset
 
     result = fetch_resource_list("locations", params=params)
 
-    # If API returns {success, locations: [...]}, extract array
+    # If API returns {success, count, locations: [...]}, extract array
     if isinstance(result, dict):
         if result.get("warning"):
             return result
         if "locations" in result:
-            return result["locations"]
+            return result["locations"], result.get("count")
 
     # If API returned a list directly, return it
-    return result
+    return result, None
+
+def get_locations_list(q=None, limit=50, offset=None):
+    """
+    Fetch list of locations.
+    Returns a list of location objects, or {'warning': ...} if error.
+    """
+    result = get_locations_page(q=q, limit=limit, offset=offset)
+    if isinstance(result, dict):
+        return result
+    return result[0]
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework import status
+
+from contexts_ms.models import Category, Manufacturer, Status
+from contexts_ms.views import CategoryViewSet, ManufacturerViewSet, StatusViewSet
+
+
+class BatchLookupTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = ManufacturerViewSet.as_view({'get': 'list'})
+        self.dell = Manufacturer.objects.create(name='Dell')
+        self.hp = Manufacturer.objects.create(name='HP')
+        self.gone = Manufacturer.objects.create(name='Gone', is_deleted=True)
+
+    def test_ids_param_returns_only_requested_records(self):
+        resp = self.view(self.factory.get('/manufacturers/', {'ids': f'{self.hp.id},{self.gone.id},999'}))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([m['id'] for m in resp.data], [self.hp.id])
+
+    def test_without_ids_lists_everything(self):
+        resp = self.view(self.factory.get('/manufacturers/'))
+        self.assertEqual(len(resp.data), 2)
+
+    def test_invalid_ids_returns_400(self):
+        resp = self.view(self.factory.get('/manufacturers/', {'ids': '1,abc'}))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch('contexts_ms.views.bulk_check_usage')
+    def test_ids_lookup_skips_usage_callback_to_assets(self, bulk_check_usage):
+        category = Category.objects.create(name='Laptops', type='asset')
+        status_obj = Status.objects.create(name='Ready', category='asset', type='deployable')
+
+        resp = CategoryViewSet.as_view({'get': 'list'})(self.factory.get('/categories/', {'ids': str(category.id)}))
+        self.assertEqual([c['id'] for c in resp.data], [category.id])
+        resp = StatusViewSet.as_view({'get': 'list'})(self.factory.get('/statuses/', {'ids': str(status_obj.id)}))
+        self.assertEqual([s['id'] for s in resp.data], [status_obj.id])
+        bulk_check_usage.assert_not_called()
+
+        CategoryViewSet.as_view({'get': 'list'})(self.factory.get('/categories/'))
+        bulk_check_usage.assert_called_once()
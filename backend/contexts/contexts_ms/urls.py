@@ -5,6 +5,7 @@ from contexts_ms.api.supplier_usage_api import *
 from contexts_ms.api.imports import *
 from contexts_ms.api.import_export_api import *
 from .views import check_supplier_usage, check_depreciation_usage, check_status_usage
+from .services.circuit_breaker import CLOSED, breaker_states
 
 
 @api_view(['GET'])
@@ -12,6 +13,14 @@ def health_check(request):
     return Response({'status': 'ok'})
 
 
+@api_view(['GET'])
+def upstream_health(request):
+    """Circuit breaker state of every upstream this worker calls (services/circuit_breaker.py)."""
+    upstreams = breaker_states()
+    degraded = any(upstream['state'] != CLOSED for upstream in upstreams.values())
+    return Response({'status': 'degraded' if degraded else 'ok', 'upstreams': upstreams})
+
+
 router = DefaultRouter()
 router.register('categories', CategoryViewSet, basename='categories')
 router.register('suppliers', SupplierViewSet, basename='supplier')
@@ -36,6 +45,7 @@ urlpatterns = [
     path('check-usage/supplier/<int:pk>/', check_supplier_usage, name='check-supplier-usage'),
     path('check-usage/depreciation/<int:pk>/', check_depreciation_usage, name='check-depreciation-usage'),
     path('check-usage/status/<int:pk>/', check_status_usage, name='check-status-usage'),
+    path('health/upstreams/', upstream_health, name='upstream-health'),
     
     # supplier usage endpoints (assets/components lists by supplier)
     path('suppliers/<int:pk>/assets/', SupplierAssetListAPIView.as_view()),
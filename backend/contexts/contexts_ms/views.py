@@ -8,10 +8,13 @@ from rest_framework.decorators import action
 from rest_framework import status
 from contexts_ms.services.usage_check import is_item_in_use
 from .services.bulk_delete import _bulk_delete_handler, _build_cant_delete_message
+from .services.batch_lookup import filter_by_ids, parse_ids_param
 from rest_framework import serializers as drf_serializers
 from contexts_ms.services.assets import *
 import requests
 from django.db import transaction
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +27,11 @@ class CategoryViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Category.objects.filter(is_deleted=False).order_by('name')
+        queryset = Category.objects.filter(is_deleted=False).order_by('name')
+        if self.action == 'list':
+            # Batch lookup: ?ids=1,2,3
+            queryset = filter_by_ids(queryset, self.request)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == "names":
@@ -36,7 +43,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
         qs = self.filter_queryset(self.get_queryset())
         ids = list(qs.values_list('id', flat=True))
         usage_map = {}
-        if ids:
+        # ?ids= batch lookups come from the assets service itself; calling back into it would block both
+        if ids and parse_ids_param(request) is None:
             try:
                 usage_map = bulk_check_usage('category', ids, sample_limit=0)
             except Exception:
@@ -118,7 +126,11 @@ class SupplierViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Supplier.objects.filter(is_deleted=False).order_by('name')
+        queryset = Supplier.objects.filter(is_deleted=False).order_by('name')
+        if self.action == 'list':
+            # Batch lookup: ?ids=1,2,3
+            queryset = filter_by_ids(queryset, self.request)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == "names":
@@ -151,7 +163,11 @@ class DepreciationViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Depreciation.objects.filter(is_deleted=False).order_by('name')
+        queryset = Depreciation.objects.filter(is_deleted=False).order_by('name')
+        if self.action == 'list':
+            # Batch lookup: ?ids=1,2,3
+            queryset = filter_by_ids(queryset, self.request)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == "names":
@@ -183,7 +199,11 @@ class ManufacturerViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Manufacturer.objects.filter(is_deleted=False).order_by('name')
+        queryset = Manufacturer.objects.filter(is_deleted=False).order_by('name')
+        if self.action == 'list':
+            # Batch lookup: ?ids=1,2,3
+            queryset = filter_by_ids(queryset, self.request)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == "names":
@@ -214,7 +234,11 @@ class StatusViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Status.objects.filter(is_deleted=False).order_by('name')
+        queryset = Status.objects.filter(is_deleted=False).order_by('name')
+        if self.action == 'list':
+            # Batch lookup: ?ids=1,2,3
+            queryset = filter_by_ids(queryset, self.request)
+        return queryset
     
     def get_serializer_class(self):
         if self.action == "names":
@@ -225,7 +249,8 @@ class StatusViewSet(viewsets.ModelViewSet):
         qs = self.filter_queryset(self.get_queryset())
         ids = list(qs.values_list('id', flat=True))
         usage_map = {}
-        if ids:
+        # ?ids= batch lookups come from the assets service itself; calling back into it would block both
+        if ids and parse_ids_param(request) is None:
             try:
                 usage_map = bulk_check_usage('status', ids, sample_limit=0)
             except Exception:
@@ -571,18 +596,36 @@ class HelpDeskLocationsProxyViewSet(viewsets.ViewSet):
     """Proxy ViewSet for Help Desk locations to avoid mixed content errors."""
 
     def list(self, request):
-        """Proxy GET /helpdesk-locations/ to help desk service."""
-        from contexts_ms.services.integration_help_desk import get_locations_list
+        """Proxy GET /helpdesk-locations/ to help desk service.
+
+        Supports ?limit= and ?offset= paging. X-Total-Count carries the help
+        desk's total when it reports one, and the page's ETag lets callers
+        revalidate with If-None-Match (304 when the page is unchanged).
+        """
+        from contexts_ms.services.integration_help_desk import get_locations_page
         q = request.query_params.get('q')
         limit = request.query_params.get('limit', 50)
         try:
             limit = int(limit)
         except (TypeError, ValueError):
             limit = 50
-        result = get_locations_list(q=q, limit=limit)
+        try:
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except (TypeError, ValueError):
+            offset = 0
+        result = get_locations_page(q=q, limit=limit, offset=offset)
         if isinstance(result, dict) and result.get('warning'):
             return Response({'error': result['warning']}, status=status.HTTP_502_BAD_GATEWAY)
-        return Response(result)
+        locations, total = result
+
+        headers = {'ETag': '"%s"' % hashlib.md5(
+            json.dumps(locations, sort_keys=True, default=str).encode()
+        ).hexdigest()}
+        if total is not None:
+            headers['X-Total-Count'] = str(total)
+        if request.headers.get('If-None-Match') == headers['ETag']:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(locations, headers=headers)
 
     def retrieve(self, request, pk=None):
         """Proxy GET /helpdesk-locations/<pk>/ to help desk service."""